@@ -0,0 +1,32 @@
+"""Add keyset pagination index on Entry.
+
+Revision ID: 5b2e8c1f7a3d
+Revises: 13fd20dfbc6e
+Create Date: 2026-10-16 09:12:04.318227
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b2e8c1f7a3d"
+down_revision: Union[str, None] = "13fd20dfbc6e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_entry_dictionary_id_id",
+        "entry",
+        ["dictionary_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entry_dictionary_id_id", table_name="entry")
@@ -0,0 +1,75 @@
+"""Add normalized_name search key to Entry.
+
+Revision ID: 7c4d9a2e1b6f
+Revises: 5b2e8c1f7a3d
+Create Date: 2026-10-16 10:41:27.905113
+
+"""
+
+import unicodedata
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4d9a2e1b6f"
+down_revision: Union[str, None] = "5b2e8c1f7a3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+entry = sa.table(
+    "entry",
+    sa.column("id", sa.Integer),
+    sa.column("original_name", sa.String),
+    sa.column("normalized_name", sa.String),
+)
+
+
+def _normalize(value):
+    """Mirror app.services.entry.normalize_term as of this revision."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "entry", sa.Column("normalized_name", sa.String(), nullable=True)
+    )
+
+    bind = op.get_bind()
+    while True:
+        rows = bind.execute(
+            sa.select(entry.c.id, entry.c.original_name)
+            .where(entry.c.normalized_name.is_(None))
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            entry.update()
+            .where(entry.c.id == sa.bindparam("entry_id"))
+            .values(normalized_name=sa.bindparam("key")),
+            [
+                {"entry_id": row.id, "key": _normalize(row.original_name)}
+                for row in rows
+            ],
+        )
+
+    op.create_index(
+        "ix_entry_dictionary_id_normalized_name",
+        "entry",
+        ["dictionary_id", sa.text('normalized_name COLLATE "C"')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entry_dictionary_id_normalized_name", table_name="entry")
+    op.drop_column("entry", "normalized_name")
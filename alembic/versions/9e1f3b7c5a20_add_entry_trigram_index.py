@@ -0,0 +1,35 @@
+"""Add pg_trgm index on Entry.normalized_name.
+
+Revision ID: 9e1f3b7c5a20
+Revises: 7c4d9a2e1b6f
+Create Date: 2026-10-16 11:58:13.462091
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e1f3b7c5a20"
+down_revision: Union[str, None] = "7c4d9a2e1b6f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_entry_normalized_name_trgm",
+        "entry",
+        ["normalized_name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"normalized_name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entry_normalized_name_trgm", table_name="entry")
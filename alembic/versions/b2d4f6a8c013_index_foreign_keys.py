@@ -0,0 +1,54 @@
+"""Index foreign keys of Dictionary, CountryLanguageLink and Job.
+
+Revision ID: b2d4f6a8c013
+Revises: a7c5e3f9b180
+Create Date: 2026-10-16 19:58:06.392817
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b2d4f6a8c013"
+down_revision: Union[str, None] = "a7c5e3f9b180"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_dictionary_user_id", "dictionary", "user_id"),
+    ("ix_dictionary_target_language_id", "dictionary", "target_language_id"),
+    (
+        "ix_countrylanguagelink_language_id",
+        "countrylanguagelink",
+        "language_id",
+    ),
+    ("ix_job_user_id", "job", "user_id"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
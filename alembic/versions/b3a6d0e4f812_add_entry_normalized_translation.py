@@ -0,0 +1,87 @@
+"""Add normalized_translation search key to Entry.
+
+Revision ID: b3a6d0e4f812
+Revises: 9e1f3b7c5a20
+Create Date: 2026-10-16 13:20:45.118604
+
+"""
+
+import unicodedata
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3a6d0e4f812"
+down_revision: Union[str, None] = "9e1f3b7c5a20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+entry = sa.table(
+    "entry",
+    sa.column("id", sa.Integer),
+    sa.column("original_name", sa.String),
+    sa.column("translation", sa.String),
+    sa.column("normalized_name", sa.String),
+    sa.column("normalized_translation", sa.String),
+)
+
+
+def _normalize(value):
+    """Mirror app.services.entry.normalize_term as of this revision."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "entry",
+        sa.Column("normalized_translation", sa.String(), nullable=True),
+    )
+
+    bind = op.get_bind()
+    while True:
+        rows = bind.execute(
+            sa.select(entry.c.id, entry.c.original_name, entry.c.translation)
+            .where(entry.c.normalized_translation.is_(None))
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            entry.update()
+            .where(entry.c.id == sa.bindparam("entry_id"))
+            .values(
+                normalized_name=sa.bindparam("name_key"),
+                normalized_translation=sa.bindparam("translation_key"),
+            ),
+            [
+                {
+                    "entry_id": row.id,
+                    "name_key": _normalize(row.original_name),
+                    "translation_key": _normalize(row.translation),
+                }
+                for row in rows
+            ],
+        )
+
+    op.create_index(
+        "ix_entry_dictionary_id_normalized_translation",
+        "entry",
+        ["dictionary_id", sa.text('normalized_translation COLLATE "C"')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_entry_dictionary_id_normalized_translation", table_name="entry"
+    )
+    op.drop_column("entry", "normalized_translation")
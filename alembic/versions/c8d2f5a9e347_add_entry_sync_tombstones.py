@@ -0,0 +1,58 @@
+"""Add delta sync index and EntryTombstone.
+
+Revision ID: c8d2f5a9e347
+Revises: b3a6d0e4f812
+Create Date: 2026-10-16 14:37:52.640219
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c8d2f5a9e347"
+down_revision: Union[str, None] = "b3a6d0e4f812"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "entrytombstone",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("entry_id", sa.Integer(), nullable=False),
+        sa.Column("dictionary_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["dictionary_id"],
+            ["dictionary.id"],
+            name="entrytombstone_dictionary_id_fkey",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_entrytombstone_dictionary_id_id",
+        "entrytombstone",
+        ["dictionary_id", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_entry_dictionary_id_updated_at_id",
+        "entry",
+        ["dictionary_id", "updated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entry_dictionary_id_updated_at_id", table_name="entry")
+    op.drop_index(
+        "ix_entrytombstone_dictionary_id_id", table_name="entrytombstone"
+    )
+    op.drop_table("entrytombstone")
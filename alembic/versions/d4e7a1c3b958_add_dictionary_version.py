@@ -0,0 +1,32 @@
+"""Add version counter to Dictionary.
+
+Revision ID: d4e7a1c3b958
+Revises: c8d2f5a9e347
+Create Date: 2026-10-16 15:49:08.271935
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e7a1c3b958"
+down_revision: Union[str, None] = "c8d2f5a9e347"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "dictionary",
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("dictionary", "version")
@@ -0,0 +1,45 @@
+"""Cascade dictionary deletes to entries and tombstones.
+
+Revision ID: e5b9c2d7f041
+Revises: d4e7a1c3b958
+Create Date: 2026-10-16 17:02:44.518306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b9c2d7f041"
+down_revision: Union[str, None] = "d4e7a1c3b958"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FOREIGN_KEYS = (
+    ("entry_dictionary_id_fkey", "entry"),
+    ("entrytombstone_dictionary_id_fkey", "entrytombstone"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name,
+            table,
+            "dictionary",
+            ["dictionary_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name, table, "dictionary", ["dictionary_id"], ["id"]
+        )
@@ -0,0 +1,37 @@
+"""Add is_deleting flag to Dictionary.
+
+Revision ID: f1a3d8b6c429
+Revises: e5b9c2d7f041
+Create Date: 2026-10-16 17:41:19.730264
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1a3d8b6c429"
+down_revision: Union[str, None] = "e5b9c2d7f041"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "dictionary",
+        sa.Column(
+            "is_deleting",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("dictionary", "is_deleting")
@@ -1,3 +1,5 @@
+from typing import List, Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -12,12 +14,38 @@ class Settings(BaseSettings):
     DB_HOST: str = "db"
     DB_PORT: int = 5432
     DB_NAME: str = "fastapi"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    DB_READ_REPLICA_URLS: List[str] = []
+    DB_READ_STICKY_SECONDS: int = 5
+    DB_QUERY_BUDGET: int = 20
     API_VERSION: str = "api/v1"
     JWT_SECRET_KEY: str = Field(
         default="secret", json_schema_extra={"env_var": "JWT_SECRET_KEY"}
     )
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 120
+    ENTRY_SEARCH_CACHE: bool = False
+    ENTRY_SEARCH_CACHE_SIZE: int = 32
+    ENTRY_SEARCH_CACHE_TTL_SECONDS: int = 300
+    ENTRY_ANNOTATE_CACHE_SIZE: int = 8
+    ENTRY_FUZZY_BACKEND: Literal["trigram", "bktree"] = "trigram"
+    SYNC_SAFETY_SECONDS: int = 5
+    DICTIONARY_DELETE_CHUNK_SIZE: int = 5000
+    JOB_WORKERS: int = 2
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 5.0
+    JOB_STALE_SECONDS: int = 600
+    JOB_SWEEP_SECONDS: float = 30.0
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_JSON: bool = False
+    LOG_ACCESS_SAMPLE_RATE: float = 1.0
+    SLOW_REQUEST_SECONDS: float = 1.0
+    SLOW_REQUEST_EXPLAIN: bool = False
+    SLOW_REQUEST_LOG_SIZE: int = 100
 
     @property
     def DEBUG(self) -> bool:
@@ -32,6 +60,17 @@ class Settings(BaseSettings):
             f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
+    @property
+    def pool_options(self) -> dict:
+        """Returns the connection pool options shared by both engines."""
+        return {
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+        }
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
@@ -0,0 +1,49 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class DictionaryCache:
+    """Thread-safe LRU cache of per-dictionary lookup structures.
+
+    Values are rebuilt when they are older than the TTL or, when a version
+    is given, as soon as the dictionary version they were built from moves.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """Keep up to ``max_size`` dictionaries for ``ttl_seconds`` each."""
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dictionary_id: int, build, version=None):
+        """Return the cached value for a dictionary, building it if stale."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(dictionary_id)
+            if (
+                item is not None
+                and item[1] == version
+                and now - item[0] < self.ttl_seconds
+            ):
+                self._items.move_to_end(dictionary_id)
+                return item[2]
+
+        value = build()
+        with self._lock:
+            self._items[dictionary_id] = (now, version, value)
+            self._items.move_to_end(dictionary_id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return value
+
+    def invalidate(self, dictionary_id: int):
+        """Drop the cached value for a dictionary."""
+        with self._lock:
+            self._items.pop(dictionary_id, None)
+
+    def clear(self):
+        """Drop every cached value."""
+        with self._lock:
+            self._items.clear()
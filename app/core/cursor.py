@@ -0,0 +1,21 @@
+import base64
+import json
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*values) -> str:
+    """Encode keyset values into an opaque pagination cursor."""
+    payload = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, *types) -> list:
+    """Decode a pagination cursor and coerce its values to the given types."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("Unexpected cursor shape")
+        return [cast(value) for cast, value in zip(types, values)]
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
@@ -0,0 +1,26 @@
+import hashlib
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+def make_etag(*parts) -> str:
+    """Return a strong ETag derived from the given version parts."""
+    digest = hashlib.sha256(
+        ":".join(str(part) for part in parts).encode("utf-8")
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return True if the request's If-None-Match header matches an ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Return an empty 304 response carrying the ETag."""
+    return Response(status_code=304, headers={"ETag": etag})
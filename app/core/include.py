@@ -0,0 +1,34 @@
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+
+def include_options(model, include):
+    """Return loader options eagerly loading the requested relationships.
+
+    Many-to-one relationships are joined into the main query and each
+    collection is fetched with one extra ``IN`` query, so the number of
+    statements does not grow with the number of rows.
+    """
+    relationships = inspect(model).relationships
+    options = []
+    for name in sorted({item.value for item in include or ()}):
+        attribute = getattr(model, name)
+        if relationships[name].uselist:
+            options.append(selectinload(attribute))
+        else:
+            options.append(joinedload(attribute))
+    return options
+
+
+def read_with(read_model, obj, include):
+    """Build a read DTO holding only the requested relationships.
+
+    Relationships that were not requested are returned as null rather
+    than lazy loaded, one query per row, during serialization.
+    """
+    if obj is None:
+        return None
+    data = obj.model_dump()
+    for item in include or ():
+        data[item.value] = getattr(obj, item.value)
+    return read_model.model_validate(data)
@@ -0,0 +1,260 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from logging import getLogger
+
+from sqlmodel import Session, select, update
+
+from app.config import settings
+from app.database import engine
+from app.dto.job import JobStatus
+from app.models.job import Job
+
+_logger = getLogger(__name__)
+
+JOB_HANDLERS = {}
+
+
+def job_handler(kind: str):
+    """Register a function running the jobs of the given kind.
+
+    Handlers are called as ``handler(session, job, report)`` and return a
+    JSON-serializable result. They may commit as they go and must be safe
+    to run again, since failed jobs are retried from the start.
+    """
+
+    def register(handler):
+        JOB_HANDLERS[kind] = handler
+        return handler
+
+    return register
+
+
+def retry_delay(attempts: int) -> float:
+    """Return the backoff before retrying a job that failed ``attempts``."""
+    if not attempts:
+        return 0
+    return settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+
+
+class JobRunner:
+    """Run database-backed jobs on a thread pool inside the app process."""
+
+    def __init__(self, max_workers: int):
+        """Prepare a runner using up to ``max_workers`` threads."""
+        self.max_workers = max_workers
+        self._executor = None
+        self._stop = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the pool and the sweeper, and resume jobs left behind."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="job"
+                )
+            if self._stop is None:
+                self._stop = threading.Event()
+                threading.Thread(
+                    target=self._sweep_until,
+                    args=(self._stop,),
+                    name="job-sweeper",
+                    daemon=True,
+                ).start()
+
+        resumed = self.sweep()
+        _logger.info("Job runner started, %s jobs resumed", resumed)
+
+    def shutdown(self):
+        """Stop taking jobs; queued ones stay pending in the database."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            stop, self._stop = self._stop, None
+        if stop is not None:
+            stop.set()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def sweep(self):
+        """Requeue abandoned running jobs and submit the pending ones due.
+
+        Retries are scheduled with an in-process timer. The sweep catches
+        jobs whose timer was lost to a restart or a crash, and jobs left
+        by other processes. Submitting a job twice is harmless since only
+        one worker can claim it. An abandoned job that used its last
+        attempt is failed rather than requeued.
+        """
+        now = datetime.now()
+        stale = now - timedelta(seconds=settings.JOB_STALE_SECONDS)
+        abandoned = (Job.status == JobStatus.RUNNING, Job.updated_at < stale)
+        with Session(engine) as session:
+            session.exec(
+                update(Job)
+                .where(*abandoned, Job.attempts >= Job.max_attempts)
+                .values(
+                    status=JobStatus.FAILED,
+                    error="Job abandoned on its last attempt.",
+                    updated_at=now,
+                    finished_at=now,
+                )
+            )
+            session.exec(
+                update(Job).where(*abandoned).values(status=JobStatus.PENDING)
+            )
+            session.commit()
+            rows = session.exec(
+                select(Job.id, Job.attempts, Job.updated_at)
+                .where(Job.status == JobStatus.PENDING)
+                .order_by(Job.id)
+            ).all()
+        due = [
+            row.id
+            for row in rows
+            if row.updated_at + timedelta(seconds=retry_delay(row.attempts))
+            <= now
+        ]
+        for job_id in due:
+            self.submit(job_id)
+        return len(due)
+
+    def _sweep_until(self, stop):
+        """Sweep every JOB_SWEEP_SECONDS until ``stop`` is set."""
+        while not stop.wait(settings.JOB_SWEEP_SECONDS):
+            try:
+                self.sweep()
+            except Exception:
+                _logger.exception("Job sweep failed")
+
+    def enqueue(self, session, kind: str, payload: dict, **fields):
+        """Insert a pending job, commit it and schedule it.
+
+        The job is committed before being scheduled so that a worker can
+        always see it, and so that it survives a restart.
+        """
+        job = Job(
+            kind=kind,
+            payload=payload,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            **fields,
+        )
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+        self.submit(job.id)
+        return job
+
+    def submit(self, job_id: int, delay: float = 0):
+        """Schedule a job on the pool, after ``delay`` seconds if given."""
+        if delay:
+            timer = threading.Timer(delay, self.submit, (job_id,))
+            timer.daemon = True
+            timer.start()
+            return
+        with self._lock:
+            if self._executor is None:
+                _logger.warning(
+                    "Job runner stopped, job %s stays queued", job_id
+                )
+                return
+            self._executor.submit(self.run, job_id)
+
+    def _claim(self, session, job_id):
+        """Atomically move a pending job to running and return it.
+
+        Jobs that have used all their attempts are never claimed again.
+        """
+        now = datetime.now()
+        job = session.exec(
+            update(Job)
+            .where(
+                Job.id == job_id,
+                Job.status == JobStatus.PENDING,
+                Job.attempts < Job.max_attempts,
+            )
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                started_at=now,
+                updated_at=now,
+            )
+            .returning(Job),
+            execution_options={"synchronize_session": False},
+        ).scalar_one_or_none()
+        session.commit()
+        return job
+
+    def run(self, job_id: int):
+        """Claim and run one job, recording its outcome."""
+        with Session(engine) as session:
+            job = self._claim(session, job_id)
+            if job is None:
+                return
+
+            def report(progress: int, total: int = None):
+                values = {"progress": progress, "updated_at": datetime.now()}
+                if total is not None:
+                    values["total"] = total
+                session.exec(
+                    update(Job).where(Job.id == job_id).values(**values)
+                )
+                session.commit()
+
+            try:
+                handler = JOB_HANDLERS[job.kind]
+                result = handler(session, job, report)
+            except Exception as exc:
+                session.rollback()
+                self._fail(session, job, exc)
+                return
+
+            session.exec(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(
+                    status=JobStatus.SUCCEEDED,
+                    result=result,
+                    error=None,
+                    updated_at=datetime.now(),
+                    finished_at=datetime.now(),
+                )
+            )
+            session.commit()
+            _logger.info("Job %s (%s) succeeded", job_id, job.kind)
+
+    def _fail(self, session, job, exc):
+        """Retry a failed job with exponential backoff, or give up."""
+        retry = job.attempts < job.max_attempts
+        session.exec(
+            update(Job)
+            .where(Job.id == job.id)
+            .values(
+                status=JobStatus.PENDING if retry else JobStatus.FAILED,
+                error=str(exc),
+                updated_at=datetime.now(),
+                finished_at=None if retry else datetime.now(),
+            )
+        )
+        session.commit()
+        if retry:
+            delay = retry_delay(job.attempts)
+            _logger.warning(
+                "Job %s (%s) failed on attempt %s, retrying in %ss: %s",
+                job.id,
+                job.kind,
+                job.attempts,
+                delay,
+                exc,
+            )
+            self.submit(job.id, delay=delay)
+        else:
+            _logger.error(
+                "Job %s (%s) failed after %s attempts: %s",
+                job.id,
+                job.kind,
+                job.attempts,
+                exc,
+            )
+
+
+job_runner = JobRunner(max_workers=settings.JOB_WORKERS)
@@ -1,27 +1,110 @@
+import atexit
+import copy
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from app.config import settings
+from app.core.metrics import Counter
 
 LOG_PATH = os.path.expanduser("~/lexit_logs")
 os.makedirs(LOG_PATH, exist_ok=True)
 LOG_FILE = os.path.join(LOG_PATH, "app.log")
 
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full.",
+    ("level",),
+)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when full."""
+
+    def prepare(self, record):
+        """Merge the arguments into the message, keeping exc_info.
+
+        The base class also renders and clears the traceback so that
+        records can be pickled. The queue never leaves the process, so
+        the listener's formatter gets the traceback itself instead.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        """Queue a record, or count it as dropped if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DROPPED.inc(record.levelname)
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record):
+        """Return the record as a JSON document."""
+        document = {
+            "time": datetime.fromtimestamp(
+                record.created, tz=timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            document["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of the records below WARNING, and every other one."""
+
+    def __init__(self, rate: float):
+        """Keep records below WARNING with the given probability."""
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        """Return True if the record should be logged."""
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
 
 handler = RotatingFileHandler(LOG_FILE, maxBytes=10_000_000, backupCount=5)
-formatter = logging.Formatter(
-    "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-)
+if settings.LOG_JSON:
+    formatter = JsonFormatter()
+else:
+    formatter = logging.Formatter(
+        "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+    )
 handler.setFormatter(formatter)
 
-if not any(isinstance(h, RotatingFileHandler) for h in logger.handlers):
-    logger.addHandler(handler)
+log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+queue_handler = DroppingQueueHandler(log_queue)
+listener = QueueListener(log_queue, handler, respect_handler_level=True)
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+if not any(isinstance(h, DroppingQueueHandler) for h in logger.handlers):
+    logger.addHandler(queue_handler)
+    listener.start()
+    atexit.register(listener.stop)
 
 uvicorn_logger = logging.getLogger("uvicorn")
-uvicorn_logger.handlers = [handler]
+uvicorn_logger.handlers = [queue_handler]
 uvicorn_logger.setLevel(logging.INFO)
 
 uvicorn_access_logger = logging.getLogger("uvicorn.access")
-uvicorn_access_logger.handlers = [handler]
+uvicorn_access_logger.handlers = [queue_handler]
 uvicorn_access_logger.setLevel(logging.INFO)
+if settings.LOG_ACCESS_SAMPLE_RATE < 1:
+    uvicorn_access_logger.addFilter(
+        SamplingFilter(settings.LOG_ACCESS_SAMPLE_RATE)
+    )
@@ -0,0 +1,245 @@
+import threading
+import time
+from bisect import bisect_left
+
+DURATION_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY = []
+
+
+def _escape(value) -> str:
+    """Escape a label value for the text exposition format."""
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _format_labels(names, values, extra=()) -> str:
+    """Return the ``{name="value",...}`` part of a sample line."""
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    inner = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return "{" + inner + "}"
+
+
+def _format_value(value) -> str:
+    """Return a sample value, without a trailing .0 for whole numbers."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    """In-memory metric whose samples are keyed by label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels=()):
+        """Register a metric with the given name and label names."""
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def clear(self):
+        """Forget every sample."""
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        """Yield the lines of this metric in text exposition format."""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        with self._lock:
+            samples = sorted(self._values.items())
+        for values, sample in samples:
+            yield from self._render_sample(values, sample)
+
+    def _render_sample(self, values, value):
+        labels = _format_labels(self.labels, values)
+        yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Counter(Metric):
+    """Monotonic counter."""
+
+    kind = "counter"
+
+    def inc(self, *values, amount: float = 1):
+        """Add ``amount`` to the sample of the given label values."""
+        with self._lock:
+            self._values[values] = self._values.get(values, 0) + amount
+
+    def get(self, *values):
+        """Return the sample of the given label values."""
+        return self._values.get(values, 0)
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *values, amount: float = 1):
+        """Subtract ``amount`` from the sample of the given label values."""
+        self.inc(*values, amount=-amount)
+
+
+class Histogram(Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=()):
+        """Register a histogram counting observations into buckets."""
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *values):
+        """Record one observation for the given label values."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            sample = self._values.get(values)
+            if sample is None:
+                sample = self._values[values] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                ]
+            sample[0][index] += 1
+            sample[1] += value
+
+    def get(self, *values):
+        """Return the observation count and sum of the given label values."""
+        counts, total = self._values.get(values, ((), 0.0))
+        return sum(counts), total
+
+    def _render_sample(self, values, sample):
+        counts, total = sample
+        running = 0
+        for bound, count in zip((*self.buckets, "+Inf"), counts):
+            running += count
+            labels = _format_labels(self.labels, values, (("le", bound),))
+            yield f"{self.name}_bucket{labels} {running}"
+        labels = _format_labels(self.labels, values)
+        yield f"{self.name}_sum{labels} {_format_value(total)}"
+        yield f"{self.name}_count{labels} {running}"
+
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled.",
+    ("method", "route", "status"),
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests.",
+    ("method", "route", "status"),
+    DURATION_BUCKETS,
+)
+RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes",
+    "Size of HTTP response bodies.",
+    ("method", "route", "status"),
+    SIZE_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests being handled.",
+)
+RATE_LIMITED = Counter(
+    "http_rate_limited_total",
+    "HTTP requests rejected by the rate limiter.",
+    ("method", "route"),
+)
+DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent running SQL statements per HTTP request.",
+    ("method", "route"),
+    DURATION_BUCKETS,
+)
+DB_QUERIES = Counter(
+    "http_request_db_queries_total",
+    "SQL statements run by HTTP requests.",
+    ("method", "route"),
+)
+
+
+HTTP_METHODS = frozenset(
+    {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+)
+
+
+def method_label(method: str) -> str:
+    """Return the method of a request, folding unknown ones into OTHER."""
+    return method if method in HTTP_METHODS else "OTHER"
+
+
+def route_label(scope) -> str:
+    """Return the route template of a request, keeping labels bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def render_metrics() -> str:
+    """Return every registered metric in text exposition format."""
+    lines = [line for metric in REGISTRY for line in metric.render()]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latency and sizes."""
+
+    def __init__(self, app):
+        """Wrap an ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        """Handle a request, recording its metrics once it is sent."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status, size = 500, 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            labels = (
+                method_label(scope["method"]),
+                route_label(scope),
+                str(status),
+            )
+            REQUESTS.inc(*labels)
+            REQUEST_SECONDS.observe(time.perf_counter() - start, *labels)
+            RESPONSE_BYTES.observe(size, *labels)
@@ -0,0 +1,98 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config import settings
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class WaitHistogram:
+    """Thread-safe histogram of the time spent waiting for a connection."""
+
+    def __init__(self, buckets=WAIT_BUCKETS):
+        """Count waits into the given upper bounds, in seconds."""
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._timeouts = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Record one checkout that waited ``seconds``."""
+        index = next(
+            (i for i, bound in enumerate(self.buckets) if seconds <= bound),
+            len(self.buckets),
+        )
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+
+    def timeout(self):
+        """Record one checkout that gave up after the pool timeout."""
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self):
+        """Return cumulative bucket counts, like a Prometheus histogram."""
+        with self._lock:
+            counts, total, timeouts = (
+                list(self._counts),
+                self._sum,
+                self._timeouts,
+            )
+        cumulative, running = {}, 0
+        for bound, count in zip((*self.buckets, "+Inf"), counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {
+            "count": running,
+            "sum_seconds": total,
+            "timeouts": timeouts,
+            "buckets": cumulative,
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording how long each checkout waits for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        """Create the pool with an empty wait histogram."""
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = WaitHistogram()
+
+    def _do_get(self):
+        """Check a connection out, timing the wait."""
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_histogram.timeout()
+            raise
+        self.wait_histogram.observe(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Instrumented pool for engines created with create_async_engine."""
+
+
+def pool_stats(name: str, pool):
+    """Return live occupancy and wait statistics of an instrumented pool.
+
+    QueuePool has no public accessor for its overflow limit, so the
+    configured DB_MAX_OVERFLOW that every engine is created with is
+    reported instead.
+    """
+    return {
+        "name": name,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout_seconds": pool.timeout(),
+        "wait": pool.wait_histogram.snapshot(),
+    }
@@ -0,0 +1,83 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MAX_RECORDED_QUERIES = 100
+
+_current = ContextVar("query_stats", default=None)
+
+
+class Query(NamedTuple):
+    """One executed statement, its parameters and how long it took."""
+
+    statement: str
+    parameters: Any
+    seconds: float
+
+
+class QueryStats:
+    """Number of SQL statements and time spent in the database.
+
+    Only the first MAX_RECORDED_QUERIES statements are kept, but the
+    slowest one is always available.
+    """
+
+    def __init__(self):
+        """Start with no statement recorded."""
+        self.count = 0
+        self.duration = 0.0
+        self.queries = []
+        self.slowest = None
+
+    @property
+    def statements(self):
+        """Return the SQL of the recorded statements."""
+        return [query.statement for query in self.queries]
+
+    def record(self, statement: str, parameters, seconds: float):
+        """Record one executed statement."""
+        self.count += 1
+        self.duration += seconds
+        query = Query(statement, parameters, seconds)
+        if len(self.queries) < MAX_RECORDED_QUERIES:
+            self.queries.append(query)
+        if self.slowest is None or seconds > self.slowest.seconds:
+            self.slowest = query
+
+
+@contextmanager
+def track_queries():
+    """Count the statements executed in the current context.
+
+    The stats object is shared with the threads and tasks started from
+    this context, so the statements of sync routes run in the threadpool
+    are counted too.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    stats = _current.get()
+    starts = conn.info.get("query_start")
+    if stats is not None and starts:
+        stats.record(statement, parameters, time.perf_counter() - starts.pop())
@@ -0,0 +1,100 @@
+import itertools
+import threading
+import time
+
+import jwt
+
+from app.config import settings
+
+STICKY_COOKIE = "lexit_primary_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_sticky_users = {}
+_sticky_lock = threading.Lock()
+
+
+class ReadReplicas:
+    """Round-robin over read replica engines, skipping failed ones."""
+
+    def __init__(self, engines, retry_seconds: float = 30.0):
+        """Balance over ``engines``; a failed one rests ``retry_seconds``."""
+        self.engines = list(engines)
+        self.retry_seconds = retry_seconds
+        self._counter = itertools.count()
+        self._down_until = {}
+        self._lock = threading.Lock()
+
+    def pick(self):
+        """Return the next healthy replica engine, or None if there is none."""
+        if not self.engines:
+            return None
+        now = time.monotonic()
+        start = next(self._counter)
+        for offset in range(len(self.engines)):
+            candidate = self.engines[(start + offset) % len(self.engines)]
+            if self._down_until.get(id(candidate), 0) <= now:
+                return candidate
+        return None
+
+    def mark_down(self, engine):
+        """Stop routing reads to a replica for ``retry_seconds``."""
+        with self._lock:
+            self._down_until[id(engine)] = (
+                time.monotonic() + self.retry_seconds
+            )
+
+
+def request_user_id(request):
+    """Return the ``sub`` of the request's bearer token, or None."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(
+            token,
+            key=settings.JWT_SECRET_KEY,
+            algorithms=[settings.JWT_ALGORITHM],
+        )
+    except jwt.InvalidTokenError:
+        return None
+    return payload.get("sub")
+
+
+def is_sticky(request) -> bool:
+    """Return True while a client must read its own writes from primary.
+
+    Authenticated clients are tracked by user id in this process, the
+    cookie covers clients that send one back.
+    """
+    now = time.time()
+    user_id = request_user_id(request)
+    if user_id is not None and _sticky_users.get(user_id, 0) > now:
+        return True
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > now
+    except ValueError:
+        return False
+
+
+def stick_to_primary(request, response):
+    """Pin the client's reads to the primary for the stickiness window.
+
+    Expired user windows are pruned on every write, so the table only
+    holds users that wrote in the last DB_READ_STICKY_SECONDS.
+    """
+    now = time.time()
+    seconds = settings.DB_READ_STICKY_SECONDS
+    user_id = request_user_id(request)
+    if user_id is not None:
+        with _sticky_lock:
+            for key, until in list(_sticky_users.items()):
+                if until <= now:
+                    del _sticky_users[key]
+            _sticky_users[user_id] = now + seconds
+    response.set_cookie(
+        STICKY_COOKIE,
+        str(now + seconds),
+        max_age=seconds,
+        httponly=True,
+        samesite="lax",
+    )
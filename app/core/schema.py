@@ -0,0 +1,26 @@
+from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint
+
+
+def unindexed_foreign_keys(metadata):
+    """Return the (table, columns) of foreign keys no index can serve.
+
+    A foreign key counts as indexed when an index, unique constraint or
+    primary key starts with all of its columns, in any order.
+    """
+    missing = []
+    for table in metadata.sorted_tables:
+        leading = [
+            [column.name for column in index.columns]
+            for index in table.indexes
+        ] + [
+            [column.name for column in constraint.columns]
+            for constraint in table.constraints
+            if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint))
+        ]
+        for foreign_key in table.foreign_key_constraints:
+            columns = {column.name for column in foreign_key.columns}
+            if not any(
+                set(names[: len(columns)]) == columns for names in leading
+            ):
+                missing.append((table.name, tuple(sorted(columns))))
+    return sorted(missing)
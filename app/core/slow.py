@@ -0,0 +1,145 @@
+import re
+import threading
+from collections import deque
+from collections.abc import Mapping
+from datetime import datetime
+from logging import getLogger
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+
+_logger = getLogger(__name__)
+
+MAX_PARAMETERS_LENGTH = 1000
+SENSITIVE_COLUMNS = frozenset({"hashed_password", "password", "email"})
+REDACTED = "[redacted]"
+
+_sensitive_pattern = re.compile(
+    r"\b(" + "|".join(sorted(SENSITIVE_COLUMNS)) + r")\b", re.IGNORECASE
+)
+_bind_suffix = re.compile(r"_\d+$")
+
+
+class SlowRequestLog:
+    """Thread-safe ring buffer of the most recent slow requests."""
+
+    def __init__(self, max_size: int):
+        """Keep at most ``max_size`` records, dropping the oldest."""
+        self._records = deque(maxlen=max_size)
+        self._lock = threading.Lock()
+
+    def add(self, record: dict):
+        """Append a record, evicting the oldest one if full."""
+        with self._lock:
+            self._records.append(record)
+
+    def records(self):
+        """Return the records, newest first."""
+        with self._lock:
+            return list(reversed(self._records))
+
+    def clear(self):
+        """Forget every record."""
+        with self._lock:
+            self._records.clear()
+
+
+def is_sensitive(statement: str) -> bool:
+    """Return True if a statement reads or writes a sensitive column."""
+    return _sensitive_pattern.search(statement) is not None
+
+
+def _redact(statement, parameters):
+    """Replace the values bound to sensitive columns.
+
+    Named parameters are matched on their bind name; positional ones
+    cannot be, so all of them are hidden when the statement touches a
+    sensitive column.
+    """
+    if isinstance(parameters, list):
+        return [_redact(statement, item) for item in parameters]
+    if isinstance(parameters, Mapping):
+        return {
+            key: (
+                REDACTED
+                if _bind_suffix.sub("", key) in SENSITIVE_COLUMNS
+                else value
+            )
+            for key, value in parameters.items()
+        }
+    if is_sensitive(statement):
+        return tuple(REDACTED for _ in parameters)
+    return parameters
+
+
+def _format_parameters(statement, parameters):
+    """Return a bounded, redacted text form of statement parameters."""
+    if not parameters:
+        return None
+    text = repr(_redact(statement, parameters))
+    if len(text) > MAX_PARAMETERS_LENGTH:
+        return text[:MAX_PARAMETERS_LENGTH] + "..."
+    return text
+
+
+def explain(engine, query):
+    """Return the plan of a statement, without running it.
+
+    Statements run with executemany, statements on sensitive columns,
+    whose plan would show the bound values, and non-PostgreSQL engines
+    are skipped, as are statements the planner rejects.
+    """
+    if (
+        engine.dialect.name != "postgresql"
+        or isinstance(query.parameters, list)
+        or is_sensitive(query.statement)
+    ):
+        return None
+    try:
+        with engine.connect() as connection:
+            rows = connection.exec_driver_sql(
+                f"EXPLAIN (ANALYZE off) {query.statement}",
+                query.parameters or None,
+            ).all()
+    except SQLAlchemyError as exc:
+        _logger.warning("Could not explain slow statement: %s", exc)
+        return None
+    return "\n".join(row[0] for row in rows)
+
+
+def explain_into(record, engine, query):
+    """Store the plan of a statement in a slow request record."""
+    record["explain"] = explain(engine, query)
+
+
+def slow_request(method, route, path, status, seconds, stats, plan=None):
+    """Return the record of a slow request and its SQL statements."""
+    return {
+        "method": method,
+        "route": route,
+        "path": path,
+        "status": status,
+        "finished_at": datetime.now(),
+        "duration_ms": seconds * 1000,
+        "db_ms": stats.duration * 1000,
+        "app_ms": max(seconds - stats.duration, 0) * 1000,
+        "query_count": stats.count,
+        "queries": [
+            {
+                "statement": query.statement,
+                "parameters": _format_parameters(
+                    query.statement, query.parameters
+                ),
+                "duration_ms": query.seconds * 1000,
+            }
+            for query in stats.queries
+        ],
+        "slowest_statement": (
+            stats.slowest.statement if stats.slowest else None
+        ),
+        "explain": plan,
+    }
+
+
+slow_requests = SlowRequestLog(max_size=settings.SLOW_REQUEST_LOG_SIZE)
@@ -1,13 +1,41 @@
 from logging import getLogger
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
+from sqlalchemy.exc import OperationalError, TimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.requests import Request
 
 from app.config import settings
+from app.core import queries  # noqa: F401
+from app.core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from app.core.replicas import ReadReplicas, is_sticky
 
 log = getLogger(__name__)
 
-engine = create_engine(settings.database_url)
+engine = create_engine(
+    settings.database_url,
+    poolclass=InstrumentedQueuePool,
+    **settings.pool_options,
+)
+async_engine = create_async_engine(
+    settings.database_url,
+    poolclass=InstrumentedAsyncQueuePool,
+    **settings.pool_options,
+)
+read_replicas = ReadReplicas(
+    create_engine(
+        url, poolclass=InstrumentedQueuePool, **settings.pool_options
+    )
+    for url in settings.DB_READ_REPLICA_URLS
+)
+async_read_replicas = ReadReplicas(
+    create_async_engine(
+        url, poolclass=InstrumentedAsyncQueuePool, **settings.pool_options
+    )
+    for url in settings.DB_READ_REPLICA_URLS
+)
 
 Base = SQLModel
 
@@ -19,6 +47,63 @@ def init_db():
 
 def get_session() -> Generator[Session, Session, None]:
     """Return a generator for a database session to be used in routers."""
-    log.info("Initialising database session...")
+    log.debug("Initialising database session...")
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Return an async database session for non-blocking routers."""
+    log.debug("Initialising async database session...")
+    async with AsyncSession(async_engine) as session:
+        yield session
+
+
+def get_read_session(request: Request) -> Generator[Session, Session, None]:
+    """Return a session for read-only routers, on a replica if possible.
+
+    Clients that wrote recently, or any client when every replica is
+    down, read from the primary.
+    """
+    replica = None if is_sticky(request) else read_replicas.pick()
+    if replica is not None:
+        with Session(replica) as session:
+            try:
+                session.connection()
+            except OperationalError as exc:
+                log.warning("Read replica unavailable, using primary: %s", exc)
+                read_replicas.mark_down(replica)
+            except TimeoutError as exc:
+                log.warning(
+                    "Read replica pool exhausted, using primary: %s", exc
+                )
+            else:
+                yield session
+                return
+
+    with Session(engine) as session:
+        yield session
+
+
+async def get_async_read_session(
+    request: Request,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Return an async session for read-only routers, on a replica if possible."""
+    replica = None if is_sticky(request) else async_read_replicas.pick()
+    if replica is not None:
+        async with AsyncSession(replica) as session:
+            try:
+                await session.connection()
+            except OperationalError as exc:
+                log.warning("Read replica unavailable, using primary: %s", exc)
+                async_read_replicas.mark_down(replica)
+            except TimeoutError as exc:
+                log.warning(
+                    "Read replica pool exhausted, using primary: %s", exc
+                )
+            else:
+                yield session
+                return
+
+    async with AsyncSession(async_engine) as session:
+        yield session
@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import List, Optional
 
 from sqlmodel import SQLModel
@@ -22,4 +23,10 @@ class CountryRead(CountryCreate):
     id: int
     created_at: datetime
     updated_at: datetime
-    languages: Optional[List[LanguageRead]]
+    languages: Optional[List[LanguageRead]] = None
+
+
+class CountryInclude(str, Enum):
+    """Relationships a country read can embed."""
+
+    LANGUAGES = "languages"
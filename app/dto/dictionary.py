@@ -1,8 +1,11 @@
 from datetime import datetime
+from enum import Enum
 from typing import Optional
 
 from sqlmodel import SQLModel
 
+from app.dto.language import LanguageRead
+
 
 class DictionaryCreate(SQLModel):
     """Dictionary Create DTO."""
@@ -22,6 +25,20 @@ class DictionaryRead(DictionaryCreate):
     updated_at: datetime
 
 
+class DictionaryDetail(DictionaryRead):
+    """Dictionary Read DTO with its optional relationships."""
+
+    source_language: Optional[LanguageRead] = None
+    target_language: Optional[LanguageRead] = None
+
+
+class DictionaryInclude(str, Enum):
+    """Relationships a dictionary read can embed."""
+
+    SOURCE_LANGUAGE = "source_language"
+    TARGET_LANGUAGE = "target_language"
+
+
 class DictionaryUpdate(SQLModel):
     """Dictionary Update DTO."""
 
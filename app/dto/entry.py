@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import List, Optional
 
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
 
 
 class EntryUpdate(SQLModel):
@@ -28,3 +29,152 @@ class EntryRead(EntryCreate):
     is_expression: bool
     created_at: datetime
     updated_at: datetime
+
+
+class EntrySuggestion(SQLModel):
+    """Entry Suggestion DTO."""
+
+    id: int
+    original_name: str
+    translation: str
+    is_expression: bool
+
+
+class EntryFuzzyMatch(EntrySuggestion):
+    """Entry Fuzzy Match DTO."""
+
+    distance: Optional[int] = None
+    similarity: Optional[float] = None
+
+
+class EntryAnnotation(EntrySuggestion):
+    """Entry Annotation DTO."""
+
+    start: int
+    end: int
+    text: str
+
+
+class AnnotateRequest(SQLModel):
+    """Annotate Request DTO."""
+
+    text: str = Field(max_length=100_000)
+
+
+class LookupRequest(SQLModel):
+    """Lookup Request DTO."""
+
+    words: List[str] = Field(max_length=5000)
+
+
+class WordLookup(SQLModel):
+    """Word Lookup DTO."""
+
+    word: str
+    found: bool
+    entries: List[EntrySuggestion]
+
+
+class EntryPage(SQLModel):
+    """Entry Page DTO."""
+
+    items: List[EntryRead]
+    next_cursor: Optional[str] = None
+
+
+class EntryChanges(SQLModel):
+    """Entry Changes DTO."""
+
+    items: List[EntryRead]
+    deleted: List[int]
+    next_cursor: str
+    has_more: bool
+
+
+class EntryFileFormat(str, Enum):
+    """Supported file formats for entry export and import."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class LookupMode(str, Enum):
+    """How a lookup term is matched against normalized keys."""
+
+    EXACT = "exact"
+    PREFIX = "prefix"
+
+
+class ConflictPolicy(str, Enum):
+    """How entry writes handle an existing name in the dictionary."""
+
+    ERROR = "error"
+    IGNORE = "ignore"
+    UPDATE = "update"
+
+
+class EntryImport(SQLModel):
+    """Entry Import row DTO."""
+
+    original_name: str
+    translation: str
+    description: Optional[str] = None
+    is_expression: bool = False
+
+
+class EntryImportError(SQLModel):
+    """Entry Import row error DTO."""
+
+    line: int
+    original_name: Optional[str] = None
+    detail: str
+
+
+class EntryImportResult(SQLModel):
+    """Entry Import result DTO."""
+
+    created: int = 0
+    updated: int = 0
+    conflicts: List[EntryImportError] = []
+    errors: List[EntryImportError] = []
+
+
+class EntryOperationType(str, Enum):
+    """Kinds of operation accepted by the batch endpoint."""
+
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class EntryOperation(SQLModel):
+    """Entry batch operation DTO."""
+
+    op: EntryOperationType
+    id: Optional[int] = None
+    original_name: Optional[str] = None
+    translation: Optional[str] = None
+    description: Optional[str] = None
+    is_expression: Optional[bool] = None
+
+
+class EntryBatchRequest(SQLModel):
+    """Entry batch request DTO."""
+
+    operations: List[EntryOperation] = Field(min_length=1, max_length=1000)
+
+
+class EntryOperationResult(SQLModel):
+    """Entry batch operation result DTO."""
+
+    index: int
+    op: EntryOperationType
+    status: int
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class EntryBatchResult(SQLModel):
+    """Entry batch result DTO."""
+
+    results: List[EntryOperationResult]
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlmodel import SQLModel
+
+
+class PoolWaitStats(SQLModel):
+    """Pool Wait Stats DTO."""
+
+    count: int
+    sum_seconds: float
+    timeouts: int
+    buckets: Dict[str, int]
+
+
+class PoolStats(SQLModel):
+    """Pool Stats DTO."""
+
+    name: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    timeout_seconds: float
+    wait: PoolWaitStats
+
+
+class SlowQuery(SQLModel):
+    """Slow Query DTO."""
+
+    statement: str
+    parameters: Optional[str]
+    duration_ms: float
+
+
+class SlowRequest(SQLModel):
+    """Slow Request DTO."""
+
+    method: str
+    route: str
+    path: str
+    status: int
+    finished_at: datetime
+    duration_ms: float
+    db_ms: float
+    app_ms: float
+    query_count: int
+    queries: List[SlowQuery]
+    slowest_statement: Optional[str]
+    explain: Optional[str]
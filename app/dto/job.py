@@ -0,0 +1,32 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlmodel import SQLModel
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobRead(SQLModel):
+    """Job Read DTO."""
+
+    id: int
+    kind: str
+    status: JobStatus
+    payload: dict
+    result: Optional[dict] = None
+    progress: int
+    total: Optional[int] = None
+    attempts: int
+    max_attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
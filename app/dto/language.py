@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import List, Optional
 
 from sqlmodel import SQLModel
 
@@ -18,3 +19,23 @@ class LanguageRead(LanguageCreate):
     id: int
     created_at: datetime
     updated_at: datetime
+
+
+class LanguageCountryRead(SQLModel):
+    """Country embedded in a language read."""
+
+    id: int
+    name: str
+    code: str
+
+
+class LanguageDetail(LanguageRead):
+    """Language Read DTO with its optional relationships."""
+
+    countries: Optional[List[LanguageCountryRead]] = None
+
+
+class LanguageInclude(str, Enum):
+    """Relationships a language read can embed."""
+
+    COUNTRIES = "countries"
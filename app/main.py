@@ -1,23 +1,40 @@
 import importlib
 import pkgutil
 import re
+import time
 from contextlib import asynccontextmanager
 from logging import INFO, basicConfig, getLogger
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi.errors import RateLimitExceeded
+from starlette.background import BackgroundTask, BackgroundTasks
 
 import app.core.logger  # noqa: F401
 from app import models  # noqa: F401
 from app.config import settings
+from app.core.jobs import job_runner
 from app.core.limiter import limiter
+from app.core.metrics import (
+    CONTENT_TYPE,
+    DB_QUERIES,
+    DB_SECONDS,
+    RATE_LIMITED,
+    MetricsMiddleware,
+    method_label,
+    render_metrics,
+    route_label,
+)
 from app.core.openapi import custom_openapi
-from app.database import init_db
+from app.core.queries import track_queries
+from app.core.replicas import SAFE_METHODS, stick_to_primary
+from app.core.slow import explain_into, slow_request, slow_requests
+from app.database import engine, init_db
 from app.routes import __name__ as routes_pkg
 from app.routes import __path__ as routes_path
 from app.routes import country
+from app.routes.internal import require_superuser
 
 origins = [
     "http://localhost:8080",
@@ -43,14 +60,16 @@ _logger = getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize the database at startup."""
+    """Initialize the database and the job runner at startup."""
     _logger.info("Starting up...")
     init_db()
 
     data = country.load_csv_at_startup()
     _logger.info("CSV loaded with %s rows", len(data))
+    job_runner.start()
     yield
     _logger.info("Shutting down...")
+    job_runner.shutdown()
     _logger.info("Finished shutting down.")
 
 
@@ -86,11 +105,81 @@ app.add_middleware(
 include_all_routers(app)
 
 
+@app.middleware("http")
+async def stick_writers_to_primary(request: Request, call_next):
+    """Send a client's reads to the primary for a while after it writes."""
+    response = await call_next(request)
+    if (
+        settings.DB_READ_REPLICA_URLS
+        and request.method not in SAFE_METHODS
+        and response.status_code < 400
+    ):
+        stick_to_primary(request, response)
+    return response
+
+
+@app.middleware("http")
+async def count_queries(request: Request, call_next):
+    """Count the SQL statements of a request and flag slow ones.
+
+    Requests over the query budget are logged, and requests slower than
+    SLOW_REQUEST_SECONDS are kept with their statements for
+    /internal/slow-requests. Their slowest statement is explained after
+    the response is sent, off the request's critical path.
+    """
+    start = time.perf_counter()
+    with track_queries() as stats:
+        response = await call_next(request)
+    elapsed = time.perf_counter() - start
+
+    labels = (method_label(request.method), route_label(request.scope))
+    DB_QUERIES.inc(*labels, amount=stats.count)
+    DB_SECONDS.observe(stats.duration, *labels)
+    if stats.count > settings.DB_QUERY_BUDGET:
+        route = request.scope.get("route")
+        _logger.warning(
+            "%s %s ran %s queries (budget %s) in %.1fms",
+            request.method,
+            route.path if route else request.url.path,
+            stats.count,
+            settings.DB_QUERY_BUDGET,
+            stats.duration * 1000,
+        )
+    if 0 < settings.SLOW_REQUEST_SECONDS <= elapsed:
+        record = slow_request(
+            request.method,
+            labels[1],
+            request.url.path,
+            response.status_code,
+            elapsed,
+            stats,
+        )
+        slow_requests.add(record)
+        if settings.SLOW_REQUEST_EXPLAIN and stats.slowest is not None:
+            explain_plan = BackgroundTask(
+                explain_into, record, engine, stats.slowest
+            )
+            if response.background is None:
+                response.background = explain_plan
+            else:
+                tasks = BackgroundTasks([response.background])
+                tasks.tasks.append(explain_plan)
+                response.background = tasks
+    if settings.DEBUG:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Query-Time"] = f"{stats.duration * 1000:.1f}"
+    return response
+
+
+app.add_middleware(MetricsMiddleware)
+
+
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_exceeded_handler(
     request: Request, exc: RateLimitExceeded
 ):
     """Customize the rate limit exceeded error response."""
+    RATE_LIMITED.inc(method_label(request.method), route_label(request.scope))
     limit_str = str(exc.limit.limit)
     match = re.search(r"per (\d+) (\w+)", limit_str)
     if match:
@@ -124,3 +213,17 @@ def read_root():
         "debug": settings.DEBUG,
         "message": "Hello from Lexit!",
     }
+
+
+@app.get(
+    "/metrics",
+    include_in_schema=False,
+    dependencies=[Depends(require_superuser)],
+)
+@limiter.limit("60/minute")
+def read_metrics(request: Request):
+    """Return the in-memory metrics in Prometheus text format.
+
+    Like /internal/*, only superusers may scrape them.
+    """
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
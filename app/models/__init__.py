@@ -2,5 +2,7 @@ from .country import Country
 from .countryLanguage import CountryLanguageLink
 from .dictionary import Dictionary
 from .entry import Entry
+from .entryTombstone import EntryTombstone
+from .job import Job
 from .language import Language
 from .user import User
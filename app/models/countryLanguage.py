@@ -11,5 +11,6 @@ class CountryLanguageLink(SQLModel, table=True):
     language_id: Optional[int] = Field(
         default=None,
         foreign_key="language.id",
-        primary_key=True
+        primary_key=True,
+        index=True
         )
\ No newline at end of file
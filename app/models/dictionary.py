@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
+from sqlalchemy import false
 from sqlmodel import Field, Relationship, SQLModel, UniqueConstraint
 
 if TYPE_CHECKING:
@@ -24,10 +25,16 @@ class Dictionary(SQLModel, table=True):
     name: str
     description: Optional[str] = Field(default=None, max_length=500)
     display_name: Optional[str] = Field(default=None, nullable=True)
+    version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    is_deleting: bool = Field(
+        default=False, sa_column_kwargs={"server_default": false()}
+    )
 
     source_language_id: int = Field(foreign_key="language.id")
-    target_language_id: int = Field(foreign_key="language.id")
-    user_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    target_language_id: int = Field(foreign_key="language.id", index=True)
+    user_id: Optional[int] = Field(
+        default=None, foreign_key="user.id", index=True
+    )
 
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
@@ -47,5 +54,8 @@ class Dictionary(SQLModel, table=True):
     user: Optional["User"] = Relationship(back_populates="dictionaries")
     entries: List["Entry"] = Relationship(
         back_populates="dictionary",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
+        sa_relationship_kwargs={
+            "cascade": "all, delete-orphan",
+            "passive_deletes": True,
+        },
     )
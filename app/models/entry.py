@@ -1,7 +1,8 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlmodel import Field, Relationship, SQLModel, UniqueConstraint
+from sqlalchemy import DDL, event
+from sqlmodel import Field, Index, Relationship, SQLModel, UniqueConstraint
 
 if TYPE_CHECKING:
     from app.models.dictionary import Dictionary
@@ -10,18 +11,57 @@ if TYPE_CHECKING:
 class Entry(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     original_name: str
+    normalized_name: Optional[str] = Field(default=None, nullable=True)
     display_name: Optional[str] = Field(default=None, nullable=True)
     translation: str
+    normalized_translation: Optional[str] = Field(default=None, nullable=True)
     created_at: Optional[datetime] = Field(default_factory=datetime.now)
     updated_at: Optional[datetime] = Field(default_factory=datetime.now)
     is_expression: bool = Field(default=False)
     description: Optional[str] = None
 
-    dictionary_id: int = Field(default=None, foreign_key="dictionary.id")
+    dictionary_id: int = Field(
+        default=None, foreign_key="dictionary.id", ondelete="CASCADE"
+    )
     dictionary: Optional["Dictionary"] = Relationship(back_populates="entries")
 
     __table_args__ = (
         UniqueConstraint(
             "original_name", "dictionary_id", name="uix_entry_name_dict"
         ),
+        Index("ix_entry_dictionary_id_id", "dictionary_id", "id"),
+        Index(
+            "ix_entry_dictionary_id_updated_at_id",
+            "dictionary_id",
+            "updated_at",
+            "id",
+        ),
+        Index(
+            "ix_entry_normalized_name_trgm",
+            "normalized_name",
+            postgresql_using="gin",
+            postgresql_ops={"normalized_name": "gin_trgm_ops"},
+        ),
     )
+
+
+# Search keys are indexed and compared in the "C" collation, whose byte
+# order lets one btree serve both LIKE 'prefix%' ranges and ORDER BY.
+Index(
+    "ix_entry_dictionary_id_normalized_name",
+    Entry.dictionary_id,
+    Entry.normalized_name.collate("C"),
+)
+Index(
+    "ix_entry_dictionary_id_normalized_translation",
+    Entry.dictionary_id,
+    Entry.normalized_translation.collate("C"),
+)
+
+event.listen(
+    Entry.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        dialect="postgresql"
+    ),
+)
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, Index, SQLModel
+
+
+class EntryTombstone(SQLModel, table=True):
+    """Record an entry deletion for delta sync clients."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    entry_id: int
+    dictionary_id: int = Field(foreign_key="dictionary.id", ondelete="CASCADE")
+    deleted_at: datetime = Field(default_factory=datetime.now)
+
+    __table_args__ = (
+        Index("ix_entrytombstone_dictionary_id_id", "dictionary_id", "id"),
+    )
@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, Index, SQLModel
+
+
+class Job(SQLModel, table=True):
+    """Define a background Job Model."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str
+    status: str = Field(default="pending")
+    payload: dict = Field(default_factory=dict, sa_column=Column(JSON))
+    result: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    progress: int = Field(default=0)
+    total: Optional[int] = None
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=3)
+    error: Optional[str] = None
+    user_id: Optional[int] = Field(
+        default=None, foreign_key="user.id", ondelete="SET NULL", index=True
+    )
+
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    __table_args__ = (
+        Index("ix_job_status_updated_at", "status", "updated_at"),
+    )
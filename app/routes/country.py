@@ -1,14 +1,17 @@
 import csv
 from logging import getLogger
 from pathlib import Path
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.exceptions import HTTPException
 from sqlmodel import Session, select
 from starlette.requests import Request
 
+from app.core.include import include_options, read_with
 from app.core.limiter import limiter
-from app.database import engine, get_session
-from app.dto.country import CountryCreate, CountryRead
+from app.database import engine, get_read_session, get_session
+from app.dto.country import CountryCreate, CountryInclude, CountryRead
 from app.models.country import Country
 from app.models.countryLanguage import CountryLanguageLink
 from app.models.language import Language
@@ -18,19 +21,32 @@ _logger = getLogger(__name__)
 
 
 @router.get("/", response_model=list[CountryRead])
-def get_country(session: Session = Depends(get_session)):
-    """Return all countries."""
-    return session.exec(select(Country)).all()
+def get_country(
+    session: Session = Depends(get_read_session),
+    include: Annotated[Optional[List[CountryInclude]], Query()] = None,
+):
+    """Return all countries with the requested relationships."""
+    countries = session.exec(
+        select(Country).options(*include_options(Country, include))
+    ).all()
+    return [read_with(CountryRead, country, include) for country in countries]
 
 
-@router.get("/{id}", response_model=list[CountryRead])
+@router.get("/{country_id}", response_model=CountryRead)
 def get_country_by_id(
-    country_id: int, session: Session = Depends(get_session)
+    country_id: int,
+    session: Session = Depends(get_read_session),
+    include: Annotated[Optional[List[CountryInclude]], Query()] = None,
 ):
-    """Return a country by its ID."""
-    return session.exec(
-        select(Country).where(Country.id == country_id)
+    """Return a country by its ID with the requested relationships."""
+    country = session.exec(
+        select(Country)
+        .where(Country.id == country_id)
+        .options(*include_options(Country, include))
     ).first()
+    if not country:
+        raise HTTPException(status_code=404, detail="Country not found")
+    return read_with(CountryRead, country, include)
 
 
 @router.post("/", response_model=CountryRead, status_code=201)
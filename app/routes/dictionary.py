@@ -1,47 +1,96 @@
 from logging import getLogger
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from fastapi.exceptions import HTTPException
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.requests import Request
 
+from app.core.etag import etag_matches, make_etag, not_modified
+from app.core.include import include_options, read_with
+from app.core.jobs import job_runner
 from app.core.limiter import limiter
-from app.database import get_session
+from app.database import get_async_read_session, get_read_session, get_session
 from app.dto.dictionary import (
     DictionaryCreate,
+    DictionaryDetail,
+    DictionaryInclude,
     DictionaryRead,
     DictionaryUpdate,
 )
+from app.dto.job import JobRead
 from app.models.dictionary import Dictionary
 from app.models.user import User
-from app.services.dictionary import compute_display_name
+from app.services.deletion import start_dictionary_deletion
+from app.services.dictionary import (
+    compute_display_name,
+    delete_owned_dictionary,
+)
+from app.services.reindex import REINDEX_DICTIONARY_JOB
 from app.services.user import get_current_user
 
 router = APIRouter()
 _logger = getLogger(__name__)
 
 
-@router.get("/", response_model=list[DictionaryRead])
+@router.get("/", response_model=list[DictionaryDetail])
 @limiter.limit("10/minute")
 def get_dictionaries(
-    request: Request, session: Session = Depends(get_session)
+    request: Request,
+    session: Session = Depends(get_read_session),
+    include: Annotated[Optional[List[DictionaryInclude]], Query()] = None,
 ):
-    """Return all dictionaries."""
-    return session.exec(select(Dictionary)).all()
+    """Return all dictionaries with the requested relationships."""
+    dictionaries = session.exec(
+        select(Dictionary)
+        .where(Dictionary.is_deleting.is_(False))
+        .options(*include_options(Dictionary, include))
+    ).all()
+    return [
+        read_with(DictionaryDetail, dictionary, include)
+        for dictionary in dictionaries
+    ]
 
 
-@router.get("/{id}", response_model=list[DictionaryRead])
+@router.get("/{id}", response_model=DictionaryDetail)
 @limiter.limit("1000/day")
-def get_dictionary_by_id(
+async def get_dictionary_by_id(
     request: Request,
     dictionary_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_read_session),
+    response: Response = None,
+    include: Annotated[Optional[List[DictionaryInclude]], Query()] = None,
 ):
-    """Return a dictionary by its ID."""
-    return session.exec(
-        select(Dictionary).where(Dictionary.id == dictionary_id)
-    ).first()
+    """Return a dictionary by its ID, honouring If-None-Match.
+
+    The ETag covers the requested relationships, since they change the
+    body.
+    """
+    result = await session.exec(
+        select(Dictionary)
+        .where(
+            Dictionary.id == dictionary_id,
+            Dictionary.is_deleting.is_(False),
+        )
+        .options(*include_options(Dictionary, include))
+    )
+    db_dictionary = result.first()
+    if not db_dictionary:
+        raise HTTPException(status_code=404, detail="Dictionary not found")
+
+    etag = make_etag(
+        "dictionary",
+        dictionary_id,
+        db_dictionary.version,
+        ",".join(sorted({item.value for item in include or ()})),
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    if response is not None:
+        response.headers["ETag"] = etag
+    return read_with(DictionaryDetail, db_dictionary, include)
 
 
 @router.post("/", response_model=DictionaryRead, status_code=201)
@@ -97,6 +146,7 @@ def update_own_dictionary(
     update_data = dictionary_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_dictionary, key, value)
+    db_dictionary.version = Dictionary.version + 1
 
     try:
         session.commit()
@@ -133,6 +183,7 @@ def admin_update_dictionary(
     update_data = dictionary_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_dictionary, key, value)
+    db_dictionary.version = Dictionary.version + 1
 
     try:
         session.commit()
@@ -146,27 +197,83 @@ def admin_update_dictionary(
     return db_dictionary
 
 
-@router.delete("/{dictionary_id}", status_code=204)
-@limiter.limit("10/minute")
-def delete_own_dictionary(
+def _raise_not_deletable(session, dictionary_id, user_id):
+    """Raise the 404, 409 or 403 explaining why nothing was deleted."""
+    db_dictionary = session.get(Dictionary, dictionary_id)
+    if not db_dictionary:
+        raise HTTPException(status_code=404, detail="Dictionary not found")
+    if db_dictionary.user_id == user_id and db_dictionary.is_deleting:
+        raise HTTPException(
+            status_code=409, detail="This dictionary is being deleted."
+        )
+    raise HTTPException(
+        status_code=403,
+        detail="You are not authorized to delete this dictionary.",
+    )
+
+
+@router.post(
+    "/{dictionary_id}/reindex", response_model=JobRead, status_code=202
+)
+@limiter.limit("5/minute")
+def reindex_own_dictionary(
     request: Request,
     dictionary_id: int,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    """Delete a dictionary by its ID."""
+    """Recompute the display names and search keys of a dictionary."""
     db_dictionary = session.get(Dictionary, dictionary_id)
     if not db_dictionary:
         raise HTTPException(status_code=404, detail="Dictionary not found")
 
-    if db_dictionary.user_id != current_user.id:
+    if (
+        db_dictionary.user_id != current_user.id
+        and not current_user.is_superuser
+    ):
         raise HTTPException(
             status_code=403,
-            detail="You are not authorized to delete this dictionary.",
+            detail="You are not authorized to update this dictionary.",
+        )
+
+    return job_runner.enqueue(
+        session,
+        REINDEX_DICTIONARY_JOB,
+        {"dictionary_id": dictionary_id},
+        user_id=current_user.id,
+    )
+
+
+@router.delete("/{dictionary_id}", status_code=204)
+@limiter.limit("10/minute")
+def delete_own_dictionary(
+    request: Request,
+    dictionary_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    response: Response = None,
+    background: Annotated[bool, Query()] = False,
+):
+    """Delete a dictionary by its ID, optionally in the background.
+
+    In background mode the dictionary is hidden at once, a 202 with the
+    deletion job is returned and a job runner removes its entries in
+    chunks.
+    """
+    if background:
+        job = start_dictionary_deletion(
+            session, dictionary_id, current_user.id
         )
+        if job is None:
+            _raise_not_deletable(session, dictionary_id, current_user.id)
+        if response is not None:
+            response.status_code = 202
+        return JobRead.model_validate(job)
 
     try:
-        session.delete(db_dictionary)
+        deleted = delete_owned_dictionary(
+            session, dictionary_id, current_user.id
+        )
         session.commit()
     except Exception as exc:
         session.rollback()
@@ -175,6 +282,10 @@ def delete_own_dictionary(
             status_code=500,
             detail="An error occurred while deleting the dictionary",
         ) from exc
+
+    if deleted is None:
+        _raise_not_deletable(session, dictionary_id, current_user.id)
+
     return {
         "message": "Dictionary %s deleted successfully!",
         dictionary_id: dictionary_id,
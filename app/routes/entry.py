@@ -1,52 +1,417 @@
-from datetime import datetime
 from logging import getLogger
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response, UploadFile
 from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import Session, select, tuple_
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.requests import Request
 
+from app.core.cursor import decode_cursor, encode_cursor
+from app.core.etag import etag_matches, make_etag, not_modified
 from app.core.limiter import limiter
-from app.database import get_session
-from app.dto.entry import EntryCreate, EntryRead, EntryUpdate
+from app.database import get_async_read_session, get_read_session, get_session
+from app.dto.entry import (
+    AnnotateRequest,
+    ConflictPolicy,
+    EntryAnnotation,
+    EntryBatchRequest,
+    EntryBatchResult,
+    EntryChanges,
+    EntryCreate,
+    EntryFileFormat,
+    EntryFuzzyMatch,
+    EntryImportResult,
+    EntryPage,
+    EntryRead,
+    EntrySuggestion,
+    EntryUpdate,
+    LookupMode,
+    LookupRequest,
+    WordLookup,
+)
 from app.models.dictionary import Dictionary
 from app.models.entry import Entry
 from app.models.user import User
-from app.services.entry import compute_display_name
+from app.services.annotate import annotate_text
+from app.services.batch import apply_entry_operations
+from app.services.dictionary import (
+    bump_dictionary_version,
+    get_dictionary_version,
+    get_dictionary_version_async,
+)
+from app.services.entry import (
+    bulk_import_entries,
+    compute_display_name,
+    compute_search_keys,
+    delete_owned_entry,
+    patch_entry,
+    read_entry_rows,
+    record_deletion,
+    upsert_entry,
+)
+from app.services.export import stream_dictionary_entries
+from app.services.fuzzy import search_fuzzy
+from app.services.search import (
+    lookup_words,
+    search_prefix,
+    search_translation,
+)
+from app.services.sync import get_entry_changes
 from app.services.user import get_current_user
 
 router = APIRouter()
 _logger = getLogger(__name__)
 
+PageLimit = Annotated[int, Query(ge=1, le=1000)]
 
-@router.get("/", response_model=list[EntryRead])
+EXPORT_MEDIA_TYPES = {
+    EntryFileFormat.NDJSON: "application/x-ndjson",
+    EntryFileFormat.CSV: "text/csv",
+}
+
+
+def _paginate(session, statement, limit, cursor_of):
+    """Run a keyset-ordered statement and return one page of entries."""
+    rows = session.exec(statement.limit(limit + 1)).all()
+    return _page(rows, limit, cursor_of)
+
+
+def _page(rows, limit, cursor_of):
+    """Return a page of at most ``limit`` rows fetched with one extra."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(*cursor_of(rows[-1]))
+    return EntryPage(items=rows, next_cursor=next_cursor)
+
+
+@router.get("/", response_model=EntryPage)
 @limiter.limit("1000/day")
-def get_entries(request: Request, session: Session = Depends(get_session)):
-    """Return all entries."""
-    return session.exec(select(Entry)).all()
+def get_entries(
+    request: Request,
+    session: Session = Depends(get_read_session),
+    cursor: Optional[str] = None,
+    limit: PageLimit = 100,
+):
+    """Return a page of entries, ordered by dictionary then ID."""
+    statement = select(Entry).order_by(Entry.dictionary_id, Entry.id)
+    if cursor:
+        dictionary_id, entry_id = decode_cursor(cursor, int, int)
+        statement = statement.where(
+            tuple_(Entry.dictionary_id, Entry.id)
+            > tuple_(dictionary_id, entry_id)
+        )
+    return _paginate(
+        session, statement, limit, lambda e: (e.dictionary_id, e.id)
+    )
 
 
 @router.get("/{id}", response_model=EntryRead)
 @limiter.limit("1000/day")
-def get_entry_by_id(
-    request: Request, entry_id: int, session: Session = Depends(get_session)
+async def get_entry_by_id(
+    request: Request,
+    entry_id: int,
+    session: AsyncSession = Depends(get_async_read_session),
 ):
     """Return an entry by its ID."""
-    return session.exec(select(Entry).where(Entry.id == entry_id)).first()
+    result = await session.exec(select(Entry).where(Entry.id == entry_id))
+    return result.first()
 
 
-@router.get("/dictionary/{dictionary_id}", response_model=list[EntryRead])
+@router.get("/dictionary/{dictionary_id}", response_model=EntryPage)
 @limiter.limit("5000/day")
-def get_entries_by_dictionary_id(
+async def get_entries_by_dictionary_id(
+    request: Request,
+    dictionary_id: int,
+    session: AsyncSession = Depends(get_async_read_session),
+    cursor: Optional[str] = None,
+    limit: PageLimit = 100,
+    response: Response = None,
+):
+    """Return a page of entries for a given dictionary.
+
+    The page carries an ETag derived from the dictionary version, so an
+    unchanged poll is answered with a 304 after a single-row lookup.
+    """
+    version = await get_dictionary_version_async(session, dictionary_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Dictionary not found")
+
+    etag = make_etag("entries", dictionary_id, version, cursor, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    if response is not None:
+        response.headers["ETag"] = etag
+
+    statement = (
+        select(Entry)
+        .where(Entry.dictionary_id == dictionary_id)
+        .order_by(Entry.id)
+    )
+    if cursor:
+        cursor_dictionary_id, entry_id = decode_cursor(cursor, int, int)
+        if cursor_dictionary_id != dictionary_id:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        statement = statement.where(Entry.id > entry_id)
+    result = await session.exec(statement.limit(limit + 1))
+    return _page(result.all(), limit, lambda e: (e.dictionary_id, e.id))
+
+
+def _get_dictionary_version(session, dictionary_id):
+    """Return the version of a readable dictionary, or raise a 404."""
+    version = get_dictionary_version(session, dictionary_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Dictionary not found")
+    return version
+
+
+@router.get(
+    "/dictionary/{dictionary_id}/search",
+    response_model=list[EntrySuggestion],
+)
+@limiter.limit("300/minute")
+def search_entries_by_prefix(
+    request: Request,
+    dictionary_id: int,
+    prefix: Annotated[str, Query(min_length=1, max_length=100)],
+    session: Session = Depends(get_read_session),
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+):
+    """Return entries of a dictionary whose name starts with a prefix.
+
+    This stays a sync route, run in the threadpool, because building the
+    prefix index on a cache miss is CPU-bound and would block the loop.
+    """
+    _get_dictionary_version(session, dictionary_id)
+    return search_prefix(session, dictionary_id, prefix, limit)
+
+
+@router.get(
+    "/dictionary/{dictionary_id}/reverse",
+    response_model=list[EntrySuggestion],
+)
+@limiter.limit("300/minute")
+def search_entries_by_translation(
+    request: Request,
+    dictionary_id: int,
+    translation: Annotated[str, Query(min_length=1, max_length=100)],
+    session: Session = Depends(get_read_session),
+    mode: LookupMode = LookupMode.EXACT,
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+):
+    """Return entries of a dictionary by their translation."""
+    _get_dictionary_version(session, dictionary_id)
+    return search_translation(session, dictionary_id, translation, mode, limit)
+
+
+@router.get(
+    "/dictionary/{dictionary_id}/fuzzy",
+    response_model=list[EntryFuzzyMatch],
+)
+@limiter.limit("300/minute")
+def search_entries_fuzzy(
+    request: Request,
+    dictionary_id: int,
+    q: Annotated[str, Query(min_length=1, max_length=100)],
+    session: Session = Depends(get_read_session),
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+    max_distance: Annotated[int, Query(ge=0, le=3)] = 2,
+    min_similarity: Annotated[float, Query(ge=0.3, le=1)] = 0.3,
+):
+    """Return the entries of a dictionary closest to a misspelled term."""
+    _get_dictionary_version(session, dictionary_id)
+    return search_fuzzy(
+        session, dictionary_id, q, limit, max_distance, min_similarity
+    )
+
+
+@router.get("/dictionary/{dictionary_id}/changes", response_model=EntryChanges)
+@limiter.limit("5000/day")
+def get_entry_changes_since(
+    request: Request,
+    dictionary_id: int,
+    session: Session = Depends(get_read_session),
+    since: Optional[str] = None,
+    limit: PageLimit = 500,
+):
+    """Return entries created, updated or deleted since a sync cursor."""
+    return get_entry_changes(session, dictionary_id, since, limit)
+
+
+@router.post(
+    "/dictionary/{dictionary_id}/annotate",
+    response_model=list[EntryAnnotation],
+)
+@limiter.limit("60/minute")
+def annotate_dictionary_text(
+    request: Request,
+    dictionary_id: int,
+    annotate_request: AnnotateRequest,
+    session: Session = Depends(get_session),
+    overlapping: bool = False,
+):
+    """Return every known word and expression found in a text."""
+    version = _get_dictionary_version(session, dictionary_id)
+    return annotate_text(
+        session, dictionary_id, version, annotate_request.text, overlapping
+    )
+
+
+@router.post(
+    "/dictionary/{dictionary_id}/lookup", response_model=list[WordLookup]
+)
+@limiter.limit("120/minute")
+def lookup_dictionary_words(
+    request: Request,
+    dictionary_id: int,
+    lookup_request: LookupRequest,
+    session: Session = Depends(get_session),
+):
+    """Look up many words of a dictionary in one round-trip."""
+    _get_dictionary_version(session, dictionary_id)
+    return lookup_words(session, dictionary_id, lookup_request.words)
+
+
+@router.get("/dictionary/{dictionary_id}/export")
+@limiter.limit("10/minute")
+def export_dictionary_entries(
+    request: Request,
+    dictionary_id: int,
+    session: Session = Depends(get_session),
+    export_format: Annotated[EntryFileFormat, Query(alias="format")] = (
+        EntryFileFormat.NDJSON
+    ),
+):
+    """Stream every entry of a dictionary as NDJSON or CSV."""
+    _get_dictionary_version(session, dictionary_id)
+    filename = f"dictionary-{dictionary_id}.{export_format.value}"
+    return StreamingResponse(
+        stream_dictionary_entries(dictionary_id, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post(
+    "/dictionary/{dictionary_id}/import", response_model=EntryImportResult
+)
+@limiter.limit("5/minute")
+def import_dictionary_entries(
     request: Request,
     dictionary_id: int,
+    file: UploadFile,
+    current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
+    file_format: Annotated[EntryFileFormat, Query(alias="format")] = (
+        EntryFileFormat.NDJSON
+    ),
+    on_conflict: ConflictPolicy = ConflictPolicy.ERROR,
 ):
-    """Return all entries for a given dictionary."""
+    """Import a CSV or NDJSON file of entries into a dictionary."""
+    db_dictionary = _get_writable_dictionary(session, dictionary_id)
+    if db_dictionary.user_id != current_user.id:
+        raise HTTPException(
+            status_code=403,
+            detail="You are not authorized to import into this dictionary.",
+        )
+
+    try:
+        return bulk_import_entries(
+            session,
+            dictionary_id,
+            read_entry_rows(file.file, file_format),
+            on_conflict,
+        )
+    except UnicodeDecodeError as exc:
+        session.rollback()
+        raise HTTPException(
+            status_code=400, detail="The uploaded file must be UTF-8 encoded."
+        ) from exc
+
+
+DICTIONARY_DELETING = "This dictionary is being deleted."
+DICTIONARY_FKEY = "entry_dictionary_id_fkey"
+NOT_NULL_VIOLATION = "23502"
+
+
+def _get_writable_dictionary(session, dictionary_id):
+    """Return a dictionary entries can be written to, or raise 404/409."""
+    db_dictionary = session.get(Dictionary, dictionary_id)
+    if not db_dictionary:
+        raise HTTPException(status_code=404, detail="Dictionary not found")
+    if db_dictionary.is_deleting:
+        raise HTTPException(status_code=409, detail=DICTIONARY_DELETING)
+    return db_dictionary
+
+
+def _is_deleting(session, dictionary_id):
+    """Return whether a dictionary is being deleted, or None if missing."""
     return session.exec(
-        select(Entry).where(Entry.dictionary_id == dictionary_id)
-    ).all()
+        select(Dictionary.is_deleting).where(Dictionary.id == dictionary_id)
+    ).first()
+
+
+def _raise_entry_not_writable(session, entry_id):
+    """Raise the 404 or 409 explaining why an entry was not written."""
+    db_entry = session.get(Entry, entry_id)
+    if not db_entry:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    if _is_deleting(session, db_entry.dictionary_id):
+        raise HTTPException(status_code=409, detail=DICTIONARY_DELETING)
+
+
+def _raise_integrity_error(exc):
+    """Translate a failed entry write into the matching HTTP error.
+
+    Only a violation of the dictionary foreign key means the dictionary is
+    missing; NOT NULL failures are the client's fault and anything else
+    conflicts with existing rows.
+    """
+    diag = getattr(exc.orig, "diag", None)
+    if getattr(diag, "constraint_name", None) == DICTIONARY_FKEY:
+        raise HTTPException(
+            status_code=404, detail="Dictionary not found"
+        ) from exc
+    if getattr(exc.orig, "sqlstate", None) == NOT_NULL_VIOLATION:
+        raise HTTPException(
+            status_code=400, detail="A required entry field is missing."
+        ) from exc
+    raise HTTPException(
+        status_code=409, detail="The entry conflicts with existing data."
+    ) from exc
+
+
+def _upsert_entry(session, entry, on_conflict, response):
+    """Write an entry with a single INSERT ... ON CONFLICT statement.
+
+    A missing dictionary is reported by the foreign key, so only its
+    deletion flag is read beforehand.
+    """
+    if _is_deleting(session, entry.dictionary_id):
+        raise HTTPException(status_code=409, detail=DICTIONARY_DELETING)
+    try:
+        db_entry, created = upsert_entry(session, entry, on_conflict)
+    except IntegrityError as exc:
+        session.rollback()
+        _raise_integrity_error(exc)
+
+    if db_entry is None:
+        session.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="An entry with this name already exists in the dictionary.",
+        )
+
+    if created or on_conflict == ConflictPolicy.UPDATE:
+        bump_dictionary_version(session, db_entry.dictionary_id)
+    session.expunge(db_entry)
+    session.commit()
+    if not created and response is not None:
+        response.status_code = 200
+    return db_entry
 
 
 @router.post("/", response_model=EntryRead, status_code=201)
@@ -55,19 +420,24 @@ def create_entry(
     request: Request,
     entry: EntryCreate,
     session: Session = Depends(get_session),
+    response: Response = None,
+    on_conflict: ConflictPolicy = ConflictPolicy.ERROR,
 ):
-    """Create a new entry."""
-    db_dictionary = session.get(Dictionary, entry.dictionary_id)
-    if not db_dictionary:
-        raise HTTPException(status_code=404, detail="Dictionary not found")
+    """Create a new entry, or upsert it when a conflict policy is given."""
+    if on_conflict != ConflictPolicy.ERROR:
+        return _upsert_entry(session, entry, on_conflict, response)
+
+    db_dictionary = _get_writable_dictionary(session, entry.dictionary_id)
 
     db_entry = Entry(**entry.model_dump())
     db_entry = compute_display_name(db_entry)
+    db_entry = compute_search_keys(db_entry)
 
     db_dictionary.entries.append(db_entry)
 
     session.add(db_entry)
     try:
+        bump_dictionary_version(session, entry.dictionary_id)
         session.commit()
     except IntegrityError as exc:
         session.rollback()
@@ -88,21 +458,12 @@ def delete_own_entry(
     session: Session = Depends(get_session),
 ):
     """Delete a entry by its ID."""
-    db_entry = session.get(Entry, entry_id)
-    if not db_entry:
-        raise HTTPException(status_code=404, detail="Entry not found")
-
-    db_dictionary = session.get(Dictionary, db_entry.dictionary_id)
-
-    if db_dictionary.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403,
-            detail="You are not authorized to delete this entry.",
-        )
-
     try:
-        session.delete(db_entry)
-        session.commit()
+        deleted = delete_owned_entry(session, entry_id, current_user.id)
+        if deleted is not None:
+            record_deletion(session, deleted)
+            bump_dictionary_version(session, deleted.dictionary_id)
+            session.commit()
     except Exception as exc:
         session.rollback()
         _logger.error("Error deleting entry %s: %s", entry_id, exc)
@@ -111,6 +472,13 @@ def delete_own_entry(
             detail="An error occurred while deleting the entry",
         ) from exc
 
+    if deleted is None:
+        _raise_entry_not_writable(session, entry_id)
+        raise HTTPException(
+            status_code=403,
+            detail="You are not authorized to delete this entry.",
+        )
+
     return {"message": "Entry %s deleted successfully!", entry_id: entry_id}
 
 
@@ -135,6 +503,8 @@ def admin_delete_entry(
 
     try:
         session.delete(db_entry)
+        record_deletion(session, db_entry)
+        bump_dictionary_version(session, db_entry.dictionary_id)
         session.commit()
     except Exception as exc:
         session.rollback()
@@ -147,6 +517,38 @@ def admin_delete_entry(
     return {"message": "Entry %s deleted successfully!", entry_id: entry_id}
 
 
+@router.post(
+    "/dictionary/{dictionary_id}/batch", response_model=EntryBatchResult
+)
+@limiter.limit("60/minute")
+def apply_dictionary_operations(
+    request: Request,
+    dictionary_id: int,
+    batch_request: EntryBatchRequest,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Create, update and delete many entries of a dictionary at once."""
+    db_dictionary = _get_writable_dictionary(session, dictionary_id)
+
+    if db_dictionary.user_id != current_user.id:
+        raise HTTPException(
+            status_code=403,
+            detail="You are not authorized to update this dictionary.",
+        )
+
+    try:
+        return apply_entry_operations(
+            session, dictionary_id, batch_request.operations
+        )
+    except IntegrityError as exc:
+        session.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="The operations conflict with existing entries.",
+        ) from exc
+
+
 @router.patch("/{entry_id}", response_model=EntryRead)
 @limiter.limit("10/minute")
 def update_entry(
@@ -155,25 +557,19 @@ def update_entry(
     entry_update: EntryUpdate,
     session: Session = Depends(get_session),
 ):
-    """Update an entry by its ID."""
-    db_entry = session.get(Entry, entry_id)
-    if not db_entry:
-        raise HTTPException(status_code=404, detail="Entry not found")
-
-    entry_data = entry_update.model_dump(exclude_unset=True)
-
-    for key, value in entry_data.items():
-        setattr(db_entry, key, value)
-
-    if "original_name" in entry_data or "translation" in entry_data:
-        db_entry = compute_display_name(db_entry)
-
-    db_entry.updated_at = datetime.now()
+    """Update an entry by its ID in a single statement."""
+    values = entry_update.model_dump(exclude_unset=True)
+    if any(
+        field in values and values[field] is None
+        for field in ("original_name", "translation")
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="original_name and translation cannot be null.",
+        )
 
     try:
-        session.add(db_entry)
-        session.commit()
-        session.refresh(db_entry)
+        db_entry = patch_entry(session, entry_id, values)
     except IntegrityError as exc:
         session.rollback()
         raise HTTPException(
@@ -181,4 +577,11 @@ def update_entry(
             detail="An entry with this name already exists in this dictionary.",
         ) from exc
 
+    if db_entry is None:
+        _raise_entry_not_writable(session, entry_id)
+        raise HTTPException(status_code=404, detail="Entry not found")
+
+    bump_dictionary_version(session, db_entry.dictionary_id)
+    session.expunge(db_entry)
+    session.commit()
     return db_entry
@@ -0,0 +1,64 @@
+from logging import getLogger
+
+from fastapi import APIRouter, Depends
+from fastapi.exceptions import HTTPException
+from starlette.requests import Request
+
+from app.core.limiter import limiter
+from app.core.pool import pool_stats
+from app.core.slow import slow_requests
+from app.database import (
+    async_engine,
+    async_read_replicas,
+    engine,
+    read_replicas,
+)
+from app.dto.internal import PoolStats, SlowRequest
+from app.models.user import User
+from app.services.user import get_current_user
+
+router = APIRouter()
+_logger = getLogger(__name__)
+
+
+def require_superuser(current_user: User = Depends(get_current_user)):
+    """Only let superusers through to internal endpoints."""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=403,
+            detail="You are not authorized to access internal endpoints.",
+        )
+    return current_user
+
+
+@router.get("/pool", response_model=list[PoolStats])
+@limiter.limit("60/minute")
+def get_pool_stats(
+    request: Request, current_user: User = Depends(require_superuser)
+):
+    """Return live connection pool statistics of every engine.
+
+    Read replica pools follow the primary ones, numbered in the order of
+    DB_READ_REPLICA_URLS.
+    """
+    return [
+        pool_stats("sync", engine.pool),
+        pool_stats("async", async_engine.sync_engine.pool),
+        *(
+            pool_stats(f"sync-replica-{index}", replica.pool)
+            for index, replica in enumerate(read_replicas.engines)
+        ),
+        *(
+            pool_stats(f"async-replica-{index}", replica.sync_engine.pool)
+            for index, replica in enumerate(async_read_replicas.engines)
+        ),
+    ]
+
+
+@router.get("/slow-requests", response_model=list[SlowRequest])
+@limiter.limit("60/minute")
+def get_slow_requests(
+    request: Request, current_user: User = Depends(require_superuser)
+):
+    """Return the most recent slow requests, newest first."""
+    return slow_requests.records()
@@ -0,0 +1,33 @@
+from logging import getLogger
+
+from fastapi import APIRouter, Depends
+from fastapi.exceptions import HTTPException
+from sqlmodel import Session
+from starlette.requests import Request
+
+from app.core.limiter import limiter
+from app.database import get_session
+from app.dto.job import JobRead
+from app.models.job import Job
+from app.models.user import User
+from app.services.user import get_current_user
+
+router = APIRouter()
+_logger = getLogger(__name__)
+
+
+@router.get("/{job_id}", response_model=JobRead)
+@limiter.limit("120/minute")
+def get_job_by_id(
+    request: Request,
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Return the status and progress of a background job."""
+    job = session.get(Job, job_id)
+    if not job or (
+        job.user_id != current_user.id and not current_user.is_superuser
+    ):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -1,13 +1,19 @@
-from typing import List
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.exceptions import HTTPException
 from sqlmodel import Session, select
 from starlette.requests import Request
 
+from app.core.include import include_options, read_with
 from app.core.limiter import limiter
-from app.database import get_session
-from app.dto.language import LanguageCreate, LanguageRead
+from app.database import get_read_session, get_session
+from app.dto.language import (
+    LanguageCreate,
+    LanguageDetail,
+    LanguageInclude,
+    LanguageRead,
+)
 from app.models.language import Language
 from app.models.user import User
 from app.services.user import get_current_user
@@ -15,22 +21,39 @@ from app.services.user import get_current_user
 router = APIRouter()
 
 
-@router.get("/", response_model=list[LanguageRead])
+@router.get("/", response_model=list[LanguageDetail])
 @limiter.limit("1000/day")
-def get_languages(request: Request, session: Session = Depends(get_session)):
-    """Return all languages."""
-    return session.exec(select(Language)).all()
+def get_languages(
+    request: Request,
+    session: Session = Depends(get_read_session),
+    include: Annotated[Optional[List[LanguageInclude]], Query()] = None,
+):
+    """Return all languages with the requested relationships."""
+    languages = session.exec(
+        select(Language).options(*include_options(Language, include))
+    ).all()
+    return [
+        read_with(LanguageDetail, language, include) for language in languages
+    ]
 
 
-@router.get("/{id}", response_model=list[LanguageRead])
+@router.get("/{language_id}", response_model=LanguageDetail)
 @limiter.limit("1000/day")
 def get_language_by_id(
-    request: Request, language_id: int, session: Session = Depends(get_session)
+    request: Request,
+    language_id: int,
+    session: Session = Depends(get_read_session),
+    include: Annotated[Optional[List[LanguageInclude]], Query()] = None,
 ):
-    """Return a language by its ID."""
-    return session.exec(
-        select(Language).where(Language.id == language_id)
+    """Return a language by its ID with the requested relationships."""
+    language = session.exec(
+        select(Language)
+        .where(Language.id == language_id)
+        .options(*include_options(Language, include))
     ).first()
+    if not language:
+        raise HTTPException(status_code=404, detail="Language not found")
+    return read_with(LanguageDetail, language, include)
 
 
 @router.post("/", response_model=List[LanguageRead], status_code=201)
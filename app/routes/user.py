@@ -13,7 +13,7 @@ from app.core.security.password import (
     create_access_token,
     hash_password,
 )
-from app.database import get_session
+from app.database import get_read_session, get_session
 from app.dto.dictionary import DictionaryRead
 from app.dto.user import LoginRequest, UserCreate, UserRead
 from app.models import User
@@ -42,15 +42,19 @@ def read_me(request: Request, current_user: User = Depends(get_current_user)):
 def get_user_dictionaries(
     request: Request,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
 ):
-    """Return dictionaries belonging to a user."""
+    """Return dictionaries belonging to a user, except those being deleted."""
     user = session.get(User, current_user.id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
-    return user.dictionaries
+    return [
+        dictionary
+        for dictionary in user.dictionaries
+        if not dictionary.is_deleting
+    ]
 
 
 @router.get("/{user_id}", response_model=list[UserRead])
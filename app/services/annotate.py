@@ -0,0 +1,167 @@
+import unicodedata
+from collections import deque
+from logging import getLogger
+
+from sqlmodel import select
+
+from app.config import settings
+from app.core.cache import DictionaryCache
+from app.dto.entry import EntryAnnotation
+from app.models.entry import Entry
+from app.services.search import SUGGESTION_COLUMNS
+
+_logger = getLogger(__name__)
+
+automaton_cache = DictionaryCache(
+    max_size=settings.ENTRY_ANNOTATE_CACHE_SIZE,
+    ttl_seconds=settings.ENTRY_SEARCH_CACHE_TTL_SECONDS,
+)
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton matching many patterns in one text pass."""
+
+    def __init__(self):
+        """Create an automaton holding only the root state."""
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        self.output_link = [0]
+
+    def add(self, pattern: str, payload):
+        """Register a pattern, attaching the payload to its final state."""
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.output_link.append(0)
+            state = next_state
+        self.outputs[state].append((len(pattern), payload))
+
+    def build(self):
+        """Compute failure and output links breadth-first."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target
+                self.output_link[child] = (
+                    target
+                    if self.outputs[target]
+                    else self.output_link[target]
+                )
+        return self
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, payload) for every pattern occurrence."""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+
+            match_state = state
+            while match_state:
+                for length, payload in self.outputs[match_state]:
+                    yield index + 1 - length, index + 1, payload
+                match_state = self.output_link[match_state]
+
+
+def fold_text(text: str):
+    """Fold text like normalize_term, keeping each character's offset.
+
+    Returns the folded string and, for every folded character, the index
+    of the original character it came from.
+    """
+    folded, offsets = [], []
+    for index, char in enumerate(text):
+        if char.isspace():
+            if folded and folded[-1] != " ":
+                folded.append(" ")
+                offsets.append(index)
+            continue
+        decomposed = unicodedata.normalize("NFKD", char)
+        for part in decomposed.casefold():
+            if not unicodedata.combining(part):
+                folded.append(part)
+                offsets.append(index)
+    return "".join(folded), offsets
+
+
+def _build_automaton(session, dictionary_id):
+    """Load a dictionary's normalized names into an automaton."""
+    automaton = AhoCorasick()
+    rows = session.exec(
+        select(Entry.normalized_name, *SUGGESTION_COLUMNS).where(
+            Entry.dictionary_id == dictionary_id,
+            Entry.normalized_name.is_not(None),
+            Entry.normalized_name != "",
+        )
+    )
+    count = 0
+    for row in rows:
+        automaton.add(row[0], dict(row._mapping))
+        count += 1
+    _logger.info(
+        "Built annotation automaton for dictionary %s (%s entries)",
+        dictionary_id,
+        count,
+    )
+    return automaton.build()
+
+
+def _is_boundary(folded: str, index: int) -> bool:
+    """Return True if no word character sits at the given index."""
+    return index < 0 or index >= len(folded) or not folded[index].isalnum()
+
+
+def annotate_text(
+    session, dictionary_id: int, version: int, text: str, overlapping: bool
+):
+    """Return every known word and expression found in a text.
+
+    Matches must start and end on word boundaries. Unless overlapping is
+    requested, the leftmost-longest match wins wherever matches overlap.
+    """
+    automaton = automaton_cache.get(
+        dictionary_id,
+        lambda: _build_automaton(session, dictionary_id),
+        version=version,
+    )
+    folded, offsets = fold_text(text)
+
+    matches = sorted(
+        (
+            (start, end, payload)
+            for start, end, payload in automaton.iter_matches(folded)
+            if _is_boundary(folded, start - 1) and _is_boundary(folded, end)
+        ),
+        key=lambda match: (match[0], -match[1]),
+    )
+
+    annotations = []
+    covered, last_span = 0, None
+    for start, end, payload in matches:
+        if not overlapping and start < covered and (start, end) != last_span:
+            continue
+        covered, last_span = max(covered, end), (start, end)
+        original_start, original_end = offsets[start], offsets[end - 1] + 1
+        annotations.append(
+            EntryAnnotation(
+                **payload,
+                start=original_start,
+                end=original_end,
+                text=text[original_start:original_end],
+            )
+        )
+    return annotations
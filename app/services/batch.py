@@ -0,0 +1,266 @@
+from datetime import datetime
+from logging import getLogger
+
+from sqlmodel import delete, select, update
+
+from app.dto.entry import (
+    ConflictPolicy,
+    EntryBatchResult,
+    EntryImport,
+    EntryOperationResult,
+    EntryOperationType,
+)
+from app.models.entry import Entry
+from app.models.entryTombstone import EntryTombstone
+from app.services.dictionary import bump_dictionary_version
+from app.services.entry import (
+    entry_upsert,
+    entry_values,
+    format_display_name,
+    normalize_term,
+)
+
+_logger = getLogger(__name__)
+
+UPDATABLE_FIELDS = {
+    "original_name",
+    "translation",
+    "description",
+    "is_expression",
+}
+NOT_NULL_FIELDS = ("original_name", "translation", "is_expression")
+NAME_CONFLICT = "An entry with this name already exists in the dictionary."
+
+
+def _validate(operation):
+    """Return why an operation cannot be applied, or None."""
+    if operation.op == EntryOperationType.CREATE:
+        if operation.original_name is None or operation.translation is None:
+            return "original_name and translation are required to create."
+        return None
+    if operation.id is None:
+        return "An entry ID is required to update or delete."
+    if operation.op == EntryOperationType.UPDATE:
+        fields = operation.model_dump(exclude_unset=True)
+        if any(
+            field in fields and fields[field] is None
+            for field in NOT_NULL_FIELDS
+        ):
+            return (
+                "original_name, translation and is_expression cannot be null."
+            )
+    return None
+
+
+def _delete_entries(session, dictionary_id, entry_ids):
+    """Delete entries in one statement and leave their tombstones."""
+    if not entry_ids:
+        return set()
+    deleted = set(
+        session.exec(
+            delete(Entry)
+            .where(
+                Entry.dictionary_id == dictionary_id, Entry.id.in_(entry_ids)
+            )
+            .returning(Entry.id),
+            execution_options={"synchronize_session": False},
+        ).scalars()
+    )
+    session.add_all(
+        EntryTombstone(entry_id=entry_id, dictionary_id=dictionary_id)
+        for entry_id in sorted(deleted)
+    )
+    return deleted
+
+
+def _load_names(session, dictionary_id, updates, creates):
+    """Return the current rows of updated entries and the names in use."""
+    current = {
+        row.id: row
+        for row in session.exec(
+            select(Entry.id, Entry.original_name, Entry.translation).where(
+                Entry.dictionary_id == dictionary_id,
+                Entry.id.in_([op.id for op in updates.values()]),
+            )
+        )
+    }
+    names = {op.original_name for op in creates.values()} | {
+        op.original_name
+        for op in updates.values()
+        if op.original_name is not None
+    }
+    taken = dict(
+        session.exec(
+            select(Entry.original_name, Entry.id).where(
+                Entry.dictionary_id == dictionary_id,
+                Entry.original_name.in_(names),
+            )
+        ).all()
+    )
+    return current, taken
+
+
+def _claim_names(operations, taken, results, owner_of):
+    """Reserve the names of operations, rejecting those already taken.
+
+    Rejected operations are removed from ``operations`` and reported with
+    a 409 in ``results``.
+    """
+    for index, operation in list(operations.items()):
+        name = operation.original_name
+        if name is None:
+            continue
+        owner = owner_of(index, operation)
+        if name in taken and taken[name] != owner:
+            del operations[index]
+            results[index] = EntryOperationResult(
+                index=index,
+                op=operation.op,
+                status=409,
+                id=operation.id,
+                detail=NAME_CONFLICT,
+            )
+        else:
+            taken[name] = owner
+
+
+def apply_entry_operations(session, dictionary_id: int, operations):
+    """Apply a list of entry operations to a dictionary in one transaction.
+
+    Deletes run first, then updates, then creates, each as a single
+    set-based statement. Operations that cannot be applied are reported
+    and skipped; every other one is committed together with a single
+    dictionary version bump.
+    """
+    results = {}
+    deletes, updates, creates = {}, {}, {}
+    targeted = set()
+
+    for index, operation in enumerate(operations):
+        detail = _validate(operation)
+        if detail is None and operation.id is not None:
+            if operation.id in targeted:
+                detail = "The entry is targeted by another operation."
+            targeted.add(operation.id)
+        if detail is not None:
+            results[index] = EntryOperationResult(
+                index=index,
+                op=operation.op,
+                status=400,
+                id=operation.id,
+                detail=detail,
+            )
+        elif operation.op == EntryOperationType.DELETE:
+            deletes[index] = operation
+        elif operation.op == EntryOperationType.UPDATE:
+            updates[index] = operation
+        else:
+            creates[index] = operation
+
+    deleted = _delete_entries(
+        session, dictionary_id, [op.id for op in deletes.values()]
+    )
+    for index, operation in deletes.items():
+        found = operation.id in deleted
+        results[index] = EntryOperationResult(
+            index=index,
+            op=operation.op,
+            status=204 if found else 404,
+            id=operation.id,
+            detail=None if found else "Entry not found",
+        )
+
+    current, taken = _load_names(session, dictionary_id, updates, creates)
+    for index, operation in list(updates.items()):
+        if operation.id not in current:
+            del updates[index]
+            results[index] = EntryOperationResult(
+                index=index,
+                op=operation.op,
+                status=404,
+                id=operation.id,
+                detail="Entry not found",
+            )
+
+    # Updates run as one statement applied row by row, so a name is only
+    # free for them if nobody holds it yet: swaps and chained renames are
+    # rejected. Names released by renames go to the creates, which run
+    # after the updates.
+    _claim_names(updates, taken, results, lambda index, op: op.id)
+    for operation in updates.values():
+        old_name = current[operation.id].original_name
+        if (
+            operation.original_name not in (None, old_name)
+            and taken.get(old_name) == operation.id
+        ):
+            del taken[old_name]
+    _claim_names(creates, taken, results, lambda index, op: ("create", index))
+
+    now = datetime.now()
+    if updates:
+        rows = []
+        for operation in updates.values():
+            fields = operation.model_dump(
+                exclude_unset=True, include=UPDATABLE_FIELDS
+            )
+            row = current[operation.id]
+            original_name = fields.get("original_name", row.original_name)
+            translation = fields.get("translation", row.translation)
+            rows.append(
+                {
+                    **fields,
+                    "id": operation.id,
+                    "display_name": format_display_name(
+                        original_name, translation
+                    ),
+                    "normalized_name": normalize_term(original_name),
+                    "normalized_translation": normalize_term(translation),
+                    "updated_at": now,
+                }
+            )
+        session.exec(update(Entry), params=rows)
+        for index, operation in updates.items():
+            results[index] = EntryOperationResult(
+                index=index, op=operation.op, status=200, id=operation.id
+            )
+
+    if creates:
+        values = [
+            entry_values(
+                EntryImport.model_validate(
+                    operation.model_dump(
+                        exclude_none=True, include=UPDATABLE_FIELDS
+                    )
+                ),
+                now,
+                dictionary_id=dictionary_id,
+            )
+            for operation in creates.values()
+        ]
+        statement = entry_upsert(
+            session, values, ConflictPolicy.IGNORE
+        ).returning(Entry.original_name, Entry.id)
+        created = dict(session.exec(statement).all())
+        for index, operation in creates.items():
+            entry_id = created.get(operation.original_name)
+            results[index] = EntryOperationResult(
+                index=index,
+                op=operation.op,
+                status=201 if entry_id else 409,
+                id=entry_id,
+                detail=None if entry_id else NAME_CONFLICT,
+            )
+
+    if (
+        deleted
+        or updates
+        or any(results[index].status == 201 for index in creates)
+    ):
+        bump_dictionary_version(session, dictionary_id)
+    session.commit()
+    _logger.info(
+        "Applied %s entry operations to dictionary %s",
+        len(operations),
+        dictionary_id,
+    )
+    return EntryBatchResult(results=[results[i] for i in sorted(results)])
@@ -0,0 +1,84 @@
+from logging import getLogger
+
+from sqlmodel import delete, func, select, update
+
+from app.config import settings
+from app.core.jobs import job_handler, job_runner
+from app.models.dictionary import Dictionary
+from app.models.entry import Entry
+
+_logger = getLogger(__name__)
+
+DELETE_DICTIONARY_JOB = "dictionary.delete"
+
+
+def start_dictionary_deletion(session, dictionary_id: int, user_id: int):
+    """Mark an owned dictionary as deleting and enqueue a job for it.
+
+    Marking and the ownership check are one UPDATE ... RETURNING, which
+    only matches a dictionary not already being deleted. The version is
+    bumped so that cached pages and ETags of the dictionary go stale.
+    Returns the new job, or None if nothing was marked.
+    """
+    marked = session.exec(
+        update(Dictionary)
+        .where(
+            Dictionary.id == dictionary_id,
+            Dictionary.user_id == user_id,
+            Dictionary.is_deleting.is_(False),
+        )
+        .values(is_deleting=True, version=Dictionary.version + 1)
+        .returning(Dictionary.id),
+        execution_options={"synchronize_session": False},
+    ).scalar_one_or_none()
+    if marked is None:
+        return None
+
+    total = session.exec(
+        select(func.count())
+        .select_from(Entry)
+        .where(Entry.dictionary_id == dictionary_id)
+    ).one()
+    return job_runner.enqueue(
+        session,
+        DELETE_DICTIONARY_JOB,
+        {"dictionary_id": dictionary_id},
+        total=total,
+        user_id=user_id,
+    )
+
+
+@job_handler(DELETE_DICTIONARY_JOB)
+def delete_dictionary(session, job, report):
+    """Delete a dictionary's entries in bounded chunks, then the dictionary.
+
+    Each chunk is its own transaction so that locks and WAL stay bounded.
+    """
+    dictionary_id = job.payload["dictionary_id"]
+    chunk_size = job.payload.get(
+        "chunk_size", settings.DICTIONARY_DELETE_CHUNK_SIZE
+    )
+    deleted = 0
+    while True:
+        chunk = (
+            select(Entry.id)
+            .where(Entry.dictionary_id == dictionary_id)
+            .limit(chunk_size)
+        )
+        result = session.exec(
+            delete(Entry).where(Entry.id.in_(chunk)),
+            execution_options={"synchronize_session": False},
+        )
+        session.commit()
+        if not result.rowcount:
+            break
+        deleted += result.rowcount
+        report(deleted)
+
+    session.exec(
+        delete(Dictionary).where(Dictionary.id == dictionary_id),
+        execution_options={"synchronize_session": False},
+    )
+    session.commit()
+    _logger.info("Deleted dictionary %s (%s entries)", dictionary_id, deleted)
+    return {"deleted_entries": deleted}
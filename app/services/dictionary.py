@@ -1,6 +1,8 @@
 from logging import getLogger
 
-from app.models import Language
+from sqlmodel import delete, select, update
+
+from app.models import Dictionary, Language
 
 _logger = getLogger(__name__)
 
@@ -17,3 +19,48 @@ def compute_display_name(session, db_dictionary):
         f"{source_language.name} : {target_language.name}"
     )
     return db_dictionary
+
+
+def get_dictionary_version(session, dictionary_id):
+    """Return the version counter of a dictionary, or None if missing.
+
+    A dictionary being deleted counts as missing.
+    """
+    return session.exec(
+        select(Dictionary.version).where(
+            Dictionary.id == dictionary_id, Dictionary.is_deleting.is_(False)
+        )
+    ).first()
+
+
+async def get_dictionary_version_async(session, dictionary_id):
+    """Return the version counter of a dictionary from an AsyncSession."""
+    result = await session.exec(
+        select(Dictionary.version).where(
+            Dictionary.id == dictionary_id, Dictionary.is_deleting.is_(False)
+        )
+    )
+    return result.first()
+
+
+def bump_dictionary_version(session, dictionary_id):
+    """Increment a dictionary's version within the current transaction."""
+    session.exec(
+        update(Dictionary)
+        .where(Dictionary.id == dictionary_id)
+        .values(version=Dictionary.version + 1)
+    )
+
+
+def delete_owned_dictionary(session, dictionary_id, user_id):
+    """Delete a dictionary owned by a user in a single statement.
+
+    Entries and tombstones go with it through ON DELETE CASCADE, so none
+    of them is loaded. Returns the deleted ID, or None if nothing matched.
+    """
+    return session.exec(
+        delete(Dictionary)
+        .where(Dictionary.id == dictionary_id, Dictionary.user_id == user_id)
+        .returning(Dictionary.id),
+        execution_options={"synchronize_session": False},
+    ).scalar_one_or_none()
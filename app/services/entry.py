@@ -1,11 +1,321 @@
+import csv
+import io
+import unicodedata
+from datetime import datetime
 from logging import getLogger
 
+from pydantic import ValidationError
+from sqlalchemy import String, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import delete, select, update
+
+from app.dto.entry import (
+    ConflictPolicy,
+    EntryFileFormat,
+    EntryImport,
+    EntryImportError,
+    EntryImportResult,
+)
+from app.models.dictionary import Dictionary
+from app.models.entry import Entry
+from app.models.entryTombstone import EntryTombstone
+from app.services.dictionary import bump_dictionary_version
+
 _logger = getLogger(__name__)
 
+IMPORT_BATCH_SIZE = 1000
+ENTRY_CONFLICT_COLUMNS = ["original_name", "dictionary_id"]
+ENTRY_UPSERT_COLUMNS = (
+    "translation",
+    "description",
+    "is_expression",
+    "display_name",
+    "normalized_translation",
+    "updated_at",
+)
+
+
+def format_display_name(original_name, translation):
+    """Return the display name for an original name and its translation."""
+    return f"{original_name} ({translation})"
+
+
+def display_name_expression(original_name, translation):
+    """Return the SQL expression computing a display name in the database."""
+    return original_name + " (" + translation + ")"
+
+
+def normalize_term(value):
+    """Return the accent- and case-insensitive search key for a term."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def compute_search_keys(db_entry):
+    """Compute and return the normalized search keys for a given entry."""
+    db_entry.normalized_name = normalize_term(db_entry.original_name)
+    db_entry.normalized_translation = normalize_term(db_entry.translation)
+    return db_entry
+
 
 def compute_display_name(db_entry):
     """Compute and return the display name for a given entry."""
-    db_entry.display_name = (
-        f"{db_entry.original_name} ({db_entry.translation})"
+    db_entry.display_name = format_display_name(
+        db_entry.original_name, db_entry.translation
     )
     return db_entry
+
+
+def record_deletion(session, db_entry):
+    """Leave a tombstone so that syncing clients learn about a deletion."""
+    session.add(
+        EntryTombstone(
+            entry_id=db_entry.id, dictionary_id=db_entry.dictionary_id
+        )
+    )
+
+
+def delete_owned_entry(session, entry_id, user_id):
+    """Delete an entry of a dictionary owned by a user in one statement.
+
+    Issues DELETE ... USING dictionary on PostgreSQL. Returns the deleted
+    (id, dictionary_id) row, or None if nothing matched. Entries of a
+    dictionary being deleted are left to the deletion job.
+    """
+    return session.exec(
+        delete(Entry)
+        .where(
+            Entry.id == entry_id,
+            Entry.dictionary_id == Dictionary.id,
+            Dictionary.user_id == user_id,
+            Dictionary.is_deleting.is_(False),
+        )
+        .returning(Entry.id, Entry.dictionary_id),
+        execution_options={"synchronize_session": False},
+    ).one_or_none()
+
+
+def entry_insert(session):
+    """Return the dialect-specific INSERT construct supporting ON CONFLICT."""
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(Entry)
+    return postgresql.insert(Entry)
+
+
+def entry_upsert(session, values, policy):
+    """Return an INSERT ... ON CONFLICT statement for the given policy."""
+    statement = entry_insert(session).values(values)
+    if policy == ConflictPolicy.UPDATE:
+        return statement.on_conflict_do_update(
+            index_elements=ENTRY_CONFLICT_COLUMNS,
+            set_={
+                column: getattr(statement.excluded, column)
+                for column in ENTRY_UPSERT_COLUMNS
+            },
+        )
+    return statement.on_conflict_do_nothing(
+        index_elements=ENTRY_CONFLICT_COLUMNS
+    )
+
+
+def entry_values(entry, now, **extra):
+    """Return the column values written for a new entry.
+
+    Both timestamps share ``now`` so that rows inserted by an upsert can be
+    told apart from updated ones, whose ``created_at`` is older.
+    """
+    return {
+        **entry.model_dump(),
+        **extra,
+        "display_name": format_display_name(
+            entry.original_name, entry.translation
+        ),
+        "normalized_name": normalize_term(entry.original_name),
+        "normalized_translation": normalize_term(entry.translation),
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def upsert_entry(session, entry, policy):
+    """Write one entry in a single statement and return it.
+
+    Returns the written (or, when ignored, existing) entry and whether it
+    was newly created. The existing row is only fetched on a collision.
+    """
+    now = datetime.now()
+    statement = entry_upsert(
+        session, [entry_values(entry, now)], policy
+    ).returning(Entry)
+    db_entry = session.exec(
+        statement, execution_options={"populate_existing": True}
+    ).scalar_one_or_none()
+
+    if db_entry is None:
+        db_entry = session.exec(
+            select(Entry).where(
+                Entry.original_name == entry.original_name,
+                Entry.dictionary_id == entry.dictionary_id,
+            )
+        ).first()
+        return db_entry, False
+    return db_entry, db_entry.created_at == now
+
+
+def patch_entry(session, entry_id, values):
+    """Apply a partial update in one UPDATE ... RETURNING statement.
+
+    The display name is computed by the database from the new values, or
+    the stored ones when they are not part of the patch. Returns the
+    updated entry, or None when it does not exist or its dictionary is
+    being deleted.
+    """
+    values = dict(values)
+    if "original_name" in values or "translation" in values:
+        columns = {
+            field: (
+                literal(values[field], String)
+                if field in values
+                else getattr(Entry, field)
+            )
+            for field in ("original_name", "translation")
+        }
+        values["display_name"] = display_name_expression(
+            columns["original_name"], columns["translation"]
+        )
+    if "original_name" in values:
+        values["normalized_name"] = normalize_term(values["original_name"])
+    if "translation" in values:
+        values["normalized_translation"] = normalize_term(
+            values["translation"]
+        )
+    values["updated_at"] = datetime.now()
+
+    statement = (
+        update(Entry)
+        .where(
+            Entry.id == entry_id,
+            Entry.dictionary_id == Dictionary.id,
+            Dictionary.is_deleting.is_(False),
+        )
+        .values(values)
+        .returning(Entry)
+    )
+    return session.exec(
+        statement,
+        execution_options={
+            "synchronize_session": False,
+            "populate_existing": True,
+        },
+    ).scalar_one_or_none()
+
+
+def read_entry_rows(stream, file_format):
+    """Yield (line, row) pairs from an uploaded CSV or NDJSON stream."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if file_format == EntryFileFormat.CSV:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, {
+                key: value for key, value in row.items() if value != ""
+            }
+    else:
+        for line_number, line in enumerate(text, start=1):
+            if line.strip():
+                yield line_number, line
+
+
+def _validation_detail(exc):
+    """Flatten a pydantic validation error into a single message."""
+    return "; ".join(
+        (
+            ".".join(str(loc) for loc in error["loc"]) + ": " + error["msg"]
+            if error["loc"]
+            else error["msg"]
+        )
+        for error in exc.errors()
+    )
+
+
+def _insert_batch(session, dictionary_id, batch, result, policy):
+    """Upsert one batch of rows and report those hitting the unique key."""
+    now = datetime.now()
+    values = [
+        entry_values(entry, now, dictionary_id=dictionary_id)
+        for _, entry in batch.values()
+    ]
+    statement = entry_upsert(session, values, policy).returning(
+        Entry.original_name, Entry.created_at
+    )
+    written = dict(session.exec(statement).all())
+
+    for original_name, (line, _) in batch.items():
+        if original_name in written:
+            if written[original_name] == now:
+                result.created += 1
+            else:
+                result.updated += 1
+        else:
+            result.conflicts.append(
+                EntryImportError(
+                    line=line,
+                    original_name=original_name,
+                    detail="An entry with this name already exists "
+                    "in the dictionary.",
+                )
+            )
+
+
+def bulk_import_entries(
+    session,
+    dictionary_id,
+    rows,
+    policy=ConflictPolicy.ERROR,
+    batch_size=IMPORT_BATCH_SIZE,
+):
+    """Insert parsed rows in multi-row batches and return a row report."""
+    result = EntryImportResult()
+    batch = {}
+
+    for line, row in rows:
+        try:
+            if isinstance(row, str):
+                entry = EntryImport.model_validate_json(row)
+            else:
+                entry = EntryImport.model_validate(row)
+        except ValidationError as exc:
+            result.errors.append(
+                EntryImportError(line=line, detail=_validation_detail(exc))
+            )
+            continue
+
+        if entry.original_name in batch:
+            result.conflicts.append(
+                EntryImportError(
+                    line=line,
+                    original_name=entry.original_name,
+                    detail="Duplicate name within the uploaded file.",
+                )
+            )
+            continue
+
+        batch[entry.original_name] = (line, entry)
+        if len(batch) >= batch_size:
+            _insert_batch(session, dictionary_id, batch, result, policy)
+            batch = {}
+
+    if batch:
+        _insert_batch(session, dictionary_id, batch, result, policy)
+
+    if result.created or result.updated:
+        bump_dictionary_version(session, dictionary_id)
+    session.commit()
+    _logger.info(
+        "Imported %s entries into dictionary %s (%s conflicts, %s errors)",
+        result.created,
+        dictionary_id,
+        len(result.conflicts),
+        len(result.errors),
+    )
+    return result
@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+from logging import getLogger
+
+from sqlmodel import Session, select
+
+from app.database import engine
+from app.dto.entry import EntryFileFormat
+from app.models.entry import Entry
+
+_logger = getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = (
+    "id",
+    "original_name",
+    "translation",
+    "display_name",
+    "description",
+    "is_expression",
+    "created_at",
+    "updated_at",
+)
+
+
+def _format_ndjson(rows):
+    """Render a batch of rows as newline-delimited JSON."""
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, row)), default=str) + "\n"
+        for row in rows
+    )
+
+
+def _format_csv(rows):
+    """Render a batch of rows as CSV."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+FORMATTERS = {
+    EntryFileFormat.NDJSON: _format_ndjson,
+    EntryFileFormat.CSV: _format_csv,
+}
+
+
+def stream_dictionary_entries(
+    dictionary_id: int,
+    export_format: EntryFileFormat,
+    batch_size: int = EXPORT_BATCH_SIZE,
+):
+    """Yield a dictionary's entries as text chunks, one per fetched batch.
+
+    CSV exports start with a chunk holding only the header row, so even an
+    empty export carries it.
+
+    The generator owns its session because the response body is sent
+    after request dependencies have been closed.
+    """
+    formatter = FORMATTERS[export_format]
+    statement = (
+        select(*(getattr(Entry, field) for field in EXPORT_FIELDS))
+        .where(Entry.dictionary_id == dictionary_id)
+        .order_by(Entry.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    if export_format == EntryFileFormat.CSV:
+        yield formatter([EXPORT_FIELDS])
+    with Session(engine) as session:
+        for rows in session.exec(statement).partitions():
+            yield formatter(rows)
+    _logger.info("Exported dictionary %s as %s", dictionary_id, export_format)
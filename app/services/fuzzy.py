@@ -0,0 +1,158 @@
+from logging import getLogger
+
+from sqlmodel import func, select
+
+from app.config import settings
+from app.core.cache import DictionaryCache
+from app.dto.entry import EntryFuzzyMatch
+from app.models.entry import Entry
+from app.services.dictionary import get_dictionary_version
+from app.services.entry import normalize_term
+from app.services.search import SUGGESTION_COLUMNS
+
+_logger = getLogger(__name__)
+
+fuzzy_cache = DictionaryCache(
+    max_size=settings.ENTRY_SEARCH_CACHE_SIZE,
+    ttl_seconds=settings.ENTRY_SEARCH_CACHE_TTL_SECONDS,
+)
+
+
+def levenshtein(source: str, target: str) -> int:
+    """Return the edit distance between two strings."""
+    if len(source) < len(target):
+        source, target = target, source
+
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, start=1):
+        current = [i]
+        for j, target_char in enumerate(target, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (source_char != target_char),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Burkhard-Keller tree of terms under the Levenshtein metric."""
+
+    def __init__(self):
+        """Create an empty tree."""
+        self.root = None
+        self.size = 0
+
+    def add(self, term: str, payload):
+        """Insert a term, attaching the payload to it."""
+        self.size += 1
+        if self.root is None:
+            self.root = (term, [payload], {})
+            return
+
+        node = self.root
+        while True:
+            distance = levenshtein(term, node[0])
+            if distance == 0:
+                node[1].append(payload)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (term, [payload], {})
+                return
+            node = child
+
+    def search(self, term: str, max_distance: int):
+        """Return (distance, payload) pairs within max_distance of a term."""
+        if self.root is None:
+            return []
+
+        results = []
+        stack = [self.root]
+        while stack:
+            node_term, payloads, children = stack.pop()
+            distance = levenshtein(term, node_term)
+            if distance <= max_distance:
+                results.extend((distance, payload) for payload in payloads)
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(
+                child
+                for edge, child in children.items()
+                if low <= edge <= high
+            )
+        return results
+
+
+def _build_bk_tree(session, dictionary_id):
+    """Load a dictionary's normalized names into a BK-tree."""
+    tree = BKTree()
+    rows = session.exec(
+        select(Entry.normalized_name, *SUGGESTION_COLUMNS).where(
+            Entry.dictionary_id == dictionary_id,
+            Entry.normalized_name.is_not(None),
+        )
+    )
+    for row in rows:
+        tree.add(row[0], row._mapping)
+    _logger.info(
+        "Built BK-tree for dictionary %s (%s entries)",
+        dictionary_id,
+        tree.size,
+    )
+    return tree
+
+
+def _search_bk_tree(session, dictionary_id, key, limit, max_distance):
+    """Return the closest entries by edit distance from a cached BK-tree."""
+    tree = fuzzy_cache.get(
+        dictionary_id,
+        lambda: _build_bk_tree(session, dictionary_id),
+        version=get_dictionary_version(session, dictionary_id),
+    )
+    matches = sorted(
+        tree.search(key, max_distance),
+        key=lambda match: (match[0], match[1]["original_name"]),
+    )
+    return [
+        EntryFuzzyMatch(**payload, distance=distance)
+        for distance, payload in matches[:limit]
+    ]
+
+
+def _search_trigram(session, dictionary_id, key, limit, min_similarity):
+    """Return the most similar entries using the pg_trgm GIN index."""
+    similarity = func.similarity(Entry.normalized_name, key)
+    rows = session.exec(
+        select(*SUGGESTION_COLUMNS, similarity.label("similarity"))
+        .where(
+            Entry.dictionary_id == dictionary_id,
+            Entry.normalized_name.op("%")(key),
+            similarity >= min_similarity,
+        )
+        .order_by(similarity.desc(), Entry.normalized_name)
+        .limit(limit)
+    )
+    return [EntryFuzzyMatch.model_validate(row._mapping) for row in rows]
+
+
+def search_fuzzy(
+    session,
+    dictionary_id: int,
+    term: str,
+    limit: int,
+    max_distance: int,
+    min_similarity: float,
+):
+    """Return the entries of a dictionary closest to a misspelled term."""
+    key = normalize_term(term)
+    if not key:
+        return []
+
+    if settings.ENTRY_FUZZY_BACKEND == "bktree":
+        return _search_bk_tree(
+            session, dictionary_id, key, limit, max_distance
+        )
+    return _search_trigram(session, dictionary_id, key, limit, min_similarity)
@@ -0,0 +1,59 @@
+from logging import getLogger
+
+from sqlmodel import select, update
+
+from app.core.jobs import job_handler
+from app.models.entry import Entry
+from app.services.dictionary import bump_dictionary_version
+from app.services.entry import format_display_name, normalize_term
+
+_logger = getLogger(__name__)
+
+REINDEX_DICTIONARY_JOB = "dictionary.reindex"
+REINDEX_BATCH_SIZE = 1000
+
+
+@job_handler(REINDEX_DICTIONARY_JOB)
+def reindex_dictionary(session, job, report):
+    """Recompute display names and search keys of a dictionary's entries.
+
+    Entries are walked in ID order and rewritten one batch per transaction.
+    """
+    dictionary_id = job.payload["dictionary_id"]
+    batch_size = job.payload.get("batch_size", REINDEX_BATCH_SIZE)
+    last_id, reindexed = 0, 0
+    while True:
+        rows = session.exec(
+            select(Entry.id, Entry.original_name, Entry.translation)
+            .where(Entry.dictionary_id == dictionary_id, Entry.id > last_id)
+            .order_by(Entry.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        session.exec(
+            update(Entry),
+            params=[
+                {
+                    "id": row.id,
+                    "display_name": format_display_name(
+                        row.original_name, row.translation
+                    ),
+                    "normalized_name": normalize_term(row.original_name),
+                    "normalized_translation": normalize_term(row.translation),
+                }
+                for row in rows
+            ],
+        )
+        session.commit()
+        last_id = rows[-1].id
+        reindexed += len(rows)
+        report(reindexed)
+
+    bump_dictionary_version(session, dictionary_id)
+    session.commit()
+    _logger.info(
+        "Reindexed dictionary %s (%s entries)", dictionary_id, reindexed
+    )
+    return {"reindexed_entries": reindexed}
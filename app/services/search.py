@@ -0,0 +1,178 @@
+from bisect import bisect_left, bisect_right
+from logging import getLogger
+
+from sqlalchemy import String, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import select
+
+from app.config import settings
+from app.core.cache import DictionaryCache
+from app.dto.entry import EntrySuggestion, LookupMode, WordLookup
+from app.models.entry import Entry
+from app.services.dictionary import get_dictionary_version
+from app.services.entry import normalize_term
+
+_logger = getLogger(__name__)
+
+SUGGESTION_COLUMNS = (
+    Entry.id,
+    Entry.original_name,
+    Entry.translation,
+    Entry.is_expression,
+)
+
+# The search keys in the "C" collation of their indexes, so that prefix
+# ranges, equality and ordering can all be answered by the index.
+NAME_KEY = Entry.normalized_name.collate("C")
+TRANSLATION_KEY = Entry.normalized_translation.collate("C")
+
+prefix_cache = DictionaryCache(
+    max_size=settings.ENTRY_SEARCH_CACHE_SIZE,
+    ttl_seconds=settings.ENTRY_SEARCH_CACHE_TTL_SECONDS,
+)
+
+
+class PrefixIndex:
+    """Sorted array of normalized names answering prefix queries."""
+
+    def __init__(self, rows):
+        """Index (normalized_name, suggestion) pairs by their key."""
+        rows = sorted(rows, key=lambda row: row[0])
+        self.keys = [row[0] for row in rows]
+        self.suggestions = [row[1] for row in rows]
+
+    def search(self, prefix: str, limit: int):
+        """Return up to ``limit`` suggestions whose key starts with prefix."""
+        results = []
+        index = bisect_left(self.keys, prefix)
+        while (
+            index < len(self.keys)
+            and len(results) < limit
+            and self.keys[index].startswith(prefix)
+        ):
+            results.append(self.suggestions[index])
+            index += 1
+        return results
+
+    def lookup(self, key: str):
+        """Return every suggestion whose key equals the given key."""
+        start = bisect_left(self.keys, key)
+        end = bisect_right(self.keys, key, lo=start)
+        return self.suggestions[start:end]
+
+
+def _build_prefix_index(session, dictionary_id):
+    """Load a dictionary's normalized names into a prefix index."""
+    rows = session.exec(
+        select(Entry.normalized_name, *SUGGESTION_COLUMNS).where(
+            Entry.dictionary_id == dictionary_id,
+            Entry.normalized_name.is_not(None),
+        )
+    ).all()
+    _logger.info(
+        "Built prefix index for dictionary %s (%s entries)",
+        dictionary_id,
+        len(rows),
+    )
+    return PrefixIndex(
+        (row[0], EntrySuggestion.model_validate(row._mapping)) for row in rows
+    )
+
+
+def _get_prefix_index(session, dictionary_id):
+    """Return the cached prefix index of a dictionary."""
+    return prefix_cache.get(
+        dictionary_id,
+        lambda: _build_prefix_index(session, dictionary_id),
+        version=get_dictionary_version(session, dictionary_id),
+    )
+
+
+def _prefix_pattern(key):
+    """Return a LIKE pattern, escaped with "/", matching a key prefix.
+
+    The whole pattern is bound as one parameter, so the planner sees a
+    constant prefix it can turn into an index range.
+    """
+    escaped = key.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return escaped + "%"
+
+
+def search_prefix(session, dictionary_id: int, prefix: str, limit: int):
+    """Return entries of a dictionary whose name starts with a prefix."""
+    key = normalize_term(prefix)
+    if not key:
+        return []
+
+    if settings.ENTRY_SEARCH_CACHE:
+        return _get_prefix_index(session, dictionary_id).search(key, limit)
+
+    return session.exec(
+        select(*SUGGESTION_COLUMNS)
+        .where(
+            Entry.dictionary_id == dictionary_id,
+            NAME_KEY.like(_prefix_pattern(key), escape="/"),
+        )
+        .order_by(NAME_KEY)
+        .limit(limit)
+    ).all()
+
+
+def search_translation(
+    session, dictionary_id: int, translation: str, mode: LookupMode, limit: int
+):
+    """Return entries of a dictionary matching a translation."""
+    key = normalize_term(translation)
+    if not key:
+        return []
+
+    if mode == LookupMode.PREFIX:
+        condition = TRANSLATION_KEY.like(_prefix_pattern(key), escape="/")
+    else:
+        condition = TRANSLATION_KEY == key
+
+    return session.exec(
+        select(*SUGGESTION_COLUMNS)
+        .where(Entry.dictionary_id == dictionary_id, condition)
+        .order_by(TRANSLATION_KEY, Entry.id)
+        .limit(limit)
+    ).all()
+
+
+def lookup_words(session, dictionary_id: int, words):
+    """Resolve many words of a dictionary at once, in input order.
+
+    Words are matched on their normalized key, either against the cached
+    prefix index or with a single ``= ANY(:keys)`` query.
+    """
+    keys = [normalize_term(word) for word in words]
+    unique_keys = sorted({key for key in keys if key})
+
+    if settings.ENTRY_SEARCH_CACHE:
+        index = _get_prefix_index(session, dictionary_id)
+        found = {key: index.lookup(key) for key in unique_keys}
+    else:
+        found = {}
+        if unique_keys:
+            rows = session.exec(
+                select(Entry.normalized_name, *SUGGESTION_COLUMNS).where(
+                    Entry.dictionary_id == dictionary_id,
+                    NAME_KEY
+                    == any_(
+                        bindparam("keys", unique_keys, type_=ARRAY(String))
+                    ),
+                )
+            )
+            for row in rows:
+                found.setdefault(row[0], []).append(
+                    EntrySuggestion.model_validate(row._mapping)
+                )
+
+    return [
+        WordLookup(
+            word=word,
+            found=bool(found.get(key)),
+            entries=found.get(key, []),
+        )
+        for word, key in zip(words, keys)
+    ]
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+from logging import getLogger
+
+from fastapi.exceptions import HTTPException
+from sqlmodel import func, select, tuple_
+
+from app.config import settings
+from app.core.cursor import decode_cursor, encode_cursor
+from app.dto.entry import EntryChanges
+from app.models.entry import Entry
+from app.models.entryTombstone import EntryTombstone
+from app.services.dictionary import get_dictionary_version
+
+_logger = getLogger(__name__)
+
+
+def get_entry_changes(session, dictionary_id: int, since, limit: int):
+    """Return entries changed and deleted in a dictionary after a cursor.
+
+    The cursor holds the (updated_at, id) of the last entry seen and the
+    last tombstone ID seen. Without one, every entry is returned and the
+    tombstone position starts at the latest deletion, since a fresh client
+    has nothing to delete. A missing dictionary, or one being deleted,
+    raises a 404 so that offline clients learn it is gone.
+
+    Timestamps are taken when a row is written, not when its transaction
+    commits, so a slow concurrent transaction can commit a row that sorts
+    before a cursor already handed out. Only rows older than
+    SYNC_SAFETY_SECONDS are returned, which leaves that much time for
+    in-flight transactions to commit; one that stays open longer can still
+    be missed until the entry changes again.
+    """
+    if get_dictionary_version(session, dictionary_id) is None:
+        raise HTTPException(status_code=404, detail="Dictionary not found")
+
+    horizon = datetime.now() - timedelta(seconds=settings.SYNC_SAFETY_SECONDS)
+    if since:
+        updated_at, entry_id, tombstone_id = decode_cursor(
+            since, datetime.fromisoformat, int, int
+        )
+    else:
+        updated_at, entry_id = datetime.min, 0
+        tombstone_id = (
+            session.exec(
+                select(func.max(EntryTombstone.id)).where(
+                    EntryTombstone.dictionary_id == dictionary_id
+                )
+            ).one()
+            or 0
+        )
+
+    entries = session.exec(
+        select(Entry)
+        .where(
+            Entry.dictionary_id == dictionary_id,
+            tuple_(Entry.updated_at, Entry.id) > tuple_(updated_at, entry_id),
+            Entry.updated_at < horizon,
+        )
+        .order_by(Entry.updated_at, Entry.id)
+        .limit(limit + 1)
+    ).all()
+    tombstones = session.exec(
+        select(EntryTombstone.id, EntryTombstone.entry_id)
+        .where(
+            EntryTombstone.dictionary_id == dictionary_id,
+            EntryTombstone.id > tombstone_id,
+            EntryTombstone.deleted_at < horizon,
+        )
+        .order_by(EntryTombstone.id)
+        .limit(limit + 1)
+    ).all()
+
+    has_more = len(entries) > limit or len(tombstones) > limit
+    entries, tombstones = entries[:limit], tombstones[:limit]
+    if entries:
+        updated_at, entry_id = entries[-1].updated_at, entries[-1].id
+    if tombstones:
+        tombstone_id = tombstones[-1][0]
+
+    return EntryChanges(
+        items=entries,
+        deleted=[tombstone[1] for tombstone in tombstones],
+        next_cursor=encode_cursor(updated_at, entry_id, tombstone_id),
+        has_more=has_more,
+    )
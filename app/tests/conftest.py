@@ -0,0 +1,43 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, create_engine
+
+import app.models  # noqa: F401
+from app.core.queries import track_queries
+
+
+@pytest.fixture
+def sqlite_engine():
+    """Provide an in-memory database with the application schema."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def add_c_collation(connection, record):
+        """Mirror PostgreSQL's "C" collation, which sorts by code point."""
+        connection.create_collation("C", lambda a, b: (a > b) - (a < b))
+
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_session():
+    """Provide a mock AsyncSession whose ``exec`` must be awaited."""
+    session = MagicMock()
+    session.exec = AsyncMock(return_value=MagicMock())
+    return session
+
+
+@pytest.fixture
+def query_counter():
+    """Provide the QueryStats of the statements run during a test."""
+    with track_queries() as stats:
+        yield stats
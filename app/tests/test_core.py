@@ -1,13 +1,65 @@
+import asyncio
+import io
+import json
+import logging
+import queue
+import time
+from logging.handlers import QueueListener
+from unittest.mock import MagicMock, patch
+
 import bcrypt
+import pytest
+import sqlalchemy.exc
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, Table
+from sqlmodel import Session, SQLModel, create_engine, select
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.testclient import TestClient
 
+from app.config import settings
+from app.core.cache import DictionaryCache
+from app.core.logger import (
+    DROPPED,
+    DroppingQueueHandler,
+    JsonFormatter,
+    SamplingFilter,
+)
+from app.core.metrics import (
+    CONTENT_TYPE,
+    IN_FLIGHT,
+    REGISTRY,
+    REQUESTS,
+    RESPONSE_BYTES,
+    Histogram,
+)
 from app.core.openapi import custom_openapi
+from app.core.pool import InstrumentedQueuePool, WaitHistogram, pool_stats
+from app.core.queries import Query, QueryStats
+from app.core.replicas import (
+    STICKY_COOKIE,
+    ReadReplicas,
+    is_sticky,
+    stick_to_primary,
+)
+from app.core.schema import unindexed_foreign_keys
 from app.core.security.password import (
     check_password,
     create_access_token,
     decode_access_token,
     hash_password,
 )
-from app.main import app
+from app.core.slow import (
+    SlowRequestLog,
+    explain,
+    explain_into,
+    slow_request,
+    slow_requests,
+)
+from app.database import get_read_session
+from app.main import app, count_queries
+from app.models.country import Country
+from app.models.language import Language
+from app.routes.internal import require_superuser
 
 
 def test_hash_password():
@@ -43,3 +95,453 @@ def test_create_access_token():
     token = create_access_token(data)
     payload = decode_access_token(token)
     assert payload["sub"] == data["sub"]
+
+
+def test_dictionary_cache_evicts_least_recently_used():
+    """Test that DictionaryCache keeps at most max_size dictionaries."""
+    cache = DictionaryCache(max_size=2, ttl_seconds=60)
+    build = MagicMock(side_effect=lambda: object())
+
+    first = cache.get(1, build)
+    cache.get(2, build)
+    assert cache.get(1, build) is first
+    cache.get(3, build)
+    cache.get(2, build)
+
+    assert build.call_count == 4
+
+
+def test_dictionary_cache_expires_and_invalidates():
+    """Test that DictionaryCache rebuilds stale or invalidated values."""
+    cache = DictionaryCache(max_size=2, ttl_seconds=0)
+    assert cache.get(1, lambda: "a") == "a"
+    assert cache.get(1, lambda: "b") == "b"
+
+    cache.ttl_seconds = 60
+    cache.invalidate(1)
+    assert cache.get(1, lambda: "c") == "c"
+
+
+def test_dictionary_cache_rebuilds_on_new_version():
+    """Test that DictionaryCache rebuilds once the dictionary version moves."""
+    cache = DictionaryCache(max_size=2, ttl_seconds=60)
+
+    assert cache.get(1, lambda: "v1", version=1) == "v1"
+    assert cache.get(1, lambda: "unused", version=1) == "v1"
+    assert cache.get(1, lambda: "v2", version=2) == "v2"
+
+
+def test_wait_histogram_snapshot_is_cumulative():
+    """Test that wait times are counted into cumulative buckets."""
+    histogram = WaitHistogram(buckets=(0.01, 0.1))
+    for seconds in (0.001, 0.05, 0.05, 2.0):
+        histogram.observe(seconds)
+    histogram.timeout()
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["buckets"] == {"0.01": 1, "0.1": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum_seconds"] == pytest.approx(2.101)
+    assert snapshot["timeouts"] == 1
+
+
+def test_instrumented_pool_records_waits_and_timeouts():
+    """Test that the instrumented pool times checkouts and timeouts."""
+    engine = create_engine(
+        "sqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    connection = engine.connect()
+    with pytest.raises(sqlalchemy.exc.TimeoutError):
+        engine.connect()
+    stats = pool_stats("test", engine.pool)
+    connection.close()
+    engine.dispose()
+
+    assert (stats["size"], stats["checked_out"], stats["overflow"]) == (
+        1,
+        1,
+        0,
+    )
+    assert stats["wait"]["count"] == 1
+    assert stats["wait"]["timeouts"] == 1
+
+
+def test_read_replicas_round_robin_skips_failed():
+    """Test that replicas are balanced and failed ones are skipped."""
+    replicas = ReadReplicas(["a", "b", "c"], retry_seconds=60)
+
+    assert [replicas.pick() for _ in range(4)] == ["a", "b", "c", "a"]
+    replicas.mark_down("b")
+    assert [replicas.pick() for _ in range(3)] == ["c", "c", "a"]
+    assert ReadReplicas([]).pick() is None
+
+
+def test_read_your_writes_cookie():
+    """Test that a write pins the client to the primary for a while."""
+    response = Response()
+    stick_to_primary(Request(scope={"type": "http", "headers": []}), response)
+    cookie = response.headers["set-cookie"]
+    value = cookie.split(";")[0].split("=")[1]
+
+    def request_with(cookie_value):
+        return Request(
+            scope={
+                "type": "http",
+                "headers": [
+                    (b"cookie", f"{STICKY_COOKIE}={cookie_value}".encode())
+                ],
+            }
+        )
+
+    assert f"Max-Age={settings.DB_READ_STICKY_SECONDS}" in cookie
+    assert is_sticky(request_with(value))
+    assert not is_sticky(request_with(time.time() - 1))
+    assert not is_sticky(request_with("garbage"))
+
+
+def test_read_your_writes_by_user():
+    """Test that bearer clients stick to the primary without cookies."""
+
+    def request_with(user_id):
+        token = create_access_token({"sub": str(user_id)})
+        return Request(
+            scope={
+                "type": "http",
+                "headers": [(b"authorization", f"Bearer {token}".encode())],
+            }
+        )
+
+    stick_to_primary(request_with(1), Response())
+
+    assert is_sticky(request_with(1))
+    assert not is_sticky(request_with(2))
+    assert not is_sticky(
+        Request(
+            scope={
+                "type": "http",
+                "headers": [(b"authorization", b"Bearer garbage")],
+            }
+        )
+    )
+
+
+def test_get_read_session_falls_back_on_pool_timeout(sqlite_engine):
+    """Test that an exhausted replica pool sends reads to the primary."""
+    replica = MagicMock()
+    replicas = ReadReplicas([replica])
+    request = Request(scope={"type": "http", "headers": []})
+
+    with patch("app.database.read_replicas", replicas), patch(
+        "app.database.engine", sqlite_engine
+    ), patch(
+        "app.database.Session.connection",
+        side_effect=[sqlalchemy.exc.TimeoutError("pool"), None],
+    ):
+        sessions = get_read_session(request)
+        session = next(sessions)
+        sessions.close()
+
+    assert session.get_bind() is sqlite_engine
+    assert replicas.pick() is replica
+
+
+def test_get_read_session_falls_back_to_primary(sqlite_engine):
+    """Test that reads use the primary when the replica is unreachable."""
+    broken = create_engine("sqlite:////nonexistent/replica.db")
+    replicas = ReadReplicas([broken])
+    request = Request(scope={"type": "http", "headers": []})
+
+    with patch("app.database.read_replicas", replicas), patch(
+        "app.database.engine", sqlite_engine
+    ):
+        sessions = get_read_session(request)
+        session = next(sessions)
+        sessions.close()
+
+    assert session.get_bind() is sqlite_engine
+    assert replicas.pick() is None
+
+
+def test_every_foreign_key_is_indexed():
+    """Test that no model declares a foreign key without a usable index."""
+    assert unindexed_foreign_keys(SQLModel.metadata) == []
+
+
+def test_unindexed_foreign_keys_reports_missing_index():
+    """Test that the index check flags a bare foreign key column."""
+    metadata = MetaData()
+    Table("parent", metadata, Column("id", Integer, primary_key=True))
+    Table(
+        "child",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("parent_id", ForeignKey("parent.id")),
+    )
+
+    assert unindexed_foreign_keys(metadata) == [("child", ("parent_id",))]
+
+
+def test_query_counter_counts_statements(sqlite_engine, query_counter):
+    """Test that the query counter records every executed statement."""
+    with Session(sqlite_engine) as session:
+        session.exec(select(Language)).all()
+        session.exec(select(Country)).all()
+
+    assert query_counter.count == 2
+    assert query_counter.duration >= 0
+    assert "FROM language" in query_counter.statements[0]
+
+
+def test_count_queries_middleware(sqlite_engine, caplog):
+    """Test that the middleware reports queries and warns over budget."""
+
+    async def call_next(request):
+        with Session(sqlite_engine) as session:
+            for _ in range(3):
+                session.exec(select(Language)).all()
+        return Response()
+
+    request = Request(
+        scope={"type": "http", "method": "GET", "path": "/", "headers": []}
+    )
+    with patch.object(settings, "ENV", "DEV"), patch.object(
+        settings, "DB_QUERY_BUDGET", 2
+    ):
+        response = asyncio.run(count_queries(request, call_next))
+
+    assert response.headers["X-DB-Query-Count"] == "3"
+    assert "X-DB-Query-Time" in response.headers
+    assert "GET / ran 3 queries (budget 2)" in caplog.text
+
+    with patch.object(settings, "ENV", "PROD"):
+        response = asyncio.run(count_queries(request, call_next))
+    assert "X-DB-Query-Count" not in response.headers
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test the text exposition of a labelled histogram."""
+    histogram = Histogram("test_seconds", "Test.", ("route",), (0.1, 1.0))
+    REGISTRY.remove(histogram)
+    histogram.observe(0.05, '/a"b')
+    histogram.observe(0.5, '/a"b')
+    histogram.observe(2.0, '/a"b')
+
+    assert list(histogram.render()) == [
+        "# HELP test_seconds Test.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/a\\"b",le="0.1"} 1',
+        'test_seconds_bucket{route="/a\\"b",le="1.0"} 2',
+        'test_seconds_bucket{route="/a\\"b",le="+Inf"} 3',
+        'test_seconds_sum{route="/a\\"b"} 2.55',
+        'test_seconds_count{route="/a\\"b"} 3',
+    ]
+
+
+def test_metrics_middleware_records_requests():
+    """Test that requests are counted by method, route template and status."""
+    client = TestClient(app)
+
+    client.get("/")
+    client.get("/does-not-exist")
+    client.request("PURGE", "/")
+    app.dependency_overrides[require_superuser] = lambda: None
+    try:
+        response = client.get("/metrics")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.headers["content-type"] == CONTENT_TYPE
+    assert REQUESTS.get("GET", "/", "200") >= 1
+    assert REQUESTS.get("GET", "unmatched", "404") >= 1
+    assert RESPONSE_BYTES.get("GET", "/", "200")[0] >= 1
+    assert IN_FLIGHT.get() == 0
+    assert 'http_requests_total{method="GET",route="/",status="200"}' in (
+        response.text
+    )
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert REQUESTS.get("OTHER", "/", "405") >= 1
+    assert 'method="PURGE"' not in response.text
+
+
+def test_metrics_requires_superuser():
+    """Test that anonymous clients cannot scrape the metrics."""
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 401
+
+
+def test_dropping_queue_handler_counts_dropped_records():
+    """Test that a full log queue drops records instead of blocking."""
+    log_queue = queue.Queue(maxsize=1)
+    handler = DroppingQueueHandler(log_queue)
+    record = logging.LogRecord("test", logging.DEBUG, "", 0, "hi", None, None)
+    dropped = DROPPED.get("DEBUG")
+
+    handler.handle(record)
+    handler.handle(record)
+
+    assert log_queue.qsize() == 1
+    assert DROPPED.get("DEBUG") == dropped + 1
+
+
+def test_sampling_filter_keeps_warnings():
+    """Test that sampling only drops records below WARNING."""
+    sampling = SamplingFilter(0)
+    info = logging.LogRecord("test", logging.INFO, "", 0, "hi", None, None)
+    warning = logging.LogRecord(
+        "test", logging.WARNING, "", 0, "!", None, None
+    )
+
+    assert not sampling.filter(info)
+    assert sampling.filter(warning)
+
+
+def test_json_formatter():
+    """Test that records are formatted as JSON documents."""
+    record = logging.LogRecord(
+        "app.test", logging.INFO, "", 0, "Hello %s", ("Lexit",), None
+    )
+
+    document = json.loads(JsonFormatter().format(record))
+
+    assert document["level"] == "INFO"
+    assert document["logger"] == "app.test"
+    assert document["message"] == "Hello Lexit"
+
+
+def test_slow_request_log_keeps_newest_records():
+    """Test that the slow request ring buffer evicts the oldest records."""
+    log = SlowRequestLog(max_size=2)
+    for index in range(3):
+        log.add({"index": index})
+
+    assert log.records() == [{"index": 2}, {"index": 1}]
+
+
+def test_count_queries_records_slow_requests(sqlite_engine):
+    """Test that slow requests are kept with their SQL statements."""
+
+    async def call_next(request):
+        with Session(sqlite_engine) as session:
+            session.exec(select(Language).where(Language.code == "fr")).all()
+        return Response(status_code=200)
+
+    request = Request(
+        scope={"type": "http", "method": "GET", "path": "/", "headers": []}
+    )
+    slow_requests.clear()
+    with patch.object(settings, "SLOW_REQUEST_SECONDS", 1e-9):
+        asyncio.run(count_queries(request, call_next))
+
+    [record] = slow_requests.records()
+    slow_requests.clear()
+    assert record["route"] == "unmatched"
+    assert record["query_count"] == 1
+    assert record["duration_ms"] >= record["db_ms"]
+    assert record["queries"][0]["parameters"] == "('fr',)"
+    assert record["slowest_statement"] == record["queries"][0]["statement"]
+    assert record["explain"] is None
+
+
+def test_explain_skips_unsupported_statements():
+    """Test that EXPLAIN only runs single PostgreSQL statements."""
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+    connection = engine.connect.return_value.__enter__.return_value
+    connection.exec_driver_sql.return_value.all.return_value = [
+        ("Seq Scan on entry",),
+        ("  Filter: (id = 1)",),
+    ]
+    query = Query("SELECT * FROM entry WHERE id = %(id)s", {"id": 1}, 2.0)
+
+    assert explain(engine, query) == "Seq Scan on entry\n  Filter: (id = 1)"
+    connection.exec_driver_sql.assert_called_once_with(
+        "EXPLAIN (ANALYZE off) SELECT * FROM entry WHERE id = %(id)s",
+        {"id": 1},
+    )
+    assert explain(engine, query._replace(parameters=[{}, {}])) is None
+
+    engine.dialect.name = "sqlite"
+    assert explain(engine, query) is None
+
+
+def test_slow_request_redacts_sensitive_parameters():
+    """Test that passwords and emails never reach the slow request log."""
+    stats = QueryStats()
+    stats.record(
+        "INSERT INTO user (email, hashed_password, username) "
+        "VALUES (%(email)s, %(hashed_password)s, %(username)s)",
+        {"email": "a@b.c", "hashed_password": "$2b$x", "username": "alice"},
+        0.1,
+    )
+    stats.record("SELECT * FROM user WHERE user.email = ?", ("a@b.c",), 0.2)
+    stats.record(
+        "SELECT * FROM user WHERE email = %(email_1)s",
+        {"email_1": "a@b.c"},
+        0.3,
+    )
+
+    record = slow_request("POST", "/", "/", 200, 1.0, stats)
+
+    parameters = [query["parameters"] for query in record["queries"]]
+    assert "a@b.c" not in "".join(parameters)
+    assert "$2b$x" not in "".join(parameters)
+    assert "'alice'" in parameters[0]
+    assert parameters[1] == "('[redacted]',)"
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+    assert explain(engine, stats.slowest) is None
+    engine.connect.assert_not_called()
+
+
+def test_count_queries_explains_after_the_response(sqlite_engine):
+    """Test that EXPLAIN runs as a background task of the slow response."""
+
+    async def call_next(request):
+        with Session(sqlite_engine) as session:
+            session.exec(select(Language)).all()
+        return Response()
+
+    request = Request(
+        scope={"type": "http", "method": "GET", "path": "/", "headers": []}
+    )
+    slow_requests.clear()
+    with patch.object(settings, "SLOW_REQUEST_SECONDS", 1e-9), patch.object(
+        settings, "SLOW_REQUEST_EXPLAIN", True
+    ), patch("app.main.engine", sqlite_engine):
+        response = asyncio.run(count_queries(request, call_next))
+        [record] = slow_requests.records()
+        slow_requests.clear()
+
+        assert "explain" in record
+        assert response.background.func is explain_into
+        assert response.background.args[0] is record
+
+
+def test_json_logs_keep_tracebacks_through_the_queue():
+    """Test that the listener-side JSON formatter still sees exc_info."""
+    log_queue = queue.Queue()
+    stream = io.StringIO()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter())
+    listener = QueueListener(log_queue, output)
+    test_logger = logging.getLogger("test.json_queue")
+    test_logger.propagate = False
+    test_logger.handlers = [DroppingQueueHandler(log_queue)]
+
+    listener.start()
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        test_logger.exception("boom %s", 1)
+    finally:
+        listener.stop()
+
+    document = json.loads(stream.getvalue())
+    assert document["message"] == "boom 1"
+    assert "ValueError: bad" in document["exc_info"]
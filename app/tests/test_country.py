@@ -1,9 +1,15 @@
 from unittest.mock import MagicMock
 
+from sqlmodel import Session
 from starlette.requests import Request
+from starlette.testclient import TestClient
 
-from app.dto.country import CountryCreate
+from app.config import settings
+from app.database import get_read_session
+from app.dto.country import CountryCreate, CountryInclude
+from app.main import app
 from app.models.country import Country
+from app.models.language import Language
 from app.routes.country import create_country, get_country, get_country_by_id
 
 fake_scope = {
@@ -23,7 +29,11 @@ def test_get_country():
 
     mock_countries = [
         Country(
-            id=1, name="France", code="FR", latitude=46.2276, longitude=2.2137
+            id=1,
+            name="France",
+            code="FR",
+            latitude="46.2276",
+            longitude="2.2137",
         ),
         Country(
             id=2,
@@ -40,7 +50,8 @@ def test_get_country():
 
     response = get_country(mock_session)
 
-    assert response == mock_countries
+    assert [item.id for item in response] == [1, 2]
+    assert response[0].languages is None
     assert len(response) == 2
     assert response[0].name == "France"
     assert response[1].name == "Germany"
@@ -62,8 +73,8 @@ def test_get_country_by_id_success():
 
     response = get_country_by_id(country_id=1, session=mock_session)
 
-    assert response == mock_country
     assert response.id == 1
+    assert response.languages is None
     assert response.name == "France"
     assert response.code == "FR"
     assert response.latitude == "46.2276"
@@ -72,6 +83,30 @@ def test_get_country_by_id_success():
     mock_query_result.first.assert_called_once()
 
 
+def test_get_country_by_id_route(sqlite_engine):
+    """Test that the country route returns one country or a 404."""
+    with Session(sqlite_engine) as session:
+        session.add(Country(id=1, name="France", code="FR"))
+        session.commit()
+
+    def read_session():
+        with Session(sqlite_engine) as session:
+            yield session
+
+    app.dependency_overrides[get_read_session] = read_session
+    try:
+        client = TestClient(app)
+        found = client.get(f"/{settings.API_VERSION}/country/1")
+        missing = client.get(f"/{settings.API_VERSION}/country/2")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert found.status_code == 200
+    assert found.json()["name"] == "France"
+    assert missing.status_code == 404
+    assert missing.json()["detail"] == "Country not found"
+
+
 def test_post_country_success():
     """Test creating a new country with valid data returns the created country."""
     mock_session = MagicMock()
@@ -90,3 +125,36 @@ def test_post_country_success():
     assert response.code == "NC"
     assert response.latitude == "46.2276"
     assert response.longitude == "2.2137"
+
+
+def test_get_country_loads_languages_in_constant_queries(
+    sqlite_engine, query_counter
+):
+    """Test that listing countries with languages does not run N+1 queries."""
+    with Session(sqlite_engine) as session:
+        for index in range(5):
+            session.add(
+                Country(
+                    name=f"Country {index}",
+                    code=f"C{index}",
+                    languages=[
+                        Language(name=f"Language {index}", code=f"{index}")
+                    ],
+                )
+            )
+        session.commit()
+
+    with Session(sqlite_engine) as session:
+        query_counter.count = 0
+        response = get_country(session, include=[CountryInclude.LANGUAGES])
+
+        assert query_counter.count == 2
+        assert [country.languages[0].name for country in response] == [
+            f"Language {index}" for index in range(5)
+        ]
+
+        query_counter.count = 0
+        response = get_country(session)
+
+        assert query_counter.count == 1
+        assert response[0].languages is None
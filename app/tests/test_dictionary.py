@@ -1,12 +1,29 @@
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
+import sqlmodel
+from fastapi import Response
 from fastapi.exceptions import HTTPException
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateTable
+from sqlmodel import Session, select
 from starlette.requests import Request
 
-from app.dto.dictionary import DictionaryCreate, DictionaryUpdate
+from app.config import settings
+from app.core.etag import make_etag
+from app.core.jobs import job_runner
+from app.dto.dictionary import (
+    DictionaryCreate,
+    DictionaryInclude,
+    DictionaryUpdate,
+)
+from app.dto.job import JobStatus
 from app.models.dictionary import Dictionary
+from app.models.entry import Entry
+from app.models.entryTombstone import EntryTombstone
+from app.models.job import Job
 from app.models.language import Language
 from app.models.user import User
 from app.routes.dictionary import (
@@ -18,7 +35,12 @@ from app.routes.dictionary import (
     get_dictionary_by_id,
     update_own_dictionary,
 )
-from app.services.dictionary import compute_display_name
+from app.services.deletion import start_dictionary_deletion
+from app.services.dictionary import (
+    bump_dictionary_version,
+    compute_display_name,
+    get_dictionary_version,
+)
 
 fake_scope = {
     "type": "http",
@@ -171,7 +193,8 @@ def test_get_dictionaries():
 
     result = get_dictionaries(request, mock_session)
 
-    assert result == mock_dictionaries
+    assert [item.id for item in result] == [1, 2]
+    assert result[0].source_language is None
     assert len(result) == 2
     assert result[0].name == "English to French"
     assert result[1].name == "English to Spanish"
@@ -195,10 +218,8 @@ def test_get_dictionaries_empty():
     mock_query_result.all.assert_called_once()
 
 
-def test_get_dictionary_by_id_success():
+def test_get_dictionary_by_id_success(async_session):
     """Test retrieving a dictionary by ID successfully."""
-    mock_session = MagicMock()
-
     mock_dictionary = Dictionary(
         id=1,
         name="English to French",
@@ -210,15 +231,15 @@ def test_get_dictionary_by_id_success():
 
     mock_query_result = MagicMock()
     mock_query_result.first.return_value = mock_dictionary
-    mock_session.exec.return_value = mock_query_result
+    async_session.exec.return_value = mock_query_result
 
-    result = get_dictionary_by_id(request, 1, mock_session)
+    result = asyncio.run(get_dictionary_by_id(request, 1, async_session))
 
-    assert result == mock_dictionary
     assert result.id == 1
+    assert result.target_language is None
     assert result.name == "English to French"
     assert result.display_name == "English to French (en → fr)"
-    mock_session.exec.assert_called_once()
+    async_session.exec.assert_awaited_once()
     mock_query_result.first.assert_called_once()
 
 
@@ -337,24 +358,19 @@ def test_delete_own_dictionary_success():
     """Test deleting a dictionary that exists returns 204 status code."""
     mock_session = MagicMock()
     mock_user = User(id=1, email="test@example.com")
-
-    mock_dictionary = Dictionary(
-        id=1,
-        name="English to French",
-        display_name="English to French (en → fr)",
-        source_language_id=1,
-        target_language_id=2,
-        user_id=1,
-    )
-
-    mock_session.get.return_value = mock_dictionary
+    mock_session.exec.return_value.scalar_one_or_none.return_value = 1
 
     result = delete_own_dictionary(
         request, dictionary_id=1, current_user=mock_user, session=mock_session
     )
 
     assert result == {"message": "Dictionary %s deleted successfully!", 1: 1}
-    mock_session.delete.assert_called_once_with(mock_dictionary)
+    statement = mock_session.exec.call_args.args[0]
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert compiled.startswith("DELETE FROM dictionary WHERE")
+    assert "dictionary.user_id = " in compiled
+    mock_session.get.assert_not_called()
+    mock_session.delete.assert_not_called()
     mock_session.commit.assert_called_once()
 
 
@@ -362,6 +378,7 @@ def test_delete_dictionary_own_not_found():
     """Test that deleting a non-existent dictionary raises a 404 error."""
     mock_session = MagicMock()
     mock_user = User(id=1, email="test@example.com")
+    mock_session.exec.return_value.scalar_one_or_none.return_value = None
     mock_session.get.return_value = None
 
     with pytest.raises(HTTPException) as exc_info:
@@ -370,7 +387,40 @@ def test_delete_dictionary_own_not_found():
     assert exc_info.value.status_code == 404
     assert exc_info.value.detail == "Dictionary not found"
     mock_session.delete.assert_not_called()
-    mock_session.commit.assert_not_called()
+
+
+def test_delete_dictionary_own_forbidden():
+    """Test that deleting another user's dictionary raises a 403 error."""
+    mock_session = MagicMock()
+    mock_user = User(id=1, email="test@example.com")
+    mock_session.exec.return_value.scalar_one_or_none.return_value = None
+    mock_session.get.return_value = Dictionary(
+        id=1,
+        name="English to French",
+        source_language_id=1,
+        target_language_id=2,
+        user_id=2,
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        delete_own_dictionary(request, 1, mock_user, mock_session)
+
+    assert exc_info.value.status_code == 403
+    assert (
+        exc_info.value.detail
+        == "You are not authorized to delete this dictionary."
+    )
+
+
+def test_dictionary_children_cascade_in_database():
+    """Test that dictionary deletes cascade in the database, not the ORM."""
+    for table in (Entry.__table__, EntryTombstone.__table__):
+        ddl = str(CreateTable(table).compile(dialect=postgresql.dialect()))
+        assert (
+            "FOREIGN KEY(dictionary_id) REFERENCES dictionary (id) "
+            "ON DELETE CASCADE"
+        ) in ddl
+    assert Dictionary.entries.property.passive_deletes is True
 
 
 def test_admin_delete_dictionary_success():
@@ -461,3 +511,253 @@ def test_compute_display_name():
     )
 
     assert result.display_name == "English : French"
+
+
+def test_get_dictionary_by_id_not_modified(async_session):
+    """Test that a matching If-None-Match returns a 304."""
+    async_session.exec.return_value.first.return_value = Dictionary(
+        id=1, name="English to French", version=4
+    )
+    etag = make_etag("dictionary", 1, 4, "")
+    conditional_request = Request(
+        scope={**fake_scope, "headers": [(b"if-none-match", etag.encode())]}
+    )
+
+    response = asyncio.run(
+        get_dictionary_by_id(conditional_request, 1, async_session)
+    )
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_get_dictionary_by_id_etag_covers_include(async_session):
+    """Test that each set of included relationships has its own ETag."""
+    async_session.exec.return_value.first.return_value = Dictionary(
+        id=1,
+        name="English to French",
+        version=4,
+        source_language_id=1,
+        target_language_id=2,
+        source_language=Language(id=1, name="English", code="en"),
+        target_language=Language(id=2, name="French", code="fr"),
+    )
+    plain_etag = make_etag("dictionary", 1, 4, "")
+    conditional_request = Request(
+        scope={
+            **fake_scope,
+            "headers": [(b"if-none-match", plain_etag.encode())],
+        }
+    )
+    response = Response()
+
+    result = asyncio.run(
+        get_dictionary_by_id(
+            conditional_request,
+            1,
+            async_session,
+            response=response,
+            include=[
+                DictionaryInclude.TARGET_LANGUAGE,
+                DictionaryInclude.SOURCE_LANGUAGE,
+            ],
+        )
+    )
+
+    assert result.target_language.code == "fr"
+    assert response.headers["etag"] == make_etag(
+        "dictionary", 1, 4, "source_language,target_language"
+    )
+
+
+def test_bump_dictionary_version(sqlite_engine):
+    """Test that bump_dictionary_version increments the counter in SQL."""
+    with Session(sqlite_engine) as session:
+        session.add(
+            Dictionary(
+                id=1, name="Test", source_language_id=1, target_language_id=2
+            )
+        )
+        session.commit()
+
+        bump_dictionary_version(session, 1)
+        bump_dictionary_version(session, 1)
+        session.commit()
+
+        assert get_dictionary_version(session, 1) == 2
+        assert get_dictionary_version(session, 2) is None
+
+
+def test_background_dictionary_deletion(sqlite_engine):
+    """Test that a background deletion removes entries chunk by chunk."""
+    with Session(sqlite_engine) as session:
+        session.add(
+            Dictionary(
+                id=1,
+                name="English to French",
+                source_language_id=1,
+                target_language_id=2,
+                user_id=1,
+            )
+        )
+        session.add_all(
+            Entry(original_name=f"word{i}", translation="x", dictionary_id=1)
+            for i in range(5)
+        )
+        session.commit()
+
+        with patch.object(job_runner, "submit") as mock_submit:
+            assert start_dictionary_deletion(session, 1, 2) is None
+            job = start_dictionary_deletion(session, 1, 1)
+            assert start_dictionary_deletion(session, 1, 1) is None
+        marked = session.get(Dictionary, 1)
+        hidden, version = marked.is_deleting, marked.version
+        readable_version = get_dictionary_version(session, 1)
+
+    with patch("app.core.jobs.engine", sqlite_engine), patch.object(
+        settings, "DICTIONARY_DELETE_CHUNK_SIZE", 2
+    ), patch(
+        "app.services.deletion.delete", wraps=sqlmodel.delete
+    ) as mock_delete:
+        job_runner.run(job.id)
+
+    with Session(sqlite_engine) as session:
+        remaining = session.exec(select(Entry)).all()
+        dictionary = session.get(Dictionary, 1)
+        job = session.get(Job, job.id)
+
+    mock_submit.assert_called_once_with(job.id)
+    assert hidden is True
+    assert (version, readable_version) == (1, None)
+    assert (job.kind, job.status, job.total, job.progress) == (
+        "dictionary.delete",
+        "succeeded",
+        5,
+        5,
+    )
+    assert job.result == {"deleted_entries": 5}
+    assert mock_delete.call_count == 5
+    assert remaining == [] and dictionary is None
+
+
+def test_delete_own_dictionary_twice_in_background():
+    """Test that a dictionary already being deleted is answered with 409."""
+    mock_session = MagicMock()
+    mock_user = User(id=1, email="test@example.com")
+    mock_session.get.return_value = Dictionary(
+        id=1,
+        name="English to French",
+        source_language_id=1,
+        target_language_id=2,
+        user_id=1,
+        is_deleting=True,
+    )
+
+    with patch(
+        "app.routes.dictionary.start_dictionary_deletion", return_value=None
+    ), pytest.raises(HTTPException) as excinfo:
+        delete_own_dictionary(
+            request, 1, mock_user, session=mock_session, background=True
+        )
+
+    assert excinfo.value.status_code == 409
+
+
+def test_delete_own_dictionary_in_background():
+    """Test that a background delete returns 202 with the enqueued job."""
+    mock_session = MagicMock()
+    mock_user = User(id=1, email="test@example.com")
+    response = Response()
+    job = Job(
+        id=7,
+        kind="dictionary.delete",
+        payload={"dictionary_id": 1},
+        user_id=1,
+    )
+
+    with patch(
+        "app.routes.dictionary.start_dictionary_deletion", return_value=job
+    ) as mock_start:
+        result = delete_own_dictionary(
+            request,
+            1,
+            mock_user,
+            mock_session,
+            response=response,
+            background=True,
+        )
+
+    assert (result.id, result.status) == (7, JobStatus.PENDING)
+    assert response.status_code == 202
+    mock_start.assert_called_once_with(mock_session, 1, 1)
+
+
+def test_reindex_dictionary(sqlite_engine):
+    """Test that the reindex job rewrites derived columns in batches."""
+    with Session(sqlite_engine) as session:
+        session.add_all(
+            Entry(original_name=name, translation="Chat", dictionary_id=1)
+            for name in ["Élan", "Été", "Ours"]
+        )
+        session.add(Entry(original_name="x", translation="y", dictionary_id=2))
+        session.add(
+            Job(
+                id=1,
+                kind="dictionary.reindex",
+                payload={"dictionary_id": 1, "batch_size": 2},
+            )
+        )
+        session.commit()
+
+    with patch("app.core.jobs.engine", sqlite_engine):
+        job_runner.run(1)
+
+    with Session(sqlite_engine) as session:
+        entries = session.exec(select(Entry).order_by(Entry.id)).all()
+        job = session.get(Job, 1)
+
+    assert [e.normalized_name for e in entries] == [
+        "elan",
+        "ete",
+        "ours",
+        None,
+    ]
+    assert entries[0].display_name == "Élan (Chat)"
+    assert entries[0].normalized_translation == "chat"
+    assert (job.status, job.progress) == ("succeeded", 3)
+
+
+def test_get_dictionaries_joins_included_languages(
+    sqlite_engine, query_counter
+):
+    """Test that included languages are joined into the listing query."""
+    with Session(sqlite_engine) as session:
+        session.add(Language(id=1, name="English", code="en"))
+        session.add(Language(id=2, name="French", code="fr"))
+        session.add(Language(id=3, name="Spanish", code="es"))
+        for source, target in ((1, 2), (1, 3), (2, 3)):
+            session.add(
+                Dictionary(
+                    name=f"Test {source}-{target}",
+                    source_language_id=source,
+                    target_language_id=target,
+                )
+            )
+        session.commit()
+
+    with Session(sqlite_engine) as session:
+        query_counter.count = 0
+        result = get_dictionaries(
+            request,
+            session,
+            include=[
+                DictionaryInclude.SOURCE_LANGUAGE,
+                DictionaryInclude.TARGET_LANGUAGE,
+            ],
+        )
+
+    assert query_counter.count == 1
+    assert sorted(
+        (item.source_language.code, item.target_language.code)
+        for item in result
+    ) == [("en", "es"), ("en", "fr"), ("fr", "es")]
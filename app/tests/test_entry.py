@@ -1,25 +1,78 @@
+import asyncio
+import io
+import json
 from datetime import datetime
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
 from starlette.requests import Request
-
-from app.dto.entry import EntryCreate, EntryUpdate
+from starlette.responses import Response
+
+from app.config import settings
+from app.core.cursor import decode_cursor, encode_cursor
+from app.core.etag import make_etag
+from app.dto.entry import (
+    ConflictPolicy,
+    EntryBatchRequest,
+    EntryCreate,
+    EntryFileFormat,
+    EntryOperation,
+    EntryUpdate,
+    LookupMode,
+)
 from app.models.dictionary import Dictionary
 from app.models.entry import Entry
+from app.models.entryTombstone import EntryTombstone
 from app.models.user import User
 from app.routes.entry import (
     admin_delete_entry,
+    apply_dictionary_operations,
     create_entry,
     delete_own_entry,
+    export_dictionary_entries,
     get_entries,
     get_entries_by_dictionary_id,
     get_entry_by_id,
+    import_dictionary_entries,
+    search_entries_by_prefix,
     update_entry,
 )
-from app.services.entry import compute_display_name
+from app.services.annotate import (
+    AhoCorasick,
+    annotate_text,
+    automaton_cache,
+    fold_text,
+)
+from app.services.batch import apply_entry_operations
+from app.services.entry import (
+    bulk_import_entries,
+    compute_display_name,
+    compute_search_keys,
+    normalize_term,
+    patch_entry,
+    read_entry_rows,
+    record_deletion,
+    upsert_entry,
+)
+from app.services.export import EXPORT_FIELDS, stream_dictionary_entries
+from app.services.fuzzy import (
+    BKTree,
+    fuzzy_cache,
+    levenshtein,
+    search_fuzzy,
+)
+from app.services.search import (
+    lookup_words,
+    prefix_cache,
+    search_prefix,
+    search_translation,
+)
+from app.services.sync import get_entry_changes
 
 fake_scope = {
     "type": "http",
@@ -33,15 +86,21 @@ request = Request(scope=fake_scope)
 
 
 def test_get_entries():
-    """Test that get_entries returns all entries."""
+    """Test that get_entries returns the first page of entries."""
     mock_session = MagicMock()
 
     mock_entries = [
         Entry(
-            original_name="Entry 1", translation="entrée 1", dictionary_id=1
+            id=1,
+            original_name="Entry 1",
+            translation="entrée 1",
+            dictionary_id=1,
         ),
         Entry(
-            original_name="Entry 2", translation="entrée 2", dictionary_id=1
+            id=2,
+            original_name="Entry 2",
+            translation="entrée 2",
+            dictionary_id=1,
         ),
     ]
 
@@ -51,18 +110,69 @@ def test_get_entries():
 
     response = get_entries(request, mock_session)
 
-    assert response == mock_entries
-    assert len(response) == 2
-    assert response[0].original_name == "Entry 1"
-    assert response[1].original_name == "Entry 2"
+    assert len(response.items) == 2
+    assert response.items[0].original_name == "Entry 1"
+    assert response.items[1].original_name == "Entry 2"
+    assert response.next_cursor is None
     mock_session.exec.assert_called_once()
     mock_query_result.all.assert_called_once()
 
 
-def test_get_entry_by_id():
-    """Test that get_entry_by_id returns the correct entry when a valid ID is provided."""
+def test_get_entries_next_cursor():
+    """Test that get_entries returns a cursor when more entries exist."""
+    mock_session = MagicMock()
+
+    mock_entries = [
+        Entry(
+            id=entry_id,
+            original_name=f"Entry {entry_id}",
+            translation=f"entrée {entry_id}",
+            dictionary_id=3,
+        )
+        for entry_id in (4, 5, 6)
+    ]
+
+    mock_query_result = MagicMock()
+    mock_query_result.all.return_value = mock_entries
+    mock_session.exec.return_value = mock_query_result
+
+    response = get_entries(request, mock_session, limit=2)
+
+    assert [item.id for item in response.items] == [4, 5]
+    assert decode_cursor(response.next_cursor, int, int) == [3, 5]
+
+
+def test_get_entries_with_cursor():
+    """Test that get_entries seeks past the cursor instead of offsetting."""
     mock_session = MagicMock()
+    mock_session.exec.return_value.all.return_value = []
 
+    response = get_entries(
+        request, mock_session, cursor=encode_cursor(3, 5), limit=2
+    )
+
+    statement = mock_session.exec.call_args.args[0]
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert "(entry.dictionary_id, entry.id) >" in compiled
+    assert "OFFSET" not in compiled
+    assert response.items == []
+    assert response.next_cursor is None
+
+
+def test_get_entries_invalid_cursor():
+    """Test that get_entries rejects a malformed cursor."""
+    mock_session = MagicMock()
+
+    with pytest.raises(HTTPException) as excinfo:
+        get_entries(request, mock_session, cursor="not-a-cursor")
+
+    assert excinfo.value.status_code == 400
+    assert excinfo.value.detail == "Invalid cursor"
+    mock_session.exec.assert_not_called()
+
+
+def test_get_entry_by_id(async_session):
+    """Test that get_entry_by_id returns the correct entry when a valid ID is provided."""
     mock_entry = Entry(
         id=1,
         original_name="Test Entry",
@@ -72,28 +182,30 @@ def test_get_entry_by_id():
 
     mock_query_result = MagicMock()
     mock_query_result.first.return_value = mock_entry
-    mock_session.exec.return_value = mock_query_result
+    async_session.exec.return_value = mock_query_result
 
-    response = get_entry_by_id(request, entry_id=1, session=mock_session)
+    response = asyncio.run(
+        get_entry_by_id(request, entry_id=1, session=async_session)
+    )
 
     assert response == mock_entry
     assert response.id == 1
     assert response.original_name == "Test Entry"
-    mock_session.exec.assert_called_once()
+    async_session.exec.assert_awaited_once()
     mock_query_result.first.assert_called_once()
 
 
-def test_get_entries_by_dictionary_id():
-    """Test that get_entries_by_dictionary_id returns all entries for a valid dictionary ID."""
-    mock_session = MagicMock()
-
+def test_get_entries_by_dictionary_id(async_session):
+    """Test that get_entries_by_dictionary_id returns entries for a valid dictionary ID."""
     mock_entries = [
         Entry(
+            id=1,
             original_name="Dictionary Entry 1",
             translation="entrée dictionnaire 1",
             dictionary_id=1,
         ),
         Entry(
+            id=2,
             original_name="Dictionary Entry 2",
             translation="entrée dictionnaire 2",
             dictionary_id=1,
@@ -102,22 +214,205 @@ def test_get_entries_by_dictionary_id():
 
     mock_query_result = MagicMock()
     mock_query_result.all.return_value = mock_entries
-    mock_session.exec.return_value = mock_query_result
+    async_session.exec.return_value = mock_query_result
+    mock_response = Response()
 
-    response = get_entries_by_dictionary_id(
-        request, dictionary_id=1, session=mock_session
-    )
+    with patch(
+        "app.routes.entry.get_dictionary_version_async", return_value=3
+    ):
+        response = asyncio.run(
+            get_entries_by_dictionary_id(
+                request,
+                dictionary_id=1,
+                session=async_session,
+                response=mock_response,
+            )
+        )
 
-    assert response == mock_entries
-    assert len(response) == 2
-    assert response[0].original_name == "Dictionary Entry 1"
-    assert response[1].original_name == "Dictionary Entry 2"
-    assert response[0].dictionary_id == 1
-    assert response[1].dictionary_id == 1
-    mock_session.exec.assert_called_once()
+    assert mock_response.headers["etag"] == make_etag(
+        "entries", 1, 3, None, 100
+    )
+    assert len(response.items) == 2
+    assert response.items[0].original_name == "Dictionary Entry 1"
+    assert response.items[1].original_name == "Dictionary Entry 2"
+    assert response.items[0].dictionary_id == 1
+    assert response.items[1].dictionary_id == 1
+    assert response.next_cursor is None
+    async_session.exec.assert_awaited_once()
     mock_query_result.all.assert_called_once()
 
 
+def test_get_entries_by_dictionary_id_foreign_cursor(async_session):
+    """Test that a cursor from another dictionary is rejected."""
+    with pytest.raises(HTTPException) as excinfo, patch(
+        "app.routes.entry.get_dictionary_version_async", return_value=3
+    ):
+        asyncio.run(
+            get_entries_by_dictionary_id(
+                request,
+                dictionary_id=1,
+                session=async_session,
+                cursor=encode_cursor(2, 10),
+            )
+        )
+
+    assert excinfo.value.status_code == 400
+    async_session.exec.assert_not_awaited()
+
+
+def test_get_entries_by_dictionary_id_not_modified(async_session):
+    """Test that a matching If-None-Match skips the entries query."""
+    etag = make_etag("entries", 1, 3, None, 100)
+    conditional_request = Request(
+        scope={
+            **fake_scope,
+            "headers": [(b"if-none-match", f"W/{etag}".encode())],
+        }
+    )
+
+    with patch(
+        "app.routes.entry.get_dictionary_version_async", return_value=3
+    ):
+        response = asyncio.run(
+            get_entries_by_dictionary_id(
+                conditional_request, dictionary_id=1, session=async_session
+            )
+        )
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    async_session.exec.assert_not_awaited()
+
+
+def test_get_entries_by_dictionary_id_not_found(async_session):
+    """Test that listing entries of a missing dictionary raises a 404."""
+    with pytest.raises(HTTPException) as excinfo, patch(
+        "app.routes.entry.get_dictionary_version_async", return_value=None
+    ):
+        asyncio.run(get_entries_by_dictionary_id(request, 999, async_session))
+
+    assert excinfo.value.status_code == 404
+
+
+def test_search_entries_by_prefix():
+    """Test that the prefix search route delegates to search_prefix."""
+    mock_session = MagicMock()
+    with patch(
+        "app.routes.entry.search_prefix", return_value=["chat"]
+    ) as mock_search:
+        response = search_entries_by_prefix(request, 1, "ch", mock_session)
+
+    assert response == ["chat"]
+    mock_search.assert_called_once_with(mock_session, 1, "ch", 10)
+
+
+def test_search_entries_by_prefix_deleting_dictionary():
+    """Test that searching a missing or deleting dictionary raises a 404."""
+    mock_session = MagicMock()
+    mock_session.exec.return_value.first.return_value = None
+
+    with pytest.raises(HTTPException) as excinfo, patch(
+        "app.routes.entry.search_prefix"
+    ) as mock_search:
+        search_entries_by_prefix(request, 1, "ch", mock_session)
+
+    assert excinfo.value.status_code == 404
+    mock_search.assert_not_called()
+
+
+def test_search_prefix_statement():
+    """Test that prefix search binds one pattern and sorts in "C" order."""
+    mock_session = MagicMock()
+
+    with patch.object(settings, "ENTRY_SEARCH_CACHE", False):
+        search_prefix(mock_session, 1, "50%_o/", 10)
+
+    statement = mock_session.exec.call_args.args[0]
+    compiled = statement.compile(dialect=postgresql.dialect())
+    assert (
+        "(entry.normalized_name COLLATE \"C\") LIKE %(param_1)s ESCAPE '/'"
+        in str(compiled)
+    )
+    assert 'ORDER BY entry.normalized_name COLLATE "C"' in str(compiled)
+    assert compiled.params["param_1"] == "50/%/_o//%"
+
+
+def test_export_dictionary_entries():
+    """Test that export_dictionary_entries streams the requested format."""
+    mock_session = MagicMock()
+    mock_session.exec.return_value.first.return_value = 1
+
+    with patch(
+        "app.routes.entry.stream_dictionary_entries",
+        return_value=iter(["id,original_name\n"]),
+    ) as mock_stream:
+        response = export_dictionary_entries(
+            request, 1, mock_session, export_format=EntryFileFormat.CSV
+        )
+
+    assert isinstance(response, StreamingResponse)
+    assert response.media_type == "text/csv"
+    assert (
+        response.headers["content-disposition"]
+        == 'attachment; filename="dictionary-1.csv"'
+    )
+    mock_stream.assert_called_once_with(1, EntryFileFormat.CSV)
+
+
+def test_export_dictionary_entries_not_found():
+    """Test that exporting a missing dictionary raises a 404."""
+    mock_session = MagicMock()
+    mock_session.exec.return_value.first.return_value = None
+
+    with pytest.raises(HTTPException) as excinfo:
+        export_dictionary_entries(request, 999, mock_session)
+
+    assert excinfo.value.status_code == 404
+    assert excinfo.value.detail == "Dictionary not found"
+
+
+def test_stream_dictionary_entries(sqlite_engine):
+    """Test that the export yields one chunk per batch of rows."""
+    with Session(sqlite_engine) as session:
+        session.add_all(
+            Entry(
+                original_name=f"word {i}",
+                translation=f"mot {i}",
+                dictionary_id=1,
+            )
+            for i in range(5)
+        )
+        session.add(
+            Entry(original_name="other", translation="x", dictionary_id=2)
+        )
+        session.commit()
+
+    with patch("app.services.export.engine", sqlite_engine):
+        ndjson = list(
+            stream_dictionary_entries(1, EntryFileFormat.NDJSON, batch_size=2)
+        )
+        csv_chunks = list(
+            stream_dictionary_entries(1, EntryFileFormat.CSV, batch_size=2)
+        )
+
+    assert len(ndjson) == 3
+    lines = "".join(ndjson).splitlines()
+    assert [json.loads(line)["original_name"] for line in lines] == [
+        f"word {i}" for i in range(5)
+    ]
+    rows = "".join(csv_chunks).splitlines()
+    assert rows[0].startswith("id,original_name,translation")
+    assert len(rows) == 6
+
+
+def test_stream_dictionary_entries_empty_csv(sqlite_engine):
+    """Test that an empty CSV export still carries its header."""
+    with patch("app.services.export.engine", sqlite_engine):
+        chunks = list(stream_dictionary_entries(1, EntryFileFormat.CSV))
+
+    assert chunks == [",".join(EXPORT_FIELDS) + "\r\n"]
+
+
 def test_create_entry():
     """Test that create_entry properly creates and returns a new entry."""
     mock_session = MagicMock()
@@ -181,6 +476,27 @@ def test_create_entry_dictionary_not_found():
     mock_session.refresh.assert_not_called()
 
 
+@pytest.mark.parametrize("on_conflict", list(ConflictPolicy))
+def test_create_entry_in_deleting_dictionary(on_conflict):
+    """Test that entries cannot be written to a dictionary being deleted."""
+    mock_session = MagicMock()
+    mock_session.get.return_value.is_deleting = True
+    mock_session.exec.return_value.first.return_value = True
+
+    entry_data = EntryCreate(
+        original_name="Bonjour", translation="Hello", dictionary_id=1
+    )
+
+    with pytest.raises(HTTPException) as excinfo:
+        create_entry(
+            request, entry_data, mock_session, on_conflict=on_conflict
+        )
+
+    assert excinfo.value.status_code == 409
+    assert excinfo.value.detail == "This dictionary is being deleted."
+    mock_session.commit.assert_not_called()
+
+
 def test_create_entry_integrity_error():
     """Test creating an entry that violates the unique constraint."""
     mock_session = MagicMock()
@@ -189,6 +505,7 @@ def test_create_entry_integrity_error():
         original_name="Bonjour", translation="Hello", dictionary_id=1
     )
 
+    mock_session.get.return_value.is_deleting = False
     mock_session.commit.side_effect = IntegrityError(
         "statement", "params", "orig"
     )
@@ -219,41 +536,30 @@ def test_delete_own_entry_success():
     mock_user = User(id=1, email="test@example.com")
 
     entry_id = 1
-    mock_entry = Entry(
-        id=entry_id,
-        original_name="Test Entry",
-        translation="Entrée de test",
-        dictionary_id=1,
-    )
-
-    # mock_session.get.return_value = mock_entry
-
-    mock_dictionary = Dictionary(
-        id=1,
-        user_id=1,
-        source_lang="en",
-        target_lang="fr",
-        name="Test Dictionary",
-    )
-
-    mock_session.get.side_effect = [mock_entry, mock_dictionary]
+    deleted = MagicMock(id=entry_id, dictionary_id=3)
+    mock_session.exec.return_value.one_or_none.return_value = deleted
 
-    response = delete_own_entry(
-        request, entry_id, mock_user, session=mock_session
-    )
+    with patch("app.routes.entry.bump_dictionary_version") as mock_bump:
+        response = delete_own_entry(
+            request, entry_id, mock_user, session=mock_session
+        )
 
     assert response == {
         "message": "Entry %s deleted successfully!",
         entry_id: entry_id,
     }
 
-    mock_session.get.assert_has_calls(
-        [
-            call(Entry, entry_id),
-            call(Dictionary, mock_entry.dictionary_id),
-        ]
-    )
-    mock_session.delete.assert_called_once_with(mock_entry)
+    statement = mock_session.exec.call_args.args[0]
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert compiled.startswith("DELETE FROM entry USING dictionary WHERE")
+    assert "dictionary.user_id = " in compiled
+    assert compiled.endswith("RETURNING entry.id, entry.dictionary_id")
+
+    mock_session.get.assert_not_called()
+    mock_session.delete.assert_not_called()
+    tombstone = mock_session.add.call_args.args[0]
+    assert (tombstone.entry_id, tombstone.dictionary_id) == (1, 3)
+    mock_bump.assert_called_once_with(mock_session, 3)
     mock_session.commit.assert_called_once()
     mock_session.rollback.assert_not_called()
 
@@ -264,6 +570,7 @@ def test_delete_own_entry_not_found():
     mock_user = User(id=1, email="test@example.com")
 
     entry_id = 999
+    mock_session.exec.return_value.one_or_none.return_value = None
     mock_session.get.return_value = None
 
     with pytest.raises(HTTPException) as excinfo:
@@ -272,11 +579,28 @@ def test_delete_own_entry_not_found():
     assert excinfo.value.status_code == 404
     assert excinfo.value.detail == "Entry not found"
     mock_session.get.assert_called_once_with(Entry, entry_id)
-    mock_session.delete.assert_not_called()
     mock_session.commit.assert_not_called()
     mock_session.rollback.assert_not_called()
 
 
+def test_delete_own_entry_forbidden():
+    """Test that deleting an entry of another user's dictionary raises a 403."""
+    mock_session = MagicMock()
+    mock_user = User(id=1, email="test@example.com")
+
+    mock_session.exec.return_value.one_or_none.return_value = None
+    mock_session.exec.return_value.first.return_value = False
+    mock_session.get.return_value = Entry(
+        id=1, original_name="chat", translation="cat", dictionary_id=2
+    )
+
+    with pytest.raises(HTTPException) as excinfo:
+        delete_own_entry(request, 1, mock_user, session=mock_session)
+
+    assert excinfo.value.status_code == 403
+    mock_session.commit.assert_not_called()
+
+
 def test_admin_delete_entry():
     """Test that admin_delete_entry successfully deletes an entry."""
     mock_session = MagicMock()
@@ -348,34 +672,22 @@ def test_admin_delete_entry_with_non_superuser():
 
 
 def test_update_own_entry_success():
-    """Test that update_entry successfully updates an entry with valid input."""
+    """Test that update_entry patches an entry in a single statement."""
     mock_session = MagicMock()
 
     entry_id = 1
     mock_entry = Entry(
         id=entry_id,
-        original_name="Original Entry",
+        original_name="Updated Entry",
         translation="Translation originale",
         dictionary_id=1,
+        display_name="Updated Entry (Translation originale)",
     )
-
-    mock_session.get.return_value = mock_entry
+    mock_session.exec.return_value.scalar_one_or_none.return_value = mock_entry
 
     entry_update = EntryUpdate(original_name="Updated Entry")
 
-    with patch(
-        "app.routes.entry.compute_display_name",
-        return_value=Entry(
-            id=entry_id,
-            original_name="Updated Entry",
-            translation="Translation originale",
-            dictionary_id=1,
-            display_name="Updated Entry (→ Translation originale)",
-        ),
-    ), patch("app.routes.entry.datetime") as mock_datetime:
-        mock_now = datetime.now()
-        mock_datetime.now.return_value = mock_now
-
+    with patch("app.routes.entry.bump_dictionary_version") as mock_bump:
         response = update_entry(
             request,
             entry_id=entry_id,
@@ -383,11 +695,17 @@ def test_update_own_entry_success():
             session=mock_session,
         )
 
-        assert response.id == entry_id
-        assert response.original_name == "Updated Entry"
-        assert response.translation == "Translation originale"
-        assert response.dictionary_id == 1
-        assert response.updated_at == mock_now
+    assert response is mock_entry
+    mock_session.get.assert_not_called()
+    mock_session.refresh.assert_not_called()
+    mock_bump.assert_called_once_with(mock_session, 1)
+    mock_session.commit.assert_called_once()
+
+    statement = mock_session.exec.call_args.args[0]
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert compiled.startswith("UPDATE entry SET original_name=")
+    assert "|| entry.translation ||" in compiled
+    assert "RETURNING entry.id" in compiled
 
 
 def test_update_own_entry_not_found():
@@ -395,6 +713,7 @@ def test_update_own_entry_not_found():
     mock_session = MagicMock()
 
     entry_id = 999
+    mock_session.exec.return_value.scalar_one_or_none.return_value = None
     mock_session.get.return_value = None
 
     entry_update = EntryUpdate(original_name="Updated Entry")
@@ -409,55 +728,103 @@ def test_update_own_entry_not_found():
 
     assert excinfo.value.status_code == 404
     assert excinfo.value.detail == "Entry not found"
-    mock_session.get.assert_called_once_with(Entry, entry_id)
-    mock_session.add.assert_not_called()
+    mock_session.exec.assert_called_once()
     mock_session.commit.assert_not_called()
-    mock_session.refresh.assert_not_called()
 
 
 def test_update_entry_own_integrity_error():
     """Test that update_entry raises a 400 HTTPException when there's a duplicate entry."""
     mock_session = MagicMock()
-
-    entry_id = 1
-    mock_entry = Entry(
-        id=entry_id,
-        original_name="Original Entry",
-        translation="Translation originale",
-        dictionary_id=1,
-    )
-
-    mock_session.get.return_value = mock_entry
-    mock_session.commit.side_effect = IntegrityError(
+    mock_session.exec.side_effect = IntegrityError(
         "statement", "params", "orig"
     )
 
     entry_update = EntryUpdate(original_name="Duplicate Entry")
 
-    with patch(
-        "app.routes.entry.compute_display_name",
-        return_value=mock_entry,
-    ), patch("app.routes.entry.datetime") as mock_datetime:
-        mock_datetime.now.return_value = datetime.now()
+    with pytest.raises(HTTPException) as exc_info:
+        update_entry(
+            request,
+            entry_id=1,
+            entry_update=entry_update,
+            session=mock_session,
+        )
 
-        with pytest.raises(HTTPException) as exc_info:
-            update_entry(
-                request,
-                entry_id=entry_id,
-                entry_update=entry_update,
-                session=mock_session,
-            )
+    assert exc_info.value.status_code == 400
+    assert (
+        exc_info.value.detail
+        == "An entry with this name already exists in this dictionary."
+    )
+    mock_session.rollback.assert_called_once()
+    mock_session.commit.assert_not_called()
 
-        assert exc_info.value.status_code == 400
-        assert (
-            exc_info.value.detail
-            == "An entry with this name already exists in this dictionary."
+
+@pytest.mark.parametrize("field", ["original_name", "translation"])
+def test_update_entry_rejects_null_names(field):
+    """Test that update_entry refuses to null out a required field."""
+    mock_session = MagicMock()
+
+    with pytest.raises(HTTPException) as exc_info:
+        update_entry(
+            request,
+            entry_id=1,
+            entry_update=EntryUpdate(**{field: None}),
+            session=mock_session,
         )
-        mock_session.get.assert_called_once_with(Entry, entry_id)
-        mock_session.add.assert_called_once_with(mock_entry)
-        mock_session.rollback.assert_called_once()
-        mock_session.commit.assert_called_once()
-        mock_session.refresh.assert_not_called()
+
+    assert exc_info.value.status_code == 400
+    assert (
+        exc_info.value.detail
+        == "original_name and translation cannot be null."
+    )
+    mock_session.exec.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "values, display_name",
+    [
+        ({"original_name": "chaton"}, "chaton (cat)"),
+        ({"translation": "kitty"}, "chat (kitty)"),
+        ({"description": "Un félin"}, "stale"),
+    ],
+)
+def test_patch_entry(sqlite_engine, values, display_name):
+    """Test that patch_entry computes the display name in the database."""
+    with Session(sqlite_engine) as session:
+        session.add(
+            Dictionary(
+                id=1, name="fr-en", source_language_id=1, target_language_id=2
+            )
+        )
+        session.add(
+            Dictionary(
+                id=2,
+                name="en-fr",
+                source_language_id=2,
+                target_language_id=1,
+                is_deleting=True,
+            )
+        )
+        for entry_id, dictionary_id in ((1, 1), (3, 2)):
+            session.add(
+                Entry(
+                    id=entry_id,
+                    original_name="chat",
+                    translation="cat",
+                    display_name="stale",
+                    dictionary_id=dictionary_id,
+                )
+            )
+        session.commit()
+
+        db_entry = patch_entry(session, 1, values)
+        session.expunge(db_entry)
+        session.commit()
+        missing = patch_entry(session, 2, values)
+        deleting = patch_entry(session, 3, values)
+
+    assert db_entry.display_name == display_name
+    assert missing is None
+    assert deleting is None
 
 
 def test_compute_display_name():
@@ -469,3 +836,670 @@ def test_compute_display_name():
     )
     result = compute_display_name(entry)
     assert result.display_name == "Original Entry (Translation originale)"
+
+
+def test_import_dictionary_entries_forbidden():
+    """Test that importing into another user's dictionary raises a 403."""
+    mock_session = MagicMock()
+    mock_user = User(id=1, email="test@example.com")
+    mock_session.get.return_value = Dictionary(id=1, user_id=2, name="Other")
+
+    with pytest.raises(HTTPException) as excinfo:
+        import_dictionary_entries(
+            request, 1, MagicMock(), mock_user, mock_session
+        )
+
+    assert excinfo.value.status_code == 403
+    mock_session.exec.assert_not_called()
+
+
+def test_bulk_import_entries_csv(sqlite_engine):
+    """Test that a CSV import inserts in batches and reports bad rows."""
+    upload = io.BytesIO(
+        "original_name,translation,is_expression\n"
+        "chat,cat,false\n"
+        "chien,dog,\n"
+        "chat,cat again,false\n"
+        "oiseau,,false\n"
+        "bonne nuit,good night,true\n".encode("utf-8")
+    )
+
+    with Session(sqlite_engine) as session:
+        session.add(
+            Entry(original_name="chien", translation="dog", dictionary_id=1)
+        )
+        session.commit()
+
+        result = bulk_import_entries(
+            session,
+            1,
+            read_entry_rows(upload, EntryFileFormat.CSV),
+            batch_size=2,
+        )
+        entries = session.exec(
+            select(Entry).where(Entry.dictionary_id == 1).order_by(Entry.id)
+        ).all()
+
+    assert result.created == 2
+    assert [(c.line, c.original_name) for c in result.conflicts] == [
+        (3, "chien"),
+        (4, "chat"),
+    ]
+    assert [e.line for e in result.errors] == [5]
+    assert result.errors[0].detail.startswith("translation")
+    assert [e.display_name for e in entries[1:]] == [
+        "chat (cat)",
+        "bonne nuit (good night)",
+    ]
+    assert entries[-1].is_expression is True
+
+
+def test_bulk_import_entries_ndjson(sqlite_engine):
+    """Test that an NDJSON import skips blank lines and reports bad JSON."""
+    upload = io.BytesIO(
+        b'{"original_name": "pomme", "translation": "apple"}\n'
+        b"\n"
+        b"{not json}\n"
+    )
+
+    with Session(sqlite_engine) as session:
+        result = bulk_import_entries(
+            session, 1, read_entry_rows(upload, EntryFileFormat.NDJSON)
+        )
+
+    assert result.created == 1
+    assert result.conflicts == []
+    assert [e.line for e in result.errors] == [3]
+
+
+def test_bulk_import_entries_update_policy(sqlite_engine):
+    """Test that an import with the update policy overwrites existing rows."""
+    upload = io.BytesIO(
+        b'{"original_name": "chat", "translation": "kitty"}\n'
+        b'{"original_name": "chien", "translation": "dog"}\n'
+    )
+
+    with Session(sqlite_engine) as session:
+        session.add(
+            Entry(original_name="chat", translation="cat", dictionary_id=1)
+        )
+        session.commit()
+
+        result = bulk_import_entries(
+            session,
+            1,
+            read_entry_rows(upload, EntryFileFormat.NDJSON),
+            ConflictPolicy.UPDATE,
+        )
+        chat = session.exec(
+            select(Entry).where(Entry.original_name == "chat")
+        ).one()
+
+    assert (result.created, result.updated, result.conflicts) == (1, 1, [])
+    assert chat.translation == "kitty"
+    assert chat.display_name == "chat (kitty)"
+
+
+@pytest.mark.parametrize(
+    "policy, translation, created",
+    [
+        (ConflictPolicy.UPDATE, "kitty", False),
+        (ConflictPolicy.IGNORE, "cat", False),
+    ],
+)
+def test_upsert_entry_existing(sqlite_engine, policy, translation, created):
+    """Test that upsert_entry updates or keeps a colliding entry."""
+    with Session(sqlite_engine) as session:
+        session.add(
+            Entry(original_name="chat", translation="cat", dictionary_id=1)
+        )
+        session.commit()
+
+        db_entry, was_created = upsert_entry(
+            session,
+            EntryCreate(
+                original_name="chat", translation="kitty", dictionary_id=1
+            ),
+            policy,
+        )
+
+    assert db_entry.translation == translation
+    assert was_created is created
+
+
+def test_upsert_entry_new(sqlite_engine):
+    """Test that upsert_entry inserts a new entry in one statement."""
+    with Session(sqlite_engine) as session:
+        db_entry, created = upsert_entry(
+            session,
+            EntryCreate(
+                original_name="chat", translation="cat", dictionary_id=1
+            ),
+            ConflictPolicy.UPDATE,
+        )
+
+    assert created is True
+    assert db_entry.id is not None
+    assert db_entry.display_name == "chat (cat)"
+
+
+def test_create_entry_upsert_dictionary_not_found():
+    """Test that an upsert into a missing dictionary raises a 404."""
+    mock_session = MagicMock()
+
+    entry_data = EntryCreate(
+        original_name="Bonjour", translation="Hello", dictionary_id=999
+    )
+    mock_session.exec.return_value.first.return_value = None
+    orig = MagicMock()
+    orig.diag.constraint_name = "entry_dictionary_id_fkey"
+
+    with patch(
+        "app.routes.entry.upsert_entry",
+        side_effect=IntegrityError("statement", "params", orig),
+    ):
+        with pytest.raises(HTTPException) as excinfo:
+            create_entry(
+                request,
+                entry_data,
+                mock_session,
+                on_conflict=ConflictPolicy.UPDATE,
+            )
+
+    assert excinfo.value.status_code == 404
+    mock_session.rollback.assert_called_once()
+    mock_session.get.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "constraint, sqlstate, status_code",
+    [("entry_pkey", "23505", 409), (None, "23502", 400)],
+)
+def test_create_entry_upsert_integrity_error(
+    constraint, sqlstate, status_code
+):
+    """Test that other integrity errors are not reported as a 404."""
+    mock_session = MagicMock()
+    mock_session.exec.return_value.first.return_value = False
+    orig = MagicMock(sqlstate=sqlstate)
+    orig.diag.constraint_name = constraint
+
+    entry_data = EntryCreate(
+        original_name="Bonjour", translation="Hello", dictionary_id=1
+    )
+    with patch(
+        "app.routes.entry.upsert_entry",
+        side_effect=IntegrityError("statement", "params", orig),
+    ):
+        with pytest.raises(HTTPException) as excinfo:
+            create_entry(
+                request,
+                entry_data,
+                mock_session,
+                on_conflict=ConflictPolicy.UPDATE,
+            )
+
+    assert excinfo.value.status_code == status_code
+    mock_session.rollback.assert_called_once()
+
+
+def test_normalize_term():
+    """Test that normalize_term folds case, accents and whitespace."""
+    assert normalize_term("  Éléphant   Rose ") == "elephant rose"
+    assert normalize_term("Straße") == "strasse"
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_search_prefix(sqlite_engine, use_cache):
+    """Test that search_prefix matches normalized prefixes in one dictionary."""
+    names = ["École", "ecureuil", "écrire", "eau", "%ecole"]
+    with Session(sqlite_engine) as session:
+        for dictionary_id in (1, 2):
+            session.add_all(
+                compute_search_keys(
+                    Entry(
+                        original_name=name,
+                        translation="x",
+                        dictionary_id=dictionary_id,
+                    )
+                )
+                for name in names
+            )
+        session.commit()
+
+        with patch.object(settings, "ENTRY_SEARCH_CACHE", use_cache):
+            prefix_cache.clear()
+            results = search_prefix(session, 1, "EC", limit=2)
+            escaped = search_prefix(session, 1, "%", limit=10)
+            prefix_cache.clear()
+
+    assert [r.original_name for r in results] == ["École", "écrire"]
+    assert [r.original_name for r in escaped] == ["%ecole"]
+
+
+def test_levenshtein():
+    """Test that levenshtein returns the edit distance."""
+    assert levenshtein("kitten", "sitting") == 3
+    assert levenshtein("", "abc") == 3
+    assert levenshtein("maison", "maison") == 0
+
+
+def test_bk_tree_search():
+    """Test that BKTree returns every term within the distance bound."""
+    tree = BKTree()
+    for term in ["maison", "raison", "saison", "poisson", "poison", "maison"]:
+        tree.add(term, term)
+
+    matches = sorted(tree.search("maisson", 1))
+
+    assert matches == [(1, "maison"), (1, "maison")]
+    assert sorted(p for _, p in tree.search("poisn", 2)) == [
+        "poison",
+        "poisson",
+    ]
+
+
+def test_search_fuzzy_bk_tree(sqlite_engine):
+    """Test that search_fuzzy ranks misspellings by edit distance."""
+    with Session(sqlite_engine) as session:
+        session.add_all(
+            compute_search_keys(
+                Entry(original_name=name, translation="x", dictionary_id=1)
+            )
+            for name in ["Bibliothèque", "Biblique", "Boutique"]
+        )
+        session.commit()
+
+        with patch.object(settings, "ENTRY_FUZZY_BACKEND", "bktree"):
+            fuzzy_cache.clear()
+            matches = search_fuzzy(
+                session,
+                1,
+                "bibliotheqe",
+                limit=5,
+                max_distance=2,
+                min_similarity=0.3,
+            )
+            fuzzy_cache.clear()
+
+    assert [(m.original_name, m.distance) for m in matches] == [
+        ("Bibliothèque", 1)
+    ]
+
+
+def test_search_fuzzy_trigram_statement():
+    """Test that the trigram backend filters with the pg_trgm operator."""
+    mock_session = MagicMock()
+    mock_session.exec.return_value = []
+
+    with patch.object(settings, "ENTRY_FUZZY_BACKEND", "trigram"):
+        search_fuzzy(mock_session, 1, "Maisn", 5, 2, 0.4)
+
+    statement = mock_session.exec.call_args.args[0]
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert "entry.normalized_name %% %(normalized_name_1)s" in compiled
+    assert "similarity(entry.normalized_name" in compiled
+
+
+@pytest.mark.parametrize(
+    "mode, term, expected",
+    [
+        (LookupMode.EXACT, "Chat", ["cat"]),
+        (LookupMode.EXACT, "cha", []),
+        (LookupMode.PREFIX, "CHÂ", ["cat", "castle"]),
+    ],
+)
+def test_search_translation(sqlite_engine, mode, term, expected):
+    """Test that search_translation matches normalized translations."""
+    with Session(sqlite_engine) as session:
+        session.add_all(
+            compute_search_keys(
+                Entry(
+                    original_name=name,
+                    translation=translation,
+                    dictionary_id=1,
+                )
+            )
+            for name, translation in [
+                ("cat", "chat"),
+                ("castle", "Château"),
+                ("dog", "chien"),
+            ]
+        )
+        session.commit()
+
+        results = search_translation(session, 1, term, mode, limit=10)
+
+    assert [r.original_name for r in results] == expected
+
+
+def test_get_entry_changes(sqlite_engine):
+    """Test that delta sync pages through updates and deletions."""
+    with Session(sqlite_engine) as session, patch.object(
+        settings, "SYNC_SAFETY_SECONDS", 0
+    ):
+        session.add(
+            Dictionary(
+                id=1, name="Test", source_language_id=1, target_language_id=2
+            )
+        )
+        entries = [
+            Entry(
+                original_name=f"word {i}",
+                translation="x",
+                dictionary_id=1,
+                updated_at=datetime(2026, 1, 1, 12, i),
+            )
+            for i in range(3)
+        ]
+        session.add_all(entries)
+        session.commit()
+
+        record_deletion(
+            session,
+            Entry(
+                id=99, dictionary_id=1, original_name="old", translation="x"
+            ),
+        )
+        session.commit()
+
+        first = get_entry_changes(session, 1, None, limit=2)
+        second = get_entry_changes(session, 1, first.next_cursor, limit=2)
+
+        entries[0].translation = "y"
+        entries[0].updated_at = datetime(2026, 1, 2)
+        session.delete(entries[1])
+        record_deletion(session, entries[1])
+        session.commit()
+
+        third = get_entry_changes(session, 1, second.next_cursor, limit=2)
+
+    assert [e.original_name for e in first.items] == ["word 0", "word 1"]
+    assert first.deleted == []
+    assert first.has_more is True
+    assert [e.original_name for e in second.items] == ["word 2"]
+    assert second.has_more is False
+    assert [e.translation for e in third.items] == ["y"]
+    assert third.deleted == [entries[1].id]
+
+
+def test_get_entry_changes_withholds_recent_rows(sqlite_engine):
+    """Test that delta sync leaves recent rows for a later page."""
+    with Session(sqlite_engine) as session:
+        session.add(
+            Dictionary(
+                id=1, name="Test", source_language_id=1, target_language_id=2
+            )
+        )
+        settled = Entry(
+            original_name="settled",
+            translation="x",
+            dictionary_id=1,
+            updated_at=datetime(2026, 1, 1),
+        )
+        recent = Entry(
+            original_name="recent", translation="x", dictionary_id=1
+        )
+        session.add_all([settled, recent])
+        session.commit()
+
+        first = get_entry_changes(session, 1, None, limit=10)
+        record_deletion(session, settled)
+        session.delete(settled)
+        session.commit()
+        second = get_entry_changes(session, 1, first.next_cursor, limit=10)
+
+        with patch.object(settings, "SYNC_SAFETY_SECONDS", 0):
+            third = get_entry_changes(session, 1, first.next_cursor, limit=10)
+
+    assert [e.original_name for e in first.items] == ["settled"]
+    assert second.items == [] and second.deleted == []
+    assert [e.original_name for e in third.items] == ["recent"]
+    assert third.deleted == [settled.id]
+
+
+def test_get_entry_changes_of_gone_dictionary(sqlite_engine):
+    """Test that delta sync reports missing and deleting dictionaries."""
+    with Session(sqlite_engine) as session:
+        session.add(
+            Dictionary(
+                id=1,
+                name="Test",
+                source_language_id=1,
+                target_language_id=2,
+                is_deleting=True,
+            )
+        )
+        session.commit()
+
+        for dictionary_id in (1, 2):
+            with pytest.raises(HTTPException) as excinfo:
+                get_entry_changes(session, dictionary_id, None, limit=10)
+            assert excinfo.value.status_code == 404
+
+
+def test_get_entry_changes_invalid_cursor():
+    """Test that delta sync rejects a malformed cursor."""
+    with pytest.raises(HTTPException) as excinfo:
+        get_entry_changes(MagicMock(), 1, encode_cursor("soon", 1, 1), 10)
+
+    assert excinfo.value.status_code == 400
+
+
+def test_aho_corasick_iter_matches():
+    """Test that AhoCorasick reports overlapping and nested patterns."""
+    automaton = AhoCorasick()
+    for pattern in ["he", "she", "his", "hers"]:
+        automaton.add(pattern, pattern)
+    automaton.build()
+
+    assert sorted(automaton.iter_matches("ushers")) == [
+        (1, 4, "she"),
+        (2, 4, "he"),
+        (2, 6, "hers"),
+    ]
+
+
+def test_fold_text_keeps_offsets():
+    """Test that fold_text maps folded characters to original offsets."""
+    folded, offsets = fold_text("Ça  Straße")
+
+    assert folded == "ca strasse"
+    assert offsets == [0, 1, 2, 4, 5, 6, 7, 8, 8, 9]
+
+
+def test_annotate_text(sqlite_engine):
+    """Test that annotate_text finds words and expressions with offsets."""
+    with Session(sqlite_engine) as session:
+        session.add_all(
+            compute_search_keys(
+                Entry(
+                    original_name=name,
+                    translation=translation,
+                    dictionary_id=1,
+                    is_expression=" " in name,
+                )
+            )
+            for name, translation in [
+                ("bonne", "good"),
+                ("bonne nuit", "good night"),
+                ("nuit", "night"),
+                ("été", "summer"),
+                ("thé", "tea"),
+            ]
+        )
+        session.commit()
+
+        automaton_cache.clear()
+        text = "Bonne  Nuit, bel Été ! Bonnet."
+        longest = annotate_text(session, 1, 0, text, overlapping=False)
+        everything = annotate_text(session, 1, 0, text, overlapping=True)
+        automaton_cache.clear()
+
+    assert [(a.original_name, a.start, a.end, a.text) for a in longest] == [
+        ("bonne nuit", 0, 11, "Bonne  Nuit"),
+        ("été", 17, 20, "Été"),
+    ]
+    assert longest[0].is_expression is True
+    assert [a.original_name for a in everything] == [
+        "bonne nuit",
+        "bonne",
+        "nuit",
+        "été",
+    ]
+
+
+def test_lookup_words_cached(sqlite_engine):
+    """Test that lookup_words answers in input order from the cached index."""
+    with Session(sqlite_engine) as session:
+        session.add_all(
+            compute_search_keys(
+                Entry(original_name=name, translation="x", dictionary_id=1)
+            )
+            for name in ["Chat", "chien", "oiseau"]
+        )
+        session.commit()
+
+        with patch.object(settings, "ENTRY_SEARCH_CACHE", True):
+            prefix_cache.clear()
+            results = lookup_words(session, 1, ["CHIEN", "loup", "chat", ""])
+            prefix_cache.clear()
+
+    assert [(r.word, r.found) for r in results] == [
+        ("CHIEN", True),
+        ("loup", False),
+        ("chat", True),
+        ("", False),
+    ]
+    assert results[2].entries[0].original_name == "Chat"
+
+
+def test_lookup_words_single_query():
+    """Test that lookup_words resolves every word with one ANY query."""
+    mock_session = MagicMock()
+    mock_session.exec.return_value = []
+
+    with patch.object(settings, "ENTRY_SEARCH_CACHE", False):
+        results = lookup_words(mock_session, 1, ["Chat", "chat", "chien"])
+
+    mock_session.exec.assert_called_once()
+    statement = mock_session.exec.call_args.args[0]
+    compiled = statement.compile(dialect=postgresql.dialect())
+    assert '(entry.normalized_name COLLATE "C") = ANY (%(keys)s' in str(
+        compiled
+    )
+    assert compiled.params["keys"] == ["chat", "chien"]
+    assert [r.found for r in results] == [False, False, False]
+
+
+def test_apply_entry_operations(sqlite_engine):
+    """Test that a batch applies set-based writes and reports each one."""
+    operations = [
+        EntryOperation(op="delete", id=1),
+        EntryOperation(op="update", id=2, original_name="chat"),
+        EntryOperation(op="create", original_name="loup", translation="wolf"),
+        EntryOperation(op="create", original_name="chat", translation="cat"),
+        EntryOperation(op="update", id=99, translation="x"),
+        EntryOperation(op="delete", id=99),
+        EntryOperation(op="create", original_name="loup"),
+        EntryOperation(op="update", id=2, translation="kitty"),
+    ]
+
+    with Session(sqlite_engine) as session:
+        session.add(
+            Dictionary(
+                id=1,
+                name="Test",
+                user_id=1,
+                source_language_id=1,
+                target_language_id=2,
+            )
+        )
+        session.add_all(
+            [
+                Entry(
+                    id=1,
+                    original_name="chat",
+                    translation="cat",
+                    dictionary_id=1,
+                ),
+                Entry(
+                    id=2,
+                    original_name="chaton",
+                    translation="kitten",
+                    dictionary_id=1,
+                ),
+            ]
+        )
+        session.commit()
+
+        result = apply_entry_operations(session, 1, operations)
+        entries = session.exec(select(Entry).order_by(Entry.id)).all()
+        tombstones = session.exec(select(EntryTombstone)).all()
+        version = session.get(Dictionary, 1).version
+
+    assert [(r.status, r.id) for r in result.results] == [
+        (204, 1),
+        (200, 2),
+        (201, 3),
+        (409, None),
+        (404, 99),
+        (400, 99),
+        (400, None),
+        (400, 2),
+    ]
+    assert [(e.id, e.original_name, e.display_name) for e in entries] == [
+        (2, "chat", "chat (kitten)"),
+        (3, "loup", "loup (wolf)"),
+    ]
+    assert entries[0].normalized_name == "chat"
+    assert [(t.entry_id, t.dictionary_id) for t in tombstones] == [(1, 1)]
+    assert version == 1
+
+
+def test_apply_entry_operations_swapped_names(sqlite_engine):
+    """Test that renames onto names still held are rejected one by one."""
+    operations = [
+        EntryOperation(op="update", id=1, original_name="b"),
+        EntryOperation(op="update", id=2, original_name="a"),
+        EntryOperation(op="update", id=3, original_name="d"),
+        EntryOperation(op="create", original_name="c", translation="x"),
+    ]
+
+    with Session(sqlite_engine) as session:
+        session.add_all(
+            Entry(id=i, original_name=name, translation="x", dictionary_id=1)
+            for i, name in enumerate("abc", start=1)
+        )
+        session.commit()
+
+        result = apply_entry_operations(session, 1, operations)
+        names = session.exec(
+            select(Entry.original_name).order_by(Entry.id)
+        ).all()
+
+    assert [(r.status, r.id) for r in result.results] == [
+        (409, 1),
+        (409, 2),
+        (200, 3),
+        (201, 4),
+    ]
+    assert names == ["a", "b", "d", "c"]
+
+
+def test_apply_dictionary_operations_forbidden():
+    """Test that a batch on another user's dictionary raises a 403."""
+    mock_session = MagicMock()
+    mock_user = User(id=1, email="test@example.com")
+    mock_session.get.return_value = Dictionary(id=1, user_id=2, name="Other")
+    batch_request = EntryBatchRequest(
+        operations=[EntryOperation(op="delete", id=1)]
+    )
+
+    with pytest.raises(HTTPException) as excinfo:
+        apply_dictionary_operations(
+            request, 1, batch_request, mock_user, mock_session
+        )
+
+    assert excinfo.value.status_code == 403
+    mock_session.exec.assert_not_called()
@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.exceptions import HTTPException
+from sqlmodel import create_engine
+from starlette.requests import Request
+
+from app.core.pool import InstrumentedQueuePool
+from app.core.slow import slow_requests
+from app.models.user import User
+from app.routes.internal import (
+    get_pool_stats,
+    get_slow_requests,
+    require_superuser,
+)
+
+fake_scope = {
+    "type": "http",
+    "path": "/",
+    "headers": [],
+    "client": ("127.0.0.1", 12345),
+    "method": "GET",
+}
+
+request = Request(scope=fake_scope)
+
+
+def test_get_pool_stats():
+    """Test that pool statistics are returned for both engines."""
+    mock_user = User(id=1, email="admin@example.com", is_superuser=True)
+
+    stats = get_pool_stats(request, current_user=mock_user)
+
+    assert [pool["name"] for pool in stats] == ["sync", "async"]
+    assert all(pool["checked_out"] == 0 for pool in stats)
+    assert all("+Inf" in pool["wait"]["buckets"] for pool in stats)
+
+
+def test_get_pool_stats_includes_replicas():
+    """Test that read replica pools are reported after the primary ones."""
+    mock_user = User(id=1, email="admin@example.com", is_superuser=True)
+    replica = create_engine("sqlite://", poolclass=InstrumentedQueuePool)
+
+    with patch("app.routes.internal.read_replicas.engines", [replica]):
+        stats = get_pool_stats(request, current_user=mock_user)
+    replica.dispose()
+
+    assert [pool["name"] for pool in stats] == [
+        "sync",
+        "async",
+        "sync-replica-0",
+    ]
+
+
+def test_require_superuser_rejects_regular_users():
+    """Test that internal endpoints are closed to regular users."""
+    mock_user = User(id=1, email="test@example.com")
+
+    with pytest.raises(HTTPException) as exc_info:
+        require_superuser(mock_user)
+
+    assert exc_info.value.status_code == 403
+
+
+def test_get_slow_requests():
+    """Test that recorded slow requests are returned newest first."""
+    mock_user = User(id=1, email="admin@example.com", is_superuser=True)
+    slow_requests.clear()
+    slow_requests.add({"path": "/first"})
+    slow_requests.add({"path": "/second"})
+
+    records = get_slow_requests(request, current_user=mock_user)
+    slow_requests.clear()
+
+    assert [record["path"] for record in records] == ["/second", "/first"]
@@ -0,0 +1,229 @@
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.exceptions import HTTPException
+from sqlmodel import Session
+from starlette.requests import Request
+
+from app.config import settings
+from app.core.jobs import JOB_HANDLERS, JobRunner, job_handler
+from app.models.job import Job
+from app.models.user import User
+from app.routes.job import get_job_by_id
+
+fake_scope = {
+    "type": "http",
+    "path": "/",
+    "headers": [],
+    "client": ("127.0.0.1", 12345),
+    "method": "GET",
+}
+
+request = Request(scope=fake_scope)
+
+
+@pytest.fixture
+def flaky_handler():
+    """Register a job handler failing on its first attempt."""
+    calls = []
+
+    @job_handler("test.flaky")
+    def flaky(session, job, report):
+        calls.append(job.attempts)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        report(1, total=1)
+        return {"ok": True}
+
+    yield calls
+    JOB_HANDLERS.pop("test.flaky")
+
+
+def test_job_runner_retries_with_backoff(sqlite_engine, flaky_handler):
+    """Test that a failed job is retried with backoff, then succeeds."""
+    runner = JobRunner(max_workers=1)
+    with patch("app.core.jobs.engine", sqlite_engine), patch.object(
+        runner, "submit"
+    ) as mock_submit:
+        with Session(sqlite_engine) as session:
+            job = runner.enqueue(session, "test.flaky", {})
+        mock_submit.assert_called_once_with(job.id)
+
+        runner.run(job.id)
+        with Session(sqlite_engine) as session:
+            failed = session.get(Job, job.id)
+        mock_submit.assert_called_with(
+            job.id, delay=settings.JOB_RETRY_BACKOFF_SECONDS
+        )
+
+        runner.run(job.id)
+        runner.run(job.id)
+        with Session(sqlite_engine) as session:
+            done = session.get(Job, job.id)
+
+    assert (failed.status, failed.attempts, failed.error) == (
+        "pending",
+        1,
+        "boom",
+    )
+    assert flaky_handler == [1, 2]
+    assert (done.status, done.attempts, done.error) == ("succeeded", 2, None)
+    assert (done.progress, done.total, done.result) == (1, 1, {"ok": True})
+    assert done.finished_at is not None
+
+
+def test_job_runner_gives_up(sqlite_engine, flaky_handler):
+    """Test that a job failing on its last attempt is marked as failed."""
+    runner = JobRunner(max_workers=1)
+    with Session(sqlite_engine) as session:
+        session.add(Job(id=1, kind="test.flaky", max_attempts=1))
+        session.commit()
+
+    with patch("app.core.jobs.engine", sqlite_engine), patch.object(
+        runner, "submit"
+    ) as mock_submit:
+        runner.run(1)
+
+    with Session(sqlite_engine) as session:
+        job = session.get(Job, 1)
+
+    assert (job.status, job.attempts, job.error) == ("failed", 1, "boom")
+    mock_submit.assert_not_called()
+
+
+def test_job_runner_start_resumes_stale_jobs(sqlite_engine):
+    """Test that start requeues pending and abandoned running jobs."""
+    runner = JobRunner(max_workers=1)
+    with Session(sqlite_engine) as session:
+        session.add(Job(id=1, kind="test", status="pending"))
+        session.add(
+            Job(
+                id=2,
+                kind="test",
+                status="running",
+                updated_at=datetime(2000, 1, 1),
+            )
+        )
+        session.add(Job(id=3, kind="test", status="running"))
+        session.commit()
+
+    with patch("app.core.jobs.engine", sqlite_engine), patch.object(
+        runner, "submit"
+    ) as mock_submit:
+        runner.start()
+    runner.shutdown()
+
+    assert [c.args for c in mock_submit.call_args_list] == [(1,), (2,)]
+
+
+def test_job_runner_sweep_submits_due_retries(sqlite_engine):
+    """Test that the sweep picks up retries whose timer was lost."""
+    runner = JobRunner(max_workers=1)
+    backoff = timedelta(seconds=settings.JOB_RETRY_BACKOFF_SECONDS)
+    with Session(sqlite_engine) as session:
+        session.add(
+            Job(
+                id=1,
+                kind="test",
+                attempts=1,
+                updated_at=datetime.now() - 2 * backoff,
+            )
+        )
+        session.add(
+            Job(id=2, kind="test", attempts=2, updated_at=datetime.now())
+        )
+        session.add(
+            Job(
+                id=3,
+                kind="test",
+                status="running",
+                updated_at=datetime(2000, 1, 1),
+            )
+        )
+        session.commit()
+
+    with patch("app.core.jobs.engine", sqlite_engine), patch.object(
+        runner, "submit"
+    ) as mock_submit:
+        assert runner.sweep() == 2
+
+    assert [c.args for c in mock_submit.call_args_list] == [(1,), (3,)]
+
+
+def test_job_runner_fails_abandoned_last_attempts(sqlite_engine):
+    """Test that a job abandoned on its last attempt is not run again."""
+    runner = JobRunner(max_workers=1)
+    handler = MagicMock()
+    JOB_HANDLERS["test.stalled"] = handler
+    with Session(sqlite_engine) as session:
+        session.add(
+            Job(
+                id=1,
+                kind="test.stalled",
+                status="running",
+                attempts=3,
+                max_attempts=3,
+                updated_at=datetime(2000, 1, 1),
+            )
+        )
+        session.add(Job(id=2, kind="test.stalled", attempts=3, max_attempts=3))
+        session.commit()
+
+    try:
+        with patch("app.core.jobs.engine", sqlite_engine), patch.object(
+            runner, "submit"
+        ):
+            runner.sweep()
+            runner.run(1)
+            runner.run(2)
+    finally:
+        JOB_HANDLERS.pop("test.stalled")
+
+    with Session(sqlite_engine) as session:
+        stalled, exhausted = session.get(Job, 1), session.get(Job, 2)
+
+    assert (stalled.status, stalled.attempts) == ("failed", 3)
+    assert stalled.finished_at is not None
+    assert (exhausted.status, exhausted.attempts) == ("pending", 3)
+    handler.assert_not_called()
+
+
+def test_job_runner_sweeps_periodically(sqlite_engine):
+    """Test that the sweeper thread runs until shutdown."""
+    runner = JobRunner(max_workers=1)
+    with patch("app.core.jobs.engine", sqlite_engine), patch.object(
+        settings, "JOB_SWEEP_SECONDS", 0.01
+    ), patch.object(runner, "sweep", return_value=0) as mock_sweep:
+        runner.start()
+        time.sleep(0.1)
+        runner.shutdown()
+        calls = mock_sweep.call_count
+        time.sleep(0.05)
+
+    assert calls > 2
+    assert mock_sweep.call_count <= calls + 1
+
+
+def test_get_job_by_id_of_other_user():
+    """Test that another user's job is reported as not found."""
+    mock_session = MagicMock()
+    mock_session.get.return_value = Job(id=1, kind="test", user_id=2)
+    mock_user = User(id=1, email="test@example.com")
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_job_by_id(request, 1, mock_user, mock_session)
+
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == "Job not found"
+
+
+def test_get_job_by_id_as_superuser():
+    """Test that a superuser can read any job."""
+    mock_session = MagicMock()
+    job = Job(id=1, kind="test", user_id=2)
+    mock_session.get.return_value = job
+    mock_user = User(id=1, email="test@example.com", is_superuser=True)
+
+    assert get_job_by_id(request, 1, mock_user, mock_session) is job
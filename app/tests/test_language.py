@@ -2,9 +2,14 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.exceptions import HTTPException
+from sqlmodel import Session
 from starlette.requests import Request
+from starlette.testclient import TestClient
 
+from app.config import settings
+from app.database import get_read_session
 from app.dto.language import LanguageCreate
+from app.main import app
 from app.models.language import Language
 from app.models.user import User
 from app.routes.language import (
@@ -57,7 +62,8 @@ def test_get_languages_with_multiple_languages():
 
     result = get_languages(request, mock_session)
 
-    assert result == mock_languages
+    assert [item.id for item in result] == [1, 2, 3]
+    assert result[0].countries is None
     assert len(result) == 3
     assert result[0].name == "English"
     assert result[1].name == "French"
@@ -78,14 +84,38 @@ def test_get_language_by_id_success():
 
     result = get_language_by_id(request, language_id=1, session=mock_session)
 
-    assert result == mock_language
     assert result.id == 1
+    assert result.countries is None
     assert result.name == "English"
     assert result.code == "en"
     mock_session.exec.assert_called_once()
     mock_query_result.first.assert_called_once()
 
 
+def test_get_language_by_id_route(sqlite_engine):
+    """Test that the language route returns one language or a 404."""
+    with Session(sqlite_engine) as session:
+        session.add(Language(id=1, name="English", code="en"))
+        session.commit()
+
+    def read_session():
+        with Session(sqlite_engine) as session:
+            yield session
+
+    app.dependency_overrides[get_read_session] = read_session
+    try:
+        client = TestClient(app)
+        found = client.get(f"/{settings.API_VERSION}/language/1")
+        missing = client.get(f"/{settings.API_VERSION}/language/2")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert found.status_code == 200
+    assert found.json()["name"] == "English"
+    assert missing.status_code == 404
+    assert missing.json()["detail"] == "Language not found"
+
+
 def test_create_language_success():
     """Test creating a new language with valid data returns the created language."""
     mock_session = MagicMock()
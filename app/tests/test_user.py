@@ -154,6 +154,26 @@ def test_get_user_dictionaries_multiple():
     assert result[1].user_id == 1
 
 
+def test_get_user_dictionaries_skips_deleting():
+    """Test that get_user_dictionaries hides dictionaries being deleted."""
+    mock_session = MagicMock()
+    kept = Dictionary(id=1, name="Kept", user_id=1)
+    mock_user = MagicMock(spec=User)
+    mock_user.dictionaries = [
+        kept,
+        Dictionary(id=2, name="Deleting", user_id=1, is_deleting=True),
+    ]
+    mock_session.get.return_value = mock_user
+
+    result = get_user_dictionaries(
+        request=MagicMock(spec=Request),
+        current_user=MagicMock(id=1),
+        session=mock_session,
+    )
+
+    assert result == [kept]
+
+
 def test_create_user_success():
     """Test creating a user with all required fields successfully."""
     mock_session = MagicMock()
@@ -0,0 +1,93 @@
+"""Compare sync and async read throughput at high concurrency.
+
+Serves the same entry lookup from a sync ``def`` route on the sync engine
+and an ``async def`` route on the async engine, then fires requests at
+both through an in-process ASGI transport. Needs the database from
+``make dbd`` with at least one entry::
+
+    python -m benchmarks.async_reads --requests 5000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import get_async_session, get_session
+from app.models.entry import Entry
+
+app = FastAPI()
+
+
+@app.get("/sync/{entry_id}")
+def read_sync(entry_id: int, session: Session = Depends(get_session)):
+    """Look up an entry on the sync engine, in the threadpool."""
+    return session.exec(select(Entry).where(Entry.id == entry_id)).first()
+
+
+@app.get("/async/{entry_id}")
+async def read_async(
+    entry_id: int, session: AsyncSession = Depends(get_async_session)
+):
+    """Look up an entry on the async engine, on the event loop."""
+    result = await session.exec(select(Entry).where(Entry.id == entry_id))
+    return result.first()
+
+
+async def run(path, requests, concurrency):
+    """Send requests to a path and return (requests/s, latencies)."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    return requests / elapsed, latencies
+
+
+async def compare(args):
+    """Warm up and measure both variants on a single event loop."""
+    print(  # noqa: T201
+        f"{'mode':<6} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}"
+    )
+    for mode in ("sync", "async"):
+        path = f"/{mode}/{args.entry_id}"
+        await run(path, min(args.requests, 50), args.concurrency)
+        throughput, latencies = await run(
+            path, args.requests, args.concurrency
+        )
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(  # noqa: T201
+            f"{mode:<6} {throughput:>9.0f} "
+            f"{quantiles[49] * 1000:>8.1f} {quantiles[98] * 1000:>8.1f}"
+        )
+
+
+def main():
+    """Parse arguments and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entry-id", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    asyncio.run(compare(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compare the latency of logging calls with and without the log queue.
+
+Logs the same access-log style record through a RotatingFileHandler
+attached directly to a logger, as the application used to, and through
+the DroppingQueueHandler and QueueListener it uses now. Writes go to a
+temporary directory and rotate at a small size to include rollovers::
+
+    python -m benchmarks.logging_latency --records 50000
+"""
+
+import argparse
+import logging
+import queue
+import statistics
+import tempfile
+import time
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+
+from app.core.logger import DROPPED, DroppingQueueHandler
+
+
+def file_handler(directory, name):
+    """Return a rotating file handler writing under a directory."""
+    handler = RotatingFileHandler(
+        Path(directory) / f"{name}.log", maxBytes=1_000_000, backupCount=2
+    )
+    handler.setFormatter(
+        logging.Formatter(
+            "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+        )
+    )
+    return handler
+
+
+def measure(handler, records):
+    """Log records through a handler and return per-call latencies."""
+    bench_logger = logging.getLogger(f"bench.{id(handler)}")
+    bench_logger.propagate = False
+    bench_logger.setLevel(logging.INFO)
+    bench_logger.handlers = [handler]
+
+    latencies = []
+    for index in range(records):
+        start = time.perf_counter()
+        bench_logger.info(
+            '%s - "GET /api/v1/entry/%s HTTP/1.1" %s',
+            "127.0.0.1:51234",
+            index,
+            200,
+        )
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(mode, latencies):
+    """Print one row of the comparison table."""
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(  # noqa: T201
+        f"{mode:<7} {quantiles[49] * 1e6:>8.1f} "
+        f"{quantiles[98] * 1e6:>8.1f} {max(latencies) * 1e6:>10.1f}"
+    )
+
+
+def main():
+    """Parse arguments and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(  # noqa: T201
+        f"{'mode':<7} {'p50 us':>8} {'p99 us':>8} {'max us':>10}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        report(
+            "direct", measure(file_handler(directory, "direct"), args.records)
+        )
+
+        log_queue = queue.Queue(maxsize=args.queue_size)
+        listener = QueueListener(log_queue, file_handler(directory, "queued"))
+        listener.start()
+        try:
+            report(
+                "queued",
+                measure(DroppingQueueHandler(log_queue), args.records),
+            )
+        finally:
+            listener.stop()
+    print(f"dropped {DROPPED.get('INFO'):.0f} records")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()